@@ -1,60 +1,116 @@
 #AI MANAGER taslak
 
 import json
+import math
 import os
-from typing import Dict, Any
+import time
+from typing import Dict, Any, Optional
 from datetime import datetime
 
 from core.signal_logic import Signal
+from core.journal_writer import JournalWriter, default_writer
+from ai.experience_store import ExperienceStore
+from ai.confidence_model import ConfidenceModel
+from ai.online_learner import OnlineLearner, signal_terms, CHECKPOINT_FILE
+
+
+ONLINE_MODES = ("off", "shadow", "live")
 
 
 class AIManager:
     """
     Passive learning and biasing module.
     Never generates signals. Never blocks trades.
+    Experience and meta live in db/ai_learning.db (see ExperienceStore).
     """
 
-    def __init__(self, model_dir: str):
+    def __init__(
+        self,
+        model_dir: str,
+        writer: Optional[JournalWriter] = None,
+        db_path: str = "db/ai_learning.db",
+        model_blend: float = 0.5,
+        online_mode: str = "shadow",
+        checkpoint_every: int = 20,
+        checkpoint_interval: float = 60.0
+    ):
+        if online_mode not in ONLINE_MODES:
+            raise ValueError(f"Unsupported online mode: {online_mode}")
+
         self.model_dir = model_dir
         self.active = False
+        self.model_blend = model_blend
+        self.writer = writer or default_writer()
 
         os.makedirs(self.model_dir, exist_ok=True)
 
+        # Eski dosya tabanlı kayıtlar (tek seferlik import için)
         self.meta_path = os.path.join(self.model_dir, "meta.json")
         self.memory_path = os.path.join(self.model_dir, "experience.jsonl")
 
+        self.store = ExperienceStore(
+            db_path,
+            model=os.path.basename(os.path.normpath(model_dir)),
+            writer=self.writer
+        )
+
         self._load_or_init()
 
+        # Offline eğitilmiş model (ai/confidence_model.py), yoksa heuristic
+        self.model: Optional[ConfidenceModel] = ConfidenceModel.load(self.model_dir)
+
+        # Online model: her sonuçta güncellenir, checkpoint writer thread'inde yazılır
+        # "shadow": yalnızca skorlanır / karşılaştırılır, "live": confidence'ı o belirler
+        self.online_mode = online_mode
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_interval = checkpoint_interval
+        self.online_path = os.path.join(self.model_dir, CHECKPOINT_FILE)
+        self.online = OnlineLearner.load(self.online_path)
+        self._last_checkpoint = (self.online.updates, time.monotonic())
+
+        # Prequential karşılaştırma: sonuç gelmeden önceki tahminlerin log loss'u
+        self.shadow = {"n": 0, "online_loss": 0.0, "current_loss": 0.0}
+
     # ------------------------------------------------
     # Lifecycle
     # ------------------------------------------------
 
     def _load_or_init(self):
-        if not os.path.exists(self.meta_path):
+        if self.store.get_meta("created_at") is None:
             self._init_meta()
-        else:
-            self._load_meta()
+        self.active = bool(self.store.get_meta("active", False))
 
     def _init_meta(self):
-        self.meta = {
-            "active": False,
-            "created_at": datetime.utcnow().isoformat(),
-            "total_trades": 0,
-            "wins": 0,
-            "losses": 0,
-            "last_updated": None
+        legacy = {}
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, "r") as f:
+                legacy = json.load(f)
+
+        self.store.set_meta("created_at", legacy.get("created_at") or datetime.utcnow().isoformat())
+        self.store.set_meta("active", legacy.get("active", False))
+        self.store.import_jsonl(self.memory_path)
+
+    @property
+    def meta(self) -> Dict[str, Any]:
+        """
+        Meta view; counters come from the in-memory store cache.
+        """
+        return {
+            "active": self.active,
+            "created_at": self.store.get_meta("created_at"),
+            **self.store.counters
         }
-        self._save_meta()
 
-    def _load_meta(self):
-        with open(self.meta_path, "r") as f:
-            self.meta = json.load(f)
-        self.active = self.meta.get("active", False)
+    def close(self):
+        self.checkpoint(force=True)
+        self.store.close()
 
-    def _save_meta(self):
-        self.meta["last_updated"] = datetime.utcnow().isoformat()
-        with open(self.meta_path, "w") as f:
-            json.dump(self.meta, f, indent=2)
+    def reload_model(self) -> bool:
+        """
+        Picks up a newly trained confidence model artifact.
+        """
+        self.model = ConfidenceModel.load(self.model_dir)
+        return self.model is not None
 
     # ------------------------------------------------
     # Status
@@ -65,13 +121,11 @@ class AIManager:
 
     def activate(self):
         self.active = True
-        self.meta["active"] = True
-        self._save_meta()
+        self.store.set_meta("active", True)
 
     def deactivate(self):
         self.active = False
-        self.meta["active"] = False
-        self._save_meta()
+        self.store.set_meta("active", False)
 
     # ------------------------------------------------
     # Bias Layer
@@ -81,28 +135,46 @@ class AIManager:
         self,
         signal: Signal,
         feature: Dict[str, Any],
-        analysis: Dict[str, Any]
+        analysis: Dict[str, Any],
+        interval: Optional[str] = None
     ) -> Signal:
         """
         Soft confidence adjustment only.
         Action is NEVER changed.
+
+        With a trained model, confidence is blended toward the predicted
+        win probability; otherwise the heuristic multipliers apply.
         """
 
-        confidence = signal.confidence
+        # Modeller signal logic'in ham confidence'ı ile eğitilir / beslenir
+        raw = signal.raw_confidence if signal.raw_confidence is not None else signal.confidence
+        confidence = raw
+
+        if self.online_mode == "live" and signal.action != "WAIT":
+            p = self.online.predict(signal_terms(signal.action, confidence, feature, interval))
+            confidence += self.model_blend * (p - confidence)
+            reason = f"{signal.reason} | AI online p={p:.2f}"
+        elif self.model is not None and signal.action != "WAIT":
+            p = self.model.predict(signal.action, confidence, feature, interval)
+            confidence += self.model_blend * (p - confidence)
+            reason = f"{signal.reason} | AI model p={p:.2f}"
+        else:
+            # Example heuristic bias (model eğitilene kadar)
+            if analysis.get("trend_strength", 0) > 0.7:
+                confidence *= 1.05
 
-        # Example heuristic bias (replace later with ML)
-        if analysis.get("trend_strength", 0) > 0.7:
-            confidence *= 1.05
+            if analysis.get("volatility", 0) > 0.8:
+                confidence *= 0.90
 
-        if analysis.get("volatility", 0) > 0.8:
-            confidence *= 0.90
+            reason = f"{signal.reason} | AI bias applied"
 
         confidence = max(0.0, min(confidence, 1.0))
 
         return Signal(
             action=signal.action,
             confidence=confidence,
-            reason=f"{signal.reason} | AI bias applied"
+            reason=reason,
+            raw_confidence=raw
         )
 
     # ------------------------------------------------
@@ -112,26 +184,82 @@ class AIManager:
     def learn_from_result(
         self,
         signal: Signal,
-        result: str
+        result: str,
+        interval: Optional[str] = None,
+        features: Optional[Dict[str, Any]] = None
     ):
         """
-        Stores experience. No online model update yet.
+        Stores experience and updates the online model (O(features)).
+        The checkpoint file is written on the journal writer thread.
         """
+        raw = signal.raw_confidence if signal.raw_confidence is not None else signal.confidence
+        self.store.add(
+            action=signal.action,
+            result=result,
+            confidence=signal.confidence,
+            raw_confidence=raw,
+            interval=interval,
+            features=features
+        )
+        # Sonuçlar seyrek (kullanıcı girişi): her biri hemen writer'a verilir
+        self.store.flush(wait=False)
 
-        record = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "action": signal.action,
-            "confidence": signal.confidence,
-            "result": result
-        }
+        if self.online_mode == "off" or signal.action == "WAIT":
+            return
 
-        with open(self.memory_path, "a") as f:
-            f.write(json.dumps(record) + "\n")
+        # Ham confidence: live modda signal.confidence modelin kendi çıktısını içerir
+        win = result == "WIN"
+        terms = signal_terms(signal.action, raw, features, interval)
 
-        self.meta["total_trades"] += 1
-        if result == "WIN":
-            self.meta["wins"] += 1
+        if self.model is not None:
+            current = self.model.predict(signal.action, raw, features or {}, interval)
         else:
-            self.meta["losses"] += 1
+            current = signal.confidence
+        online = self.online.update(terms, win)
+
+        self.shadow["n"] += 1
+        self.shadow["online_loss"] += self._log_loss(online, win)
+        self.shadow["current_loss"] += self._log_loss(current, win)
+
+        self.checkpoint()
+
+    @staticmethod
+    def _log_loss(p: float, win: bool) -> float:
+        p = min(max(p, 1e-6), 1.0 - 1e-6)
+        return -math.log(p if win else 1.0 - p)
+
+    def shadow_report(self) -> Dict[str, Any]:
+        """
+        Mean log loss of online vs current model on results seen so far
+        (each scored before the online update).
+        """
+        n = self.shadow["n"]
+        return {
+            "mode": self.online_mode,
+            "results": n,
+            "online_updates": self.online.updates,
+            "online_log_loss": self.shadow["online_loss"] / n if n else None,
+            "current_log_loss": self.shadow["current_loss"] / n if n else None,
+        }
+
+    def checkpoint(self, force: bool = False):
+        """
+        Atomic online-model snapshot every checkpoint_every updates or
+        checkpoint_interval seconds.
+        """
+        updates, last = self._last_checkpoint
+        now = time.monotonic()
+        if self.online.updates == updates:
+            return
+        if not force and self.online.updates - updates < self.checkpoint_every \
+                and now - last < self.checkpoint_interval:
+            return
+
+        self._last_checkpoint = (self.online.updates, now)
+        snapshot = self.online.snapshot()
+        snapshot["shadow"] = self.shadow_report()
 
-        self._save_meta()
+        path = self.online_path
+        self.writer.call(lambda: OnlineLearner.write_snapshot(snapshot, path))
+        if force:
+            self.writer.flush()
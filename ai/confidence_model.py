@@ -0,0 +1,309 @@
+# CONFIDENCE MODEL - Experience store'dan offline eğitim (NumPy lojistik regresyon) + hızlı çıkarım
+
+import argparse
+import json
+import math
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ai.experience_store import ExperienceStore
+from ai.learner import flatten_features
+
+
+WEIGHTS_FILE = "confidence_model.npy"      # eski sürüm (spec'te weights_file yoksa)
+WEIGHTS_PATTERN = "confidence_model.*.npy"
+SPEC_FILE = "confidence_model.json"
+
+ACTIONS = ("CALL", "PUT")
+
+
+# =================================================
+# DATASET
+# =================================================
+
+def numeric_feature_names(rows: List[Dict[str, Any]], min_coverage: float = 0.5) -> List[str]:
+    """
+    Flattened numeric feature names present in at least min_coverage of rows.
+    """
+    seen: Dict[str, int] = {}
+    for row in rows:
+        for name, value in flatten_features(row.get("features") or {}).items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                seen[name] = seen.get(name, 0) + 1
+
+    needed = min_coverage * len(rows)
+    return sorted(name for name, n in seen.items() if n >= needed)
+
+
+def build_dataset(
+    rows: List[Dict[str, Any]],
+    feature_names: List[str],
+    intervals: List[str]
+) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    """
+    Experience rows -> (X, y, column names). y = 1 for WIN.
+    Columns: confidence, action one-hot, interval one-hot, numeric features.
+    confidence is the pre-adjustment (raw) confidence the model sees at
+    inference; older rows without it fall back to the stored confidence.
+    """
+    columns = (
+        ["confidence"]
+        + [f"action:{a}" for a in ACTIONS]
+        + [f"interval:{i}" for i in intervals]
+        + feature_names
+    )
+    X = np.zeros((len(rows), len(columns)), dtype=np.float64)
+    y = np.zeros(len(rows), dtype=np.float64)
+
+    action_col = {a: 1 + i for i, a in enumerate(ACTIONS)}
+    interval_col = {iv: 1 + len(ACTIONS) + i for i, iv in enumerate(intervals)}
+    feature_base = 1 + len(ACTIONS) + len(intervals)
+
+    for r, row in enumerate(rows):
+        raw = row.get("raw_confidence")
+        X[r, 0] = (raw if raw is not None else row.get("confidence")) or 0.0
+        if row.get("action") in action_col:
+            X[r, action_col[row["action"]]] = 1.0
+        if row.get("interval") in interval_col:
+            X[r, interval_col[row["interval"]]] = 1.0
+
+        flat = flatten_features(row.get("features") or {})
+        for j, name in enumerate(feature_names):
+            value = flat.get(name)
+            if isinstance(value, (int, float)):
+                X[r, feature_base + j] = float(value)
+
+        y[r] = 1.0 if row.get("result") == "WIN" else 0.0
+
+    return X, y, columns
+
+
+# =================================================
+# TRAINING
+# =================================================
+
+def fit_logistic(
+    X: np.ndarray,
+    y: np.ndarray,
+    l2: float = 1.0,
+    iterations: int = 25,
+    tol: float = 1e-6
+) -> Tuple[np.ndarray, float]:
+    """
+    L2-regularized logistic regression (Newton / IRLS) on standardized X.
+    Returns raw-scale (weights, bias): standardization is folded in,
+    so inference is bias + x . weights.
+    """
+    mean = X.mean(axis=0)
+    std = X.std(axis=0)
+    std[std == 0] = 1.0
+    Z = (X - mean) / std
+
+    n, d = Z.shape
+    A = np.hstack([np.ones((n, 1)), Z])
+    w = np.zeros(d + 1)
+
+    reg = np.full(d + 1, l2)
+    reg[0] = 0.0    # bias regularize edilmez
+
+    for _ in range(iterations):
+        p = 1.0 / (1.0 + np.exp(-(A @ w)))
+        grad = A.T @ (p - y) + reg * w
+        hess = (A * (p * (1.0 - p))[:, None]).T @ A + np.diag(reg) + 1e-9 * np.eye(d + 1)
+        step = np.linalg.solve(hess, grad)
+        w -= step
+        if np.max(np.abs(step)) < tol:
+            break
+
+    weights = w[1:] / std
+    bias = w[0] - float(np.dot(weights, mean))
+    return weights, bias
+
+
+def train(
+    store: ExperienceStore,
+    model_dir: str | Path,
+    since: Optional[float] = None,
+    l2: float = 1.0,
+    min_rows: int = 30
+) -> Optional[Dict[str, Any]]:
+    """
+    Fits the confidence model on the store's experience rows and writes
+    the artifact into model_dir. Returns the spec, or None if there is
+    not enough data.
+    """
+    rows = [r for r in store.iter_rows(since=since) if r["action"] in ACTIONS]
+    if len(rows) < min_rows:
+        return None
+
+    feature_names = numeric_feature_names(rows)
+    intervals = sorted({r["interval"] for r in rows if r.get("interval")})
+    X, y, columns = build_dataset(rows, feature_names, intervals)
+
+    weights, bias = fit_logistic(X, y, l2=l2)
+
+    p = 1.0 / (1.0 + np.exp(-(X @ weights + bias)))
+    eps = 1e-12
+    spec = {
+        "columns": columns,
+        "bias": bias,
+        "base_rate": float(y.mean()),
+        "rows": len(rows),
+        "log_loss": float(-np.mean(y * np.log(p + eps) + (1 - y) * np.log(1 - p + eps))),
+        "accuracy": float(np.mean((p >= 0.5) == (y == 1.0))),
+        "l2": l2,
+        "trained_at": time.time()
+    }
+    save_model(model_dir, weights, spec)
+    return spec
+
+
+def save_model(model_dir: str | Path, weights: np.ndarray, spec: Dict[str, Any]) -> None:
+    """
+    Weights go to a new versioned .npy (mmap-able, never overwritten);
+    the spec names that file and is swapped in atomically, so a reader
+    always sees a matching pair. Weights of the previous version are
+    kept for readers still holding the old spec; older ones are removed.
+    """
+    model_dir = Path(model_dir)
+    model_dir.mkdir(parents=True, exist_ok=True)
+
+    weights_file = f"confidence_model.{time.time_ns():x}.npy"
+    tmp = model_dir / (weights_file + ".tmp")
+    with open(tmp, "wb") as f:
+        np.save(f, np.asarray(weights, dtype=np.float64))
+    os.replace(tmp, model_dir / weights_file)
+
+    previous = _weights_file(model_dir)
+
+    tmp = model_dir / (SPEC_FILE + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({**spec, "weights_file": weights_file}, f, indent=2)
+    os.replace(tmp, model_dir / SPEC_FILE)
+
+    keep = {weights_file, previous}
+    for path in [*model_dir.glob(WEIGHTS_PATTERN), model_dir / WEIGHTS_FILE]:
+        if path.name not in keep and path.exists():
+            try:
+                path.unlink()
+            except OSError:
+                pass    # hâlâ mmap'li (Windows): sonraki kayıtta silinir
+
+
+def _weights_file(model_dir: Path) -> Optional[str]:
+    """
+    Weights file named by the current spec (None if there is no model).
+    """
+    try:
+        with open(model_dir / SPEC_FILE, "r", encoding="utf-8") as f:
+            return json.load(f).get("weights_file", WEIGHTS_FILE)
+    except (OSError, ValueError):
+        return None
+
+
+# =================================================
+# INFERENCE
+# =================================================
+
+class ConfidenceModel:
+    """
+    Loaded confidence model. predict() is a plain-Python weighted sum
+    over precompiled terms (a few microseconds, no array allocation).
+    """
+
+    def __init__(self, weights, spec: Dict[str, Any]):
+        self.spec = spec
+        self.bias = float(spec["bias"])
+        self.base_rate = float(spec.get("base_rate", 0.5))
+
+        self._confidence_w = 0.0
+        self._action_w: Dict[str, float] = {}
+        self._interval_w: Dict[str, float] = {}
+        self._feature_terms: List[Tuple[Tuple[str, ...], float]] = []
+
+        for column, w in zip(spec["columns"], weights.tolist()):
+            if column == "confidence":
+                self._confidence_w = w
+            elif column.startswith("action:"):
+                self._action_w[column[7:]] = w
+            elif column.startswith("interval:"):
+                self._interval_w[column[9:]] = w
+            elif w != 0.0:
+                self._feature_terms.append((tuple(column.split(".")), w))
+
+    @classmethod
+    def load(cls, model_dir: str | Path) -> Optional["ConfidenceModel"]:
+        model_dir = Path(model_dir)
+        if not (model_dir / SPEC_FILE).exists():
+            return None
+
+        with open(model_dir / SPEC_FILE, "r", encoding="utf-8") as f:
+            spec = json.load(f)
+        weights = np.load(model_dir / spec.get("weights_file", WEIGHTS_FILE), mmap_mode="r")
+        if len(weights) != len(spec["columns"]):
+            return None
+        return cls(weights, spec)
+
+    def predict(
+        self,
+        action: str,
+        confidence: float,
+        features: Dict[str, Any],
+        interval: Optional[str] = None
+    ) -> float:
+        """
+        Win probability for a signal.
+        """
+        z = (
+            self.bias
+            + self._confidence_w * confidence
+            + self._action_w.get(action, 0.0)
+            + self._interval_w.get(interval, 0.0)
+        )
+
+        for path, w in self._feature_terms:
+            value = features
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+            if isinstance(value, (int, float)):
+                z += w * value
+
+        if z < -30.0:
+            return 0.0
+        return 1.0 / (1.0 + math.exp(-z))
+
+
+# =================================================
+# CLI
+# =================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the AI confidence model from the experience store")
+    parser.add_argument("model_dir", nargs="?", default="models/default")
+    parser.add_argument("--db", default="db/ai_learning.db")
+    parser.add_argument("--l2", type=float, default=1.0)
+    parser.add_argument("--since", type=float, default=None, help="epoch seconds")
+    parser.add_argument("--min-rows", type=int, default=30)
+    args = parser.parse_args(argv)
+
+    store = ExperienceStore(args.db, model=os.path.basename(os.path.normpath(args.model_dir)))
+    try:
+        spec = train(store, args.model_dir, since=args.since, l2=args.l2, min_rows=args.min_rows)
+    finally:
+        store.close()
+
+    if spec is None:
+        print(f"Not enough experience rows (need {args.min_rows})")
+        return
+
+    print(f"Trained on {spec['rows']} rows: accuracy={spec['accuracy']:.3f} "
+          f"log_loss={spec['log_loss']:.4f} base_rate={spec['base_rate']:.3f}")
+    print(f"Saved -> {args.model_dir}")
+
+
+if __name__ == "__main__":
+    main()
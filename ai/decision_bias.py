@@ -1,8 +1,13 @@
 # DECISION BIAS - Engine skorlar, doğru - yanlış sonucunu verir (db'e sonuç girme bölümü eklenecek)
 
 import json
+import math
+import os
+import time
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Iterable, Optional
+
+import numpy as np
 
 
 class DecisionBias:
@@ -12,12 +17,63 @@ class DecisionBias:
 
     Not AI. Not ML.
     Deterministic statistical memory.
+
+    Each condition has a Beta(prior + wins, prior + losses) posterior.
+    Wins / losses decay exponentially with half_life seconds, and the
+    bias is shrunk toward 0 by z posterior standard deviations, so a
+    single result (or a stale record) gives a small bias.
+    State lives in arrays indexed through an interned condition table.
     """
 
-    def __init__(self):
-        # key: condition hash / signature
-        # value: {"win": int, "loss": int}
-        self._stats: Dict[str, Dict[str, int]] = {}
+    def __init__(
+        self,
+        half_life: float = 7 * 24 * 3600,
+        prior: float = 1.0,
+        z: float = 1.0
+    ):
+        self.half_life = half_life
+        self.prior = prior
+        self.z = z
+
+        # condition_id -> index
+        self._ids: Dict[str, int] = {}
+
+        capacity = 256
+        self._win = np.zeros(capacity, dtype=np.float64)
+        self._loss = np.zeros(capacity, dtype=np.float64)
+        self._updated = np.zeros(capacity, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    # -------------------------------------------------
+    # CONDITION TABLE
+    # -------------------------------------------------
+
+    def _intern(self, condition_id: str) -> int:
+        idx = self._ids.get(condition_id)
+        if idx is not None:
+            return idx
+
+        idx = len(self._ids)
+        if idx >= len(self._win):
+            self._grow(idx + 1)
+        self._ids[condition_id] = idx
+        return idx
+
+    def _grow(self, needed: int) -> None:
+        new = max(needed, len(self._win) * 2)
+        for name in ("_win", "_loss", "_updated"):
+            arr = getattr(self, name)
+            grown = np.zeros(new, dtype=arr.dtype)
+            grown[:len(arr)] = arr
+            setattr(self, name, grown)
+
+    def _decay(self, idx, now: float) -> np.ndarray:
+        if not self.half_life:
+            return np.ones_like(self._updated[idx])
+        age = np.maximum(now - self._updated[idx], 0.0)
+        return np.exp2(-age / self.half_life)
 
     # -------------------------------------------------
     # UPDATE (AFTER TRADE RESULT)
@@ -26,21 +82,28 @@ class DecisionBias:
     def record_result(
         self,
         condition_id: str,
-        success: bool
+        success: bool,
+        ts: Optional[float] = None
     ) -> None:
-        if condition_id not in self._stats:
-            self._stats[condition_id] = {"win": 0, "loss": 0}
+        now = time.time() if ts is None else ts
+        idx = self._intern(condition_id)
+
+        # Önce eski sayıları bugüne indir, sonra ekle
+        factor = float(self._decay(idx, now))
+        self._win[idx] *= factor
+        self._loss[idx] *= factor
+        self._updated[idx] = now
 
         if success:
-            self._stats[condition_id]["win"] += 1
+            self._win[idx] += 1.0
         else:
-            self._stats[condition_id]["loss"] += 1
+            self._loss[idx] += 1.0
 
     # -------------------------------------------------
     # QUERY (BEFORE DECISION)
     # -------------------------------------------------
 
-    def get_bias(self, condition_id: str) -> float:
+    def get_bias(self, condition_id: str, now: Optional[float] = None) -> float:
         """
         Returns bias score in range [-1, +1]
 
@@ -48,19 +111,43 @@ class DecisionBias:
          0   → neutral / unknown
         -1   → always failing
         """
-
-        stat = self._stats.get(condition_id)
-        if not stat:
+        if condition_id not in self._ids:
             return 0.0
+        return float(self.get_bias_many([condition_id], now)[0])
 
-        wins = stat["win"]
-        losses = stat["loss"]
-        total = wins + losses
-
-        if total == 0:
-            return 0.0
-
-        return (wins - losses) / total
+    def get_bias_many(
+        self,
+        condition_ids: Iterable[str],
+        now: Optional[float] = None
+    ) -> np.ndarray:
+        """
+        Vectorized get_bias; unknown conditions score 0.
+        """
+        now = time.time() if now is None else now
+
+        idx = np.fromiter(
+            (self._ids.get(c, -1) for c in condition_ids),
+            dtype=np.int64
+        )
+        known = idx >= 0
+        out = np.zeros(len(idx), dtype=np.float64)
+        if not known.any():
+            return out
+
+        i = idx[known]
+        factor = self._decay(i, now)
+        a = self.prior + self._win[i] * factor
+        b = self.prior + self._loss[i] * factor
+        n = a + b
+
+        mean = a / n
+        std = np.sqrt(mean * (1.0 - mean) / (n + 1.0))
+
+        # 2*mean-1 in [-1, 1]; belirsizlik kadar 0'a çek
+        raw = 2.0 * mean - 1.0
+        shrunk = np.maximum(np.abs(raw) - 2.0 * self.z * std, 0.0)
+        out[known] = np.sign(raw) * shrunk
+        return out
 
     # -------------------------------------------------
     # ENGINE INTEGRATION HELP
@@ -88,16 +175,55 @@ class DecisionBias:
     # -------------------------------------------------
 
     def save(self, path: str | Path) -> None:
+        """
+        Binary snapshot (.npz). Written to a temp file and swapped in.
+        """
         path = Path(path)
         path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(self._stats, f, indent=2)
+        n = len(self._ids)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                ids=np.array(list(self._ids), dtype=np.str_),
+                win=self._win[:n],
+                loss=self._loss[:n],
+                updated=self._updated[:n],
+                params=np.array([self.half_life, self.prior, self.z])
+            )
+        os.replace(tmp, path)
 
     def load(self, path: str | Path) -> None:
+        """
+        Loads an .npz snapshot, or a legacy JSON {"id": {"win", "loss"}}
+        file (imported as of now).
+        """
         path = Path(path)
         if not path.exists():
             return
 
-        with open(path, "r", encoding="utf-8") as f:
-            self._stats = json.load(f)
+        with open(path, "rb") as f:
+            legacy = f.read(1) == b"{"
+
+        if legacy:
+            with open(path, "r", encoding="utf-8") as f:
+                stats = json.load(f)
+            ids = list(stats)
+            win = np.array([stats[c]["win"] for c in ids], dtype=np.float64)
+            loss = np.array([stats[c]["loss"] for c in ids], dtype=np.float64)
+            updated = np.full(len(ids), time.time())
+        else:
+            with np.load(path, allow_pickle=False) as data:
+                ids = data["ids"].tolist()
+                win, loss, updated = data["win"], data["loss"], data["updated"]
+                self.half_life, self.prior, self.z = data["params"].tolist()
+
+        self._ids = {c: i for i, c in enumerate(ids)}
+        capacity = max(256, 1 << math.ceil(math.log2(len(ids) + 1)))
+        self._win = np.zeros(capacity, dtype=np.float64)
+        self._loss = np.zeros(capacity, dtype=np.float64)
+        self._updated = np.zeros(capacity, dtype=np.float64)
+        self._win[:len(ids)] = win
+        self._loss[:len(ids)] = loss
+        self._updated[:len(ids)] = updated
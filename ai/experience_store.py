@@ -0,0 +1,298 @@
+# EXPERIENCE STORE - AI deneyim kayıtları ve meta bilgileri db/ai_learning.db içinde
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from core.journal_writer import JournalWriter
+
+
+EXPERIENCE_COLUMNS = (
+    "ts", "model", "action", "interval", "confidence",
+    "result", "feature_key", "features", "raw_confidence"
+)
+
+
+def feature_key(features: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Stable short key for a feature snapshot.
+    """
+    if not features:
+        return None
+    payload = json.dumps(features, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode()).hexdigest()[:16]
+
+
+class ExperienceStore:
+    """
+    Indexed experience table + per-model meta key/values.
+    Inserts are buffered and written in batches (one transaction each),
+    optionally on a JournalWriter thread. Counters are kept in memory.
+    """
+
+    def __init__(
+        self,
+        db_path: str,
+        model: str = "default",
+        batch_size: int = 32,
+        writer: Optional[JournalWriter] = None
+    ):
+        self.db_path = db_path
+        self.model = model
+        self.batch_size = batch_size
+        self.writer = writer
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        self._pending: List[Tuple] = []
+        self.counters: Dict[str, int] = {"total_trades": 0, "wins": 0, "losses": 0}
+
+        self._init_db()
+        self._load_counters()
+
+    # -------------------------------------------------
+    # SCHEMA
+    # -------------------------------------------------
+
+    def _init_db(self):
+        with self._db_lock:
+            conn = self._conn
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS experience (
+                    id INTEGER PRIMARY KEY,
+                    ts REAL NOT NULL,
+                    model TEXT NOT NULL,
+                    action TEXT NOT NULL,
+                    interval TEXT,
+                    confidence REAL,
+                    result TEXT NOT NULL,
+                    feature_key TEXT,
+                    features TEXT
+                )
+            """)
+            # raw_confidence kolonunu ekle (eski DB varsa): AI ayarından önceki confidence
+            columns = [col[1] for col in conn.execute("PRAGMA table_info(experience)")]
+            if "raw_confidence" not in columns:
+                conn.execute("ALTER TABLE experience ADD COLUMN raw_confidence REAL")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_experience_model_ts ON experience (model, ts)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_experience_action_result ON experience (model, action, result)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_experience_interval ON experience (model, interval)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_experience_feature_key ON experience (feature_key)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS ai_meta (
+                    model TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT,
+                    PRIMARY KEY (model, key)
+                )
+            """)
+
+    def _load_counters(self):
+        with self._db_lock:
+            rows = self._conn.execute("""
+                SELECT result, COUNT(*) FROM experience
+                WHERE model = ?
+                GROUP BY result
+            """, (self.model,)).fetchall()
+
+        for result, count in rows:
+            self._count(result, count)
+
+    def _count(self, result: str, n: int = 1):
+        self.counters["total_trades"] += n
+        if result == "WIN":
+            self.counters["wins"] += n
+        else:
+            self.counters["losses"] += n
+
+    # -------------------------------------------------
+    # META
+    # -------------------------------------------------
+
+    def get_meta(self, key: str, default=None):
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT value FROM ai_meta WHERE model = ? AND key = ?",
+                (self.model, key)
+            ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set_meta(self, key: str, value):
+        with self._db_lock:
+            self._conn.execute("""
+                INSERT INTO ai_meta (model, key, value) VALUES (?, ?, ?)
+                ON CONFLICT (model, key) DO UPDATE SET value = excluded.value
+            """, (self.model, key, json.dumps(value)))
+
+    # -------------------------------------------------
+    # WRITE
+    # -------------------------------------------------
+
+    def add(
+        self,
+        action: str,
+        result: str,
+        confidence: Optional[float] = None,
+        interval: Optional[str] = None,
+        features: Optional[Dict[str, Any]] = None,
+        ts: Optional[float] = None,
+        raw_confidence: Optional[float] = None
+    ):
+        """
+        confidence: final signal confidence shown to the user.
+        raw_confidence: signal logic confidence before AI adjustment
+        (what the models are trained on).
+        """
+        row = (
+            time.time() if ts is None else ts,
+            self.model,
+            action,
+            interval,
+            confidence,
+            result,
+            feature_key(features),
+            json.dumps(features, default=str) if features else None,
+            raw_confidence
+        )
+
+        with self._lock:
+            self._count(result)
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self, wait: bool = True):
+        with self._lock:
+            self._flush_locked()
+        if wait and self.writer is not None:
+            self.writer.flush()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        if self.writer is not None:
+            self.writer.call(lambda: self._insert(batch))
+        else:
+            self._insert(batch)
+
+    def _insert(self, rows: List[Tuple], marker: Optional[str] = None):
+        """
+        Inserts rows in one transaction; marker (an ai_meta key set to
+        true) is committed in the same transaction.
+        """
+        with self._db_lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(f"""
+                    INSERT INTO experience ({", ".join(EXPERIENCE_COLUMNS)})
+                    VALUES ({", ".join("?" * len(EXPERIENCE_COLUMNS))})
+                """, rows)
+                if marker is not None:
+                    self._conn.execute("""
+                        INSERT INTO ai_meta (model, key, value) VALUES (?, ?, 'true')
+                        ON CONFLICT (model, key) DO UPDATE SET value = excluded.value
+                    """, (self.model, marker))
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def close(self):
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
+
+    # -------------------------------------------------
+    # QUERY
+    # -------------------------------------------------
+
+    def iter_rows(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        action: Optional[str] = None,
+        interval: Optional[str] = None,
+        result: Optional[str] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Experience rows of this model, oldest first. Pending rows are flushed first.
+        """
+        self.flush()
+
+        where, args = ["model = ?"], [self.model]
+        for column, op, value in (
+            ("ts", ">=", since), ("ts", "<", until),
+            ("action", "=", action), ("interval", "=", interval), ("result", "=", result)
+        ):
+            if value is not None:
+                where.append(f"{column} {op} ?")
+                args.append(value)
+
+        with self._db_lock:
+            rows = self._conn.execute(f"""
+                SELECT {", ".join(EXPERIENCE_COLUMNS)} FROM experience
+                WHERE {" AND ".join(where)}
+                ORDER BY ts
+            """, args).fetchall()
+
+        for row in rows:
+            record = dict(zip(EXPERIENCE_COLUMNS, row))
+            record["features"] = json.loads(record["features"]) if record["features"] else None
+            yield record
+
+    # -------------------------------------------------
+    # ONE-TIME IMPORT
+    # -------------------------------------------------
+
+    def import_jsonl(self, path: str) -> int:
+        """
+        Imports a legacy experience.jsonl once (tracked in ai_meta).
+        Returns number of imported rows.
+        """
+        marker = f"imported:{os.path.abspath(path)}"
+        if not os.path.exists(path) or self.get_meta(marker):
+            return 0
+
+        rows = []
+        with open(path, "r") as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                r = json.loads(line)
+                ts = r.get("timestamp")
+                if ts:
+                    # AIManager utcnow() yazardı
+                    ts = datetime.fromisoformat(ts).replace(tzinfo=timezone.utc).timestamp()
+                rows.append((
+                    ts or time.time(),
+                    self.model,
+                    r.get("action", "WAIT"),
+                    r.get("interval"),
+                    r.get("confidence"),
+                    r.get("result", "LOSS"),
+                    feature_key(r.get("features")),
+                    json.dumps(r["features"], default=str) if r.get("features") else None,
+                    None
+                ))
+
+        # Satırlar ve import işareti tek transaction: yarıda kesilirse tekrar import edilmez
+        self._insert(rows, marker=marker)
+        with self._lock:
+            for row in rows:
+                self._count(row[5])
+        return len(rows)
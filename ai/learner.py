@@ -1,32 +1,149 @@
-# LEARNER MODUL - AI train için gerekli bilgileri hazırlar (db implemenatasyonu henüz yok)
+# LEARNER MODUL - AI train için gerekli bilgileri hazırlar (pattern store: sınırlı bellek + SQLite)
 
-import json
 import hashlib
+import json
+import random
+import sqlite3
+import time
+import zlib
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple, Union
+
+import numpy as np
+
+
+PATTERN_COLUMNS = ("pattern_id", "count", "win", "loss", "total_reward", "last_seen", "samples", "vector")
+
+
+def flatten_features(features: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """
+    Nested feature dict -> flat {"a.b": value}. Lists are skipped.
+    """
+    flat = {}
+    for k, v in features.items():
+        name = f"{prefix}{k}"
+        if isinstance(v, dict):
+            flat.update(flatten_features(v, name + "."))
+        elif not isinstance(v, (list, tuple)):
+            flat[name] = v
+    return flat
 
 
 class Learner:
     """
     Converts decisions and outcomes into learnable knowledge.
     Rule-based now, ML-ready later.
+
+    Memory is bounded: counters live in preallocated arrays (one slot
+    per pattern), each pattern keeps a fixed-size reservoir of samples,
+    and least recently seen patterns are evicted past max_patterns.
+    Persistence writes dirty patterns only.
+
+    Numeric features are quantized into buckets (value // step), so
+    nearly identical setups share a pattern. Pattern ids are a blake2b
+    digest of the buckets; a KD-tree over bucket vectors answers
+    k-nearest-pattern queries for pooled scores.
     """
 
-    def __init__(self):
-        # key: pattern_id
-        # value: stats + samples
-        self._memory: Dict[str, Dict[str, Any]] = {}
+    def __init__(
+        self,
+        max_patterns: int = 50000,
+        reservoir_size: int = 32,
+        store_path: Optional[str | Path] = None,
+        quant_step: float = 0.05,
+        steps: Optional[Dict[str, float]] = None,
+        feature_names: Optional[List[str]] = None,
+        leaf_size: int = 256
+    ):
+        self.max_patterns = max_patterns
+        self.reservoir_size = reservoir_size
+        self.store_path = Path(store_path) if store_path else None
+
+        # Quantization: feature başına adım (yoksa quant_step)
+        self.quant_step = quant_step
+        self.steps = dict(steps or {})
+        self.feature_names: Optional[List[str]] = list(feature_names) if feature_names else None
+        self.leaf_size = leaf_size
+
+        capacity = 1024
+        self._count = np.zeros(capacity, dtype=np.int64)
+        self._win = np.zeros(capacity, dtype=np.int64)
+        self._loss = np.zeros(capacity, dtype=np.int64)
+        self._reward = np.zeros(capacity, dtype=np.float64)
+        self._last_seen = np.zeros(capacity, dtype=np.float64)
+
+        # pattern_id -> slot (LRU sırası: en eski başta)
+        self._slots: "OrderedDict[str, int]" = OrderedDict()
+        self._samples: Dict[int, List[Dict[str, Any]]] = {}
+        self._free: List[int] = list(range(capacity - 1, -1, -1))
+        self._dirty: set = set()
+
+        # Nearest-neighbour index: slot -> bucket vector.
+        # KD-tree tembel kurulur; sonradan eklenenler _recent'te brute force aranır,
+        # silinen / yeniden kullanılan slotlar _in_tree=False ile ağaçta yok sayılır.
+        self._vectors = np.zeros((capacity, 0), dtype=np.float32)
+        self._valid = np.zeros(capacity, dtype=bool)
+        self._in_tree = np.zeros(capacity, dtype=bool)
+        self._tree: Optional[_KDTree] = None
+        self._recent: set = set()
+        self._stale = 0
+        self._step_arr: Optional[np.ndarray] = None
+        if self.feature_names:
+            self._set_schema(self.feature_names)
+
+        self._rng = random.Random()
+        self._conn: Optional[sqlite3.Connection] = None
 
     # -------------------------------------------------
     # PATTERN IDENTIFICATION
     # -------------------------------------------------
 
+    def _set_schema(self, names: List[str]) -> None:
+        self.feature_names = list(names)
+        self._step_arr = np.array(
+            [self.steps.get(n, self.quant_step) for n in names],
+            dtype=np.float64
+        )
+        self._vectors = np.zeros((len(self._count), len(names)), dtype=np.float32)
+
+    def quantize(self, features: Dict[str, Any]) -> Tuple[Tuple[int, ...], np.ndarray]:
+        """
+        Feature snapshot -> (key tuple, bucket vector).
+        Numeric / bool features are bucketed; other values (strings)
+        enter the key as a crc32 code but not the distance vector.
+        The feature schema is fixed by the first snapshot seen.
+        """
+        flat = flatten_features(features)
+        if self.feature_names is None:
+            self._set_schema(sorted(flat))
+
+        values = np.zeros(len(self.feature_names), dtype=np.float64)
+        numeric = np.ones(len(self.feature_names), dtype=bool)
+        codes = []
+        for i, name in enumerate(self.feature_names):
+            v = flat.get(name, 0)
+            if isinstance(v, (int, float, bool)) or v is None:
+                values[i] = float(v or 0)
+            else:
+                numeric[i] = False
+                codes.append(zlib.crc32(str(v).encode()))
+
+        buckets = np.floor(values / self._step_arr).astype(np.int64)
+        buckets[~numeric] = 0
+        return tuple(buckets.tolist()) + tuple(codes), buckets.astype(np.float32)
+
     def build_pattern_id(self, features: Dict[str, Any]) -> str:
         """
-        Create a stable hash for a given feature snapshot.
+        Stable id for a feature snapshot (digest of quantized buckets).
         """
-        payload = json.dumps(features, sort_keys=True)
-        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+        key, _ = self.quantize(features)
+        return self._key_id(key)
+
+    @staticmethod
+    def _key_id(key: Tuple[int, ...]) -> str:
+        packed = np.asarray(key, dtype=np.int64).tobytes()
+        return hashlib.blake2b(packed, digest_size=8).hexdigest()
 
     # -------------------------------------------------
     # RECORD LEARNING EVENT
@@ -45,50 +162,118 @@ class Learner:
         reward: normalized outcome (-1.0 .. +1.0)
         """
 
-        pattern_id = self.build_pattern_id(features)
+        key, vector = self.quantize(features)
+        pattern_id = self._key_id(key)
+        slot = self._slot(pattern_id, create=True, vector=vector)
 
-        if pattern_id not in self._memory:
-            self._memory[pattern_id] = {
-                "count": 0,
-                "win": 0,
-                "loss": 0,
-                "total_reward": 0.0,
-                "samples": []
-            }
-
-        entry = self._memory[pattern_id]
-        entry["count"] += 1
-        entry["total_reward"] += reward
+        self._count[slot] += 1
+        self._reward[slot] += reward
+        self._last_seen[slot] = time.time()
 
         if result == "WIN":
-            entry["win"] += 1
+            self._win[slot] += 1
         elif result == "LOSS":
-            entry["loss"] += 1
+            self._loss[slot] += 1
 
-        entry["samples"].append({
+        self._add_sample(slot, {
             "action": action,
             "result": result,
             "reward": reward
         })
+        self._dirty.add(pattern_id)
+
+    def _add_sample(self, slot: int, sample: Dict[str, Any]) -> None:
+        """
+        Reservoir sampling: every sample seen so far has equal chance
+        of being kept; memory per pattern is at most reservoir_size.
+        """
+        samples = self._samples.setdefault(slot, [])
+        if len(samples) < self.reservoir_size:
+            samples.append(sample)
+            return
+
+        j = self._rng.randrange(int(self._count[slot]))
+        if j < self.reservoir_size:
+            samples[j] = sample
 
     # -------------------------------------------------
     # QUERY (ENGINE / AI READY)
     # -------------------------------------------------
 
-    def get_pattern_score(self, pattern_id: str) -> float:
+    def get_pattern_score(
+        self,
+        pattern: Union[str, Dict[str, Any]],
+        k: int = 0
+    ) -> float:
         """
         Returns confidence score in range [-1, +1]
+
+        pattern: pattern_id, or a feature snapshot.
+        k > 0 (feature snapshot): pools reward/count over the k nearest
+        stored patterns, weighted by 1 / (1 + distance).
         """
-        entry = self._memory.get(pattern_id)
-        if not entry or entry["count"] == 0:
+        if isinstance(pattern, dict):
+            if k > 0:
+                return self._pooled_score(pattern, k)
+            pattern = self.build_pattern_id(pattern)
+
+        slot = self._slot(pattern)
+        if slot is None or self._count[slot] == 0:
+            return 0.0
+
+        avg_reward = self._reward[slot] / self._count[slot]
+        return max(-1.0, min(1.0, float(avg_reward)))
+
+    def nearest(self, features: Dict[str, Any], k: int = 5) -> List[Tuple[int, float]]:
+        """
+        k nearest in-memory patterns as (slot, distance), exact.
+        Searches the KD-tree (rebuilt lazily once enough patterns were
+        added / evicted since the last build) plus recently added slots.
+        """
+        _, vector = self.quantize(features)
+        if not self._slots or k <= 0:
+            return []
+
+        self._maybe_rebuild_tree()
+
+        best_d2 = np.empty(0, dtype=np.float64)
+        best_slots = np.empty(0, dtype=np.int64)
+
+        if self._recent:
+            best_slots = np.fromiter(self._recent, dtype=np.int64)
+            diff = self._vectors[best_slots] - vector
+            best_d2 = np.einsum("ij,ij->i", diff, diff).astype(np.float64)
+            best_slots, best_d2 = _top_k(best_slots, best_d2, k)
+
+        if self._tree is not None:
+            best_slots, best_d2 = self._tree.query(vector, k, self._in_tree, best_slots, best_d2)
+
+        return [(int(s), float(np.sqrt(d))) for s, d in zip(best_slots, best_d2)]
+
+    def _pooled_score(self, features: Dict[str, Any], k: int) -> float:
+        hits = self.nearest(features, k)
+        if not hits:
             return 0.0
 
-        avg_reward = entry["total_reward"] / entry["count"]
-        return max(-1.0, min(1.0, avg_reward))
+        slots = np.array([s for s, _ in hits])
+        weights = 1.0 / (1.0 + np.array([d for _, d in hits]))
+
+        count = float(np.dot(weights, self._count[slots]))
+        if count == 0:
+            return 0.0
+        reward = float(np.dot(weights, self._reward[slots]))
+        return max(-1.0, min(1.0, reward / count))
 
     def is_reliable(self, pattern_id: str, min_samples: int=10) -> bool:
-        entry = self._memory.get(pattern_id)
-        return bool(entry and entry["count"] >= min_samples)
+        slot = self._slot(pattern_id)
+        return bool(slot is not None and self._count[slot] >= min_samples)
+
+    def samples(self, pattern_id: str) -> List[Dict[str, Any]]:
+        slot = self._slot(pattern_id)
+        return list(self._samples.get(slot, [])) if slot is not None else []
+
+    def __len__(self) -> int:
+        return len(self._slots)
 
     # -------------------------------------------------
     # EXPORT (FOR AI MODULE)
@@ -96,38 +281,408 @@ class Learner:
 
     def export_dataset(self) -> List[Dict[str, Any]]:
         dataset = []
-        for pid, entry in self._memory.items():
+        for pid, slot in self._slots.items():
+            count = int(self._count[slot])
             dataset.append({
                 "pattern_id": pid,
-                "count": entry["count"],
-                "win": entry["win"],
-                "loss": entry["loss"],
+                "count": count,
+                "win": int(self._win[slot]),
+                "loss": int(self._loss[slot]),
                 "avg_reward": (
-                    entry["total_reward"] / entry["count"]
-                    if entry["count"] > 0 else 0.0
+                    float(self._reward[slot]) / count
+                    if count > 0 else 0.0
                 )
             })
         return dataset
 
     # -------------------------------------------------
-    # PERSISTENCE
+    # SLOTS / EVICTION
     # -------------------------------------------------
 
-    def save(self, path: str | Path) -> None:
-        path = Path(path)
+    def _slot(
+        self,
+        pattern_id: str,
+        create: bool = False,
+        vector: Optional[np.ndarray] = None
+    ) -> Optional[int]:
+        slot = self._slots.get(pattern_id)
+        if slot is not None:
+            self._slots.move_to_end(pattern_id)
+            return slot
+
+        # Bellekte yok: store'da varsa geri yükle
+        row = self._fetch_row(pattern_id) if self.store_path else None
+        if row is None and not create:
+            return None
+
+        slot = self._allocate(pattern_id)
+        if row is not None:
+            self._set_row(slot, row)
+        elif vector is not None:
+            self._index_vector(slot, vector)
+        return slot
+
+    def _index_vector(self, slot: int, vector: np.ndarray) -> None:
+        if len(vector) != self._vectors.shape[1]:
+            return
+        self._vectors[slot] = vector
+        self._valid[slot] = True
+        self._recent.add(slot)
+
+    def _unindex_vector(self, slot: int) -> None:
+        if not self._valid[slot]:
+            return
+        self._valid[slot] = False
+        self._recent.discard(slot)
+        if self._in_tree[slot]:
+            self._in_tree[slot] = False
+            self._stale += 1
+
+    def _maybe_rebuild_tree(self) -> None:
+        """
+        Rebuilds when changes since the last build exceed 1/8 of the
+        indexed patterns (amortized O(log n) per insert).
+        """
+        changed = len(self._recent) + self._stale
+        indexed = self._tree.size if self._tree is not None else 0
+        if changed <= max(self.leaf_size, indexed // 8):
+            return
+
+        slots = np.flatnonzero(self._valid)
+        self._tree = _KDTree(slots, self._vectors[slots].astype(np.float64), self.leaf_size)
+        self._in_tree[:] = False
+        self._in_tree[slots] = True
+        self._recent.clear()
+        self._stale = 0
+
+    def _allocate(self, pattern_id: str) -> int:
+        if len(self._slots) >= self.max_patterns:
+            self._evict(len(self._slots) - self.max_patterns + 1)
+
+        if not self._free:
+            self._grow()
+
+        slot = self._free.pop()
+        self._count[slot] = 0
+        self._win[slot] = 0
+        self._loss[slot] = 0
+        self._reward[slot] = 0.0
+        self._last_seen[slot] = 0.0
+        self._samples.pop(slot, None)
+
+        self._slots[pattern_id] = slot
+        return slot
+
+    def _grow(self) -> None:
+        old = len(self._count)
+        new = min(old * 2, max(self.max_patterns, old + 1))
+
+        for name in ("_count", "_win", "_loss", "_reward", "_last_seen", "_valid", "_in_tree", "_vectors"):
+            arr = getattr(self, name)
+            grown = np.zeros((new,) + arr.shape[1:], dtype=arr.dtype)
+            grown[:old] = arr
+            setattr(self, name, grown)
+
+        self._free.extend(range(new - 1, old - 1, -1))
+
+    def _evict(self, n: int) -> None:
+        """
+        Drops the n least recently seen patterns from memory.
+        Dirty ones are persisted first when a store is attached.
+        """
+        victims = []
+        for pid in self._slots:
+            if len(victims) >= n:
+                break
+            victims.append(pid)
+
+        self._release(victims)
+
+    def evict_older_than(self, seconds: float) -> int:
+        """
+        Age-based eviction: patterns not seen for `seconds`.
+        """
+        cutoff = time.time() - seconds
+        victims = []
+        for pid, slot in self._slots.items():   # LRU sırası: eski -> yeni
+            if self._last_seen[slot] >= cutoff:
+                break
+            victims.append(pid)
+
+        self._release(victims)
+        return len(victims)
+
+    def _release(self, pattern_ids: List[str]) -> None:
+        if self.store_path:
+            self._write_rows([pid for pid in pattern_ids if pid in self._dirty])
+
+        for pid in pattern_ids:
+            slot = self._slots.pop(pid)
+            self._unindex_vector(slot)
+            self._samples.pop(slot, None)
+            self._dirty.discard(pid)
+            self._free.append(slot)
+
+    # -------------------------------------------------
+    # PERSISTENCE (SQLite, dirty patterns only)
+    # -------------------------------------------------
+
+    def _connect(self, path: Path) -> sqlite3.Connection:
+        """
+        Connection to the attached store is kept open (on-demand
+        fetches on every cache miss); other paths get a fresh one.
+        """
+        if self._conn is not None and path == self.store_path:
+            return self._conn
+
+        conn = sqlite3.connect(path)
+        if path == self.store_path:
+            self._conn = conn
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS learner_patterns (
+                pattern_id TEXT PRIMARY KEY,
+                count INTEGER NOT NULL,
+                win INTEGER NOT NULL,
+                loss INTEGER NOT NULL,
+                total_reward REAL NOT NULL,
+                last_seen REAL NOT NULL,
+                samples TEXT
+            )
+        """)
+        # vector kolonunu ekle (eski store varsa)
+        columns = [col[1] for col in conn.execute("PRAGMA table_info(learner_patterns)")]
+        if "vector" not in columns:
+            conn.execute("ALTER TABLE learner_patterns ADD COLUMN vector BLOB")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS learner_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """)
+        return conn
+
+    def _row(self, pattern_id: str) -> tuple:
+        slot = self._slots[pattern_id]
+        return (
+            pattern_id,
+            int(self._count[slot]),
+            int(self._win[slot]),
+            int(self._loss[slot]),
+            float(self._reward[slot]),
+            float(self._last_seen[slot]),
+            json.dumps(self._samples.get(slot, [])),
+            self._vectors[slot].tobytes() if self._valid[slot] else None
+        )
+
+    def _set_row(self, slot: int, row: tuple) -> None:
+        _, count, win, loss, reward, last_seen, samples, vector = row
+        if vector is not None:
+            self._index_vector(slot, np.frombuffer(vector, dtype=np.float32))
+        self._count[slot] = count
+        self._win[slot] = win
+        self._loss[slot] = loss
+        self._reward[slot] = reward
+        self._last_seen[slot] = last_seen
+        self._samples[slot] = json.loads(samples) if samples else []
+
+    def _fetch_row(self, pattern_id: str) -> Optional[tuple]:
+        if not self.store_path.exists():
+            return None
+        with self._connect(self.store_path) as conn:
+            return conn.execute(f"""
+                SELECT {", ".join(PATTERN_COLUMNS)} FROM learner_patterns
+                WHERE pattern_id = ?
+            """, (pattern_id,)).fetchone()
+
+    def _write_rows(self, pattern_ids: List[str], path: Optional[Path] = None) -> None:
+        if not pattern_ids:
+            return
+
+        path = path or self.store_path
         path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect(path) as conn:
+            conn.executemany(f"""
+                INSERT INTO learner_patterns ({", ".join(PATTERN_COLUMNS)})
+                VALUES ({", ".join("?" * len(PATTERN_COLUMNS))})
+                ON CONFLICT (pattern_id) DO UPDATE SET
+                    count = excluded.count,
+                    win = excluded.win,
+                    loss = excluded.loss,
+                    total_reward = excluded.total_reward,
+                    last_seen = excluded.last_seen,
+                    samples = excluded.samples,
+                    vector = excluded.vector
+            """, [self._row(pid) for pid in pattern_ids])
+            if self.feature_names is not None:
+                conn.execute("""
+                    INSERT INTO learner_meta (key, value) VALUES ('schema', ?)
+                    ON CONFLICT (key) DO UPDATE SET value = excluded.value
+                """, (json.dumps({"feature_names": self.feature_names, "steps": self._step_arr.tolist()}),))
+
+    def save(self, path: str | Path | None = None) -> int:
+        """
+        Upserts dirty patterns only (one transaction).
+        Returns number of written patterns.
+        """
+        path = Path(path) if path else self.store_path
+        if path is None:
+            raise ValueError("No store path for Learner.save")
 
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(self._memory, f, indent=2)
+        dirty = [pid for pid in self._dirty if pid in self._slots]
+        self._write_rows(dirty, path)
+        self._dirty.clear()
+
+        if self.store_path is None:
+            self.store_path = path
+        return len(dirty)
 
     def load(self, path: str | Path) -> None:
+        """
+        Attaches a pattern store. Most recently seen patterns are
+        loaded up to max_patterns; the rest are fetched on demand.
+        A legacy JSON memory file is not imported: its pattern ids are
+        sha256 digests of the raw feature snapshots, which it does not
+        store, so they cannot be re-keyed to quantized blake2b ids. Its
+        .db sibling is attached instead.
+        """
         path = Path(path)
         if not path.exists():
+            self.store_path = path
+            return
+
+        with open(path, "rb") as f:
+            legacy = f.read(1) == b"{"
+
+        if legacy:
+            store = path.with_suffix(".db" if path.suffix != ".db" else ".patterns.db")
+            print(f"Learner: legacy memory {path} ignored (pattern ids cannot be re-keyed), using {store}")
+            if store.exists():
+                self.load(store)
+            else:
+                self.store_path = store
             return
 
-        with open(path, "r", encoding="utf-8") as f:
-            self._memory = json.load(f)
+        self.store_path = path
+        with self._connect(path) as conn:
+            schema = conn.execute("SELECT value FROM learner_meta WHERE key = 'schema'").fetchone()
+            if schema and self.feature_names is None:
+                schema = json.loads(schema[0])
+                self.steps.update(zip(schema["feature_names"], schema["steps"]))
+                self._set_schema(schema["feature_names"])
+
+            rows = conn.execute(f"""
+                SELECT {", ".join(PATTERN_COLUMNS)} FROM learner_patterns
+                ORDER BY last_seen DESC
+                LIMIT ?
+            """, (self.max_patterns,)).fetchall()
+
+        for row in reversed(rows):
+            slot = self._allocate(row[0])
+            self._set_row(slot, row)
+
+
+
+# =================================================
+# NEAREST-NEIGHBOUR INDEX
+# =================================================
+
+def _top_k(slots: np.ndarray, d2: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    k smallest squared distances, sorted ascending.
+    """
+    if len(d2) > k:
+        keep = np.argpartition(d2, k - 1)[:k]
+        slots, d2 = slots[keep], d2[keep]
+    order = np.argsort(d2, kind="stable")
+    return slots[order], d2[order]
+
+
+class _KDTree:
+    """
+    Static KD-tree over (slot, vector) pairs: splits the widest
+    dimension at the median down to leaves of at most leaf_size points.
+
+    Queries are exact. Distances from the query to every leaf's
+    bounding box are computed in one vectorized pass; leaves are then
+    scanned nearest-box first until the box distance exceeds the
+    current k-th best distance.
+    """
+
+    def __init__(self, slots: np.ndarray, points: np.ndarray, leaf_size: int = 64):
+        self.size = len(slots)
+        self.leaf_size = max(1, leaf_size)
+
+        self.slots = slots.copy()
+        self.points = points.copy()
+
+        # Yaprak başına: nokta aralığı [start, end) ve bounding box
+        ranges: List[Tuple[int, int]] = []
+        if self.size:
+            self._build(ranges)
+        self.ranges = ranges
+        dim = points.shape[1] if points.ndim == 2 else 0
+        self.box_lo = np.array([self.points[a:b].min(axis=0) for a, b in ranges]).reshape(-1, dim)
+        self.box_hi = np.array([self.points[a:b].max(axis=0) for a, b in ranges]).reshape(-1, dim)
+
+    def _build(self, ranges: List[Tuple[int, int]]) -> None:
+        stack = [(0, self.size)]
+        while stack:
+            lo, hi = stack.pop()
+            pts = self.points[lo:hi]
+            spread = pts.max(axis=0) - pts.min(axis=0)
+            if hi - lo <= self.leaf_size or not spread.any():
+                ranges.append((lo, hi))
+                continue
+
+            dim = int(np.argmax(spread))
+            mid = (hi - lo) // 2
+            order = np.argpartition(pts[:, dim], mid)
+            self.points[lo:hi] = pts[order]
+            self.slots[lo:hi] = self.slots[lo:hi][order]
+            stack.append((lo, lo + mid))
+            stack.append((lo + mid, hi))
+
+    def query(
+        self,
+        q: np.ndarray,
+        k: int,
+        live: np.ndarray,
+        best_slots: np.ndarray,
+        best_d2: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Merges the k nearest live points into (best_slots, best_d2).
+        live[slot] False = removed since build.
+        """
+        if not self.ranges:
+            return best_slots, best_d2
+
+        q = q.astype(np.float64)
+        gap = np.maximum(self.box_lo - q, 0.0) + np.maximum(q - self.box_hi, 0.0)
+        bounds = np.einsum("ij,ij->i", gap, gap)
+
+        for leaf in np.argsort(bounds).tolist():
+            if len(best_d2) >= k and bounds[leaf] > best_d2[-1]:
+                break
+
+            lo, hi = self.ranges[leaf]
+            slots = self.slots[lo:hi]
+            diff = self.points[lo:hi] - q
+            d2 = np.einsum("ij,ij->i", diff, diff)
+
+            mask = live[slots]
+            if len(best_d2) >= k:
+                mask &= d2 < best_d2[-1]
+            if not mask.any():
+                continue
+
+            best_slots, best_d2 = _top_k(
+                np.concatenate([best_slots, slots[mask]]),
+                np.concatenate([best_d2, d2[mask]]),
+                k
+            )
 
+        return best_slots, best_d2
 
 
 #   Öğrenme Zinciri:
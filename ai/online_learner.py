@@ -0,0 +1,153 @@
+# ONLINE LEARNER - Her WIN/LOSS sonucunda ağırlıkları günceller (FTRL-Proximal lojistik regresyon)
+
+import json
+import math
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from ai.learner import flatten_features
+
+
+CHECKPOINT_FILE = "online_model.json"
+
+
+def signal_terms(
+    action: str,
+    confidence: float,
+    features: Optional[Dict[str, Any]],
+    interval: Optional[str] = None
+) -> Dict[str, float]:
+    """
+    Sparse input vector {name: value}; same column naming as ConfidenceModel.
+    """
+    terms = {
+        "confidence": float(confidence or 0.0),
+        f"action:{action}": 1.0,
+    }
+    if interval:
+        terms[f"interval:{interval}"] = 1.0
+
+    for name, value in flatten_features(features or {}).items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            terms[name] = float(value)
+    return terms
+
+
+class OnlineLearner:
+    """
+    FTRL-Proximal logistic regression.
+    Each labeled result updates only the coordinates it touches:
+    O(features) per update, no retraining.
+    Thread-safe; checkpoints are atomic JSON snapshots.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.1,
+        beta: float = 1.0,
+        l1: float = 0.0,
+        l2: float = 1.0
+    ):
+        self.alpha = alpha
+        self.beta = beta
+        self.l1 = l1
+        self.l2 = l2
+
+        # Koordinat başına FTRL durumu
+        self._z: Dict[str, float] = {}
+        self._n: Dict[str, float] = {}
+        self.updates = 0
+
+        self._lock = threading.Lock()
+
+    # -------------------------------------------------
+    # MODEL
+    # -------------------------------------------------
+
+    def _weight(self, name: str) -> float:
+        z = self._z.get(name, 0.0)
+        if abs(z) <= self.l1:
+            return 0.0
+        n = self._n.get(name, 0.0)
+        sign = -1.0 if z < 0 else 1.0
+        return -(z - sign * self.l1) / ((self.beta + math.sqrt(n)) / self.alpha + self.l2)
+
+    def _predict_locked(self, terms: Dict[str, float]) -> float:
+        z = self._weight("bias")
+        for name, value in terms.items():
+            z += self._weight(name) * value
+        z = max(-30.0, min(30.0, z))
+        return 1.0 / (1.0 + math.exp(-z))
+
+    def predict(self, terms: Dict[str, float]) -> float:
+        """
+        Win probability.
+        """
+        with self._lock:
+            return self._predict_locked(terms)
+
+    def update(self, terms: Dict[str, float], win: bool) -> float:
+        """
+        One FTRL step. Returns the prediction made before the update.
+        """
+        y = 1.0 if win else 0.0
+        with self._lock:
+            p = self._predict_locked(terms)
+            g_scale = p - y
+
+            for name, value in (("bias", 1.0), *terms.items()):
+                g = g_scale * value
+                n = self._n.get(name, 0.0)
+                sigma = (math.sqrt(n + g * g) - math.sqrt(n)) / self.alpha
+                self._z[name] = self._z.get(name, 0.0) + g - sigma * self._weight(name)
+                self._n[name] = n + g * g
+
+            self.updates += 1
+            return p
+
+    # -------------------------------------------------
+    # CHECKPOINT
+    # -------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "params": {"alpha": self.alpha, "beta": self.beta, "l1": self.l1, "l2": self.l2},
+                "z": dict(self._z),
+                "n": dict(self._n),
+                "updates": self.updates,
+                "saved_at": time.time()
+            }
+
+    @staticmethod
+    def write_snapshot(snapshot: Dict[str, Any], path: str | Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def save(self, path: str | Path) -> None:
+        self.write_snapshot(self.snapshot(), path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "OnlineLearner":
+        path = Path(path)
+        if not path.exists():
+            return cls()
+
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+
+        learner = cls(**data.get("params", {}))
+        learner._z = data.get("z", {})
+        learner._n = data.get("n", {})
+        learner.updates = data.get("updates", 0)
+        return learner
@@ -0,0 +1,451 @@
+# WALK-FORWARD - Kural / model adaylarını geçmiş deneyim üzerinde katlamalı (fold) değerlendirir
+
+import argparse
+import dataclasses
+import hashlib
+import importlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ai.confidence_model import ACTIONS, build_dataset, fit_logistic, numeric_feature_names
+from ai.decision_bias import DecisionBias
+from ai.experience_store import ExperienceStore
+from core.risk_governor import RollingWindow, window_block
+from core.risk_rules import RiskRules, default_rules, load_rules
+
+
+HARNESS_VERSION = 3
+CACHE_FILE = ".walk_forward_cache.json"
+CACHE_MAX_ENTRIES = 20000
+
+OPPOSITE = {"CALL": "PUT", "PUT": "CALL"}
+
+DEFAULT_CANDIDATES: List[Dict[str, Any]] = [
+    {"name": "baseline", "kind": "baseline"},
+    {"name": "confidence>=0.6", "kind": "min_confidence", "threshold": 0.6},
+    {"name": "decision_bias", "kind": "decision_bias", "min_bias": 0.0},
+    {"name": "confidence_model", "kind": "confidence_model", "threshold": 0.5},
+]
+
+
+# =================================================
+# FOLDS / HASHING
+# =================================================
+
+def walk_forward_folds(n_rows: int, n_folds: int, min_train: int) -> List[Tuple[int, int, int]]:
+    """
+    Expanding-window folds over time-sorted rows: (train_end, test_start, test_end).
+    Train is rows[:train_end], test is rows[test_start:test_end].
+    """
+    if n_rows <= min_train or n_folds < 1:
+        return []
+
+    edges = np.linspace(min_train, n_rows, n_folds + 1).astype(int)
+    return [
+        (int(a), int(a), int(b))
+        for a, b in zip(edges[:-1], edges[1:])
+        if b > a
+    ]
+
+
+def _row_digest(row: Dict[str, Any]) -> bytes:
+    payload = json.dumps(
+        [row["ts"], row["action"], row["interval"], row["confidence"], row["result"], row["features"],
+         row.get("raw_confidence")],
+        sort_keys=True, default=str
+    )
+    return hashlib.sha1(payload.encode()).digest()
+
+
+def config_hash(candidate: Dict[str, Any], rules: RiskRules, payout: float) -> str:
+    payload = json.dumps({
+        "version": HARNESS_VERSION,
+        "candidate": candidate,
+        "ladder": rules.ladder.steps(),
+        "window_rules": [dataclasses.asdict(r) for r in rules.window_rules],
+        "payout": payout
+    }, sort_keys=True)
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+# =================================================
+# CANDIDATES
+# =================================================
+
+def _outcome(row: Dict[str, Any], action: str) -> Optional[bool]:
+    """
+    Win/loss of taking action on this row. The opposite of the recorded
+    action is scored as the flipped result (binary payout).
+    """
+    if action == row["action"]:
+        return row["result"] == "WIN"
+    if action == OPPOSITE.get(row["action"]):
+        return row["result"] != "WIN"
+    return None
+
+
+def _raw_confidence(row: Dict[str, Any]) -> float:
+    """
+    Signal logic confidence before AI adjustment: what the engine's
+    models see (older rows without it fall back to confidence).
+    """
+    raw = row.get("raw_confidence")
+    return (raw if raw is not None else row["confidence"]) or 0.0
+
+
+def _condition(row: Dict[str, Any]) -> str:
+    return f"{row['action']}:{row.get('interval') or '-'}"
+
+
+def decide(candidate: Dict[str, Any], train: List[Dict[str, Any]], test: List[Dict[str, Any]]) -> List[str]:
+    """
+    Action the candidate takes on every test row ("WAIT" = skip).
+    Fits on train only; decision_bias keeps learning through test
+    (each row is scored before its result is added).
+    min_confidence gates on the raw (pre-adjustment) confidence, the
+    same input the confidence model and online learner use, so a
+    threshold does not depend on which AI adjustment was live when the
+    row was recorded.
+    """
+    kind = candidate["kind"]
+
+    if kind == "baseline":
+        return [r["action"] for r in test]
+
+    if kind == "min_confidence":
+        t = candidate.get("threshold", 0.5)
+        return [r["action"] if _raw_confidence(r) >= t else "WAIT" for r in test]
+
+    if kind == "decision_bias":
+        bias = DecisionBias(
+            half_life=candidate.get("half_life", 7 * 24 * 3600),
+            prior=candidate.get("prior", 1.0),
+            z=candidate.get("z", 1.0)
+        )
+        for r in train:
+            bias.record_result(_condition(r), r["result"] == "WIN", ts=r["ts"])
+
+        min_bias = candidate.get("min_bias", 0.0)
+        actions = []
+        for r in test:
+            b = bias.get_bias(_condition(r), now=r["ts"])
+            actions.append(r["action"] if b >= min_bias else "WAIT")
+            bias.record_result(_condition(r), r["result"] == "WIN", ts=r["ts"])
+        return actions
+
+    if kind == "confidence_model":
+        train = [r for r in train if r["action"] in ACTIONS]
+        if not train:
+            return ["WAIT"] * len(test)
+
+        names = numeric_feature_names(train)
+        intervals = sorted({r["interval"] for r in train if r.get("interval")})
+        X, y, _ = build_dataset(train, names, intervals)
+        weights, b = fit_logistic(X, y, l2=candidate.get("l2", 1.0))
+
+        X_test, _, _ = build_dataset(test, names, intervals)
+        p = 1.0 / (1.0 + np.exp(-(X_test @ weights + b)))
+        t = candidate.get("threshold", 0.5)
+        return [r["action"] if pi >= t else "WAIT" for r, pi in zip(test, p)]
+
+    if kind == "policy":
+        # "package.module:function", fn(row, **params) -> CALL / PUT / WAIT
+        module, _, name = candidate["policy"].partition(":")
+        fn = getattr(importlib.import_module(module), name)
+        params = candidate.get("params", {})
+        return [fn(r, **params) for r in test]
+
+    raise ValueError(f"Unknown candidate kind: {kind}")
+
+
+# =================================================
+# RISK SIMULATION / METRICS
+# =================================================
+
+def simulate(
+    test: List[Dict[str, Any]],
+    actions: List[str],
+    rules: RiskRules,
+    payout: float = 0.8
+) -> Dict[str, Any]:
+    """
+    Replays the candidate's trades in time order under RiskGovernor rules
+    (ladder blocks + rolling windows). Signals during a block are not taken.
+    blocked_seconds is the union of ladder and rolling-window block time,
+    clipped to the test span.
+    """
+    windows = {
+        rule.window_seconds: RollingWindow(rule.window_seconds)
+        for rule in rules.window_rules
+    }
+
+    signals = trades = wins = blocked = 0
+    pnl = 0.0
+    consecutive = 0
+    blocked_until: Optional[datetime] = None
+    blocked_seconds = 0.0
+    covered_until = test[0]["ts"] if test else 0.0
+    end_ts = test[-1]["ts"] if test else 0.0
+
+    def cover(start: float, end: float):
+        # Blok aralıklarının birleşimi: çakışan kısım iki kez sayılmaz
+        nonlocal blocked_seconds, covered_until
+        end = min(end, end_ts)
+        start = max(start, covered_until)
+        if end > start:
+            blocked_seconds += end - start
+        covered_until = max(covered_until, end)
+
+    def cover_windows(ts: float):
+        block = window_block(windows, rules.window_rules)
+        if block is not None:
+            cover(ts, block[0])
+
+    for row, action in zip(test, actions):
+        if action == "WAIT":
+            continue
+        win = _outcome(row, action)
+        if win is None:
+            continue
+        signals += 1
+
+        now = datetime.utcfromtimestamp(row["ts"])
+        for w in windows.values():
+            w.expire(row["ts"])
+
+        if blocked_until is not None and now < blocked_until:
+            blocked += 1
+            continue
+        if any(windows[r.window_seconds].violates(r) for r in rules.window_rules):
+            # Süre dolmasıyla başlayan ihlaller (ör. min_win_rate) burada sayılır
+            cover_windows(row["ts"])
+            blocked += 1
+            continue
+
+        trades += 1
+        trade_pnl = payout if win else -1.0
+        pnl += trade_pnl
+        for w in windows.values():
+            w.add(row["ts"], not win, trade_pnl)
+        cover_windows(row["ts"])
+
+        if win:
+            wins += 1
+            consecutive = 0
+            continue
+
+        consecutive += 1
+        minutes = rules.ladder.lookup(consecutive)
+        if minutes:
+            blocked_until = now + timedelta(minutes=minutes)
+            cover(row["ts"], row["ts"] + minutes * 60.0)
+
+    span = test[-1]["ts"] - test[0]["ts"] if test else 0.0
+    return {
+        "rows": len(test),
+        "signals": signals,
+        "trades": trades,
+        "wins": wins,
+        "blocked_signals": blocked,
+        "pnl": pnl,
+        "blocked_seconds": blocked_seconds,
+        "span_seconds": span,
+    }
+
+
+def summarize(parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combines fold metrics into hit rate / expectancy / blocked-time share.
+    """
+    total = {k: sum(p[k] for p in parts) for k in (
+        "rows", "signals", "trades", "wins", "blocked_signals",
+        "pnl", "blocked_seconds", "span_seconds"
+    )}
+    trades = total["trades"]
+    total["folds"] = len(parts)
+    total["hit_rate"] = total["wins"] / trades if trades else 0.0
+    total["expectancy"] = total["pnl"] / trades if trades else 0.0
+    total["blocked_time_share"] = (
+        total["blocked_seconds"] / total["span_seconds"] if total["span_seconds"] else 0.0
+    )
+    return total
+
+
+# =================================================
+# WORKER
+# =================================================
+
+_ROWS: List[Dict[str, Any]] = []
+
+
+def _init_worker(rows: List[Dict[str, Any]]):
+    global _ROWS
+    _ROWS = rows
+
+
+def evaluate_fold(task: Tuple[Dict[str, Any], Tuple[int, int, int], RiskRules, float]) -> Dict[str, Any]:
+    """
+    Process-pool worker: one (candidate, fold) -> fold metrics.
+    """
+    candidate, (train_end, test_start, test_end), rules, payout = task
+    train = _ROWS[:train_end]
+    test = _ROWS[test_start:test_end]
+    return simulate(test, decide(candidate, train, test), rules, payout)
+
+
+# =================================================
+# HARNESS
+# =================================================
+
+def _load_cache(path: Path) -> Dict[str, Any]:
+    """
+    key -> {"prefix": data prefix hash, "used": epoch, "metrics": fold metrics}
+    """
+    if not path.exists():
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    # Eski biçimdeki girdiler (yalnızca metrikler) atılır
+    return {k: v for k, v in cache.items() if isinstance(v, dict) and "prefix" in v}
+
+
+def _prune_cache(cache: Dict[str, Any], prefixes: set, max_entries: int) -> Dict[str, Any]:
+    """
+    Keeps entries of any candidate whose data prefix still exists in the
+    current history (stale = history before the fold end changed), then
+    the max_entries most recently used.
+    """
+    live = [(k, v) for k, v in cache.items() if v["prefix"] in prefixes]
+    live.sort(key=lambda kv: kv[1]["used"], reverse=True)
+    return dict(live[:max_entries])
+
+
+def run(
+    rows: List[Dict[str, Any]],
+    candidates: List[Dict[str, Any]],
+    n_folds: int = 5,
+    min_train: int = 50,
+    rules: Optional[RiskRules] = None,
+    payout: float = 0.8,
+    workers: Optional[int] = None,
+    cache_path: Optional[str | Path] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Evaluates every candidate on every walk-forward fold.
+    Fold results are cached by (data up to fold end, candidate config,
+    rules, payout) hash, so re-runs only compute what changed. Entries
+    of candidates not in this run are kept while their data is current.
+    Returns candidate name -> summary (+ "per_fold").
+    """
+    rules = rules or default_rules()
+    rows = sorted(rows, key=lambda r: r["ts"])
+    folds = walk_forward_folds(len(rows), n_folds, min_train)
+
+    # Her fold'un veri hash'i: fold sonuna kadar olan satırlar
+    digest = hashlib.sha1()
+    prefix_hashes = []
+    for row in rows:
+        digest.update(_row_digest(row))
+        prefix_hashes.append(digest.hexdigest())
+
+    cache_path = Path(cache_path) if cache_path else None
+    cache = _load_cache(cache_path) if cache_path else {}
+
+    now = time.time()
+    keys: Dict[Tuple[int, int], str] = {}
+    tasks, task_keys, task_prefixes = [], [], []
+    for ci, candidate in enumerate(candidates):
+        chash = config_hash(candidate, rules, payout)
+        for fi, fold in enumerate(folds):
+            prefix = prefix_hashes[fold[2] - 1]
+            key = hashlib.sha1(f"{prefix}:{chash}:{fold}".encode()).hexdigest()
+            keys[(ci, fi)] = key
+            if key in cache:
+                cache[key]["used"] = now
+            else:
+                tasks.append((candidate, fold, rules, payout))
+                task_keys.append(key)
+                task_prefixes.append(prefix)
+
+    if tasks:
+        if workers == 1 or len(tasks) == 1:
+            _init_worker(rows)
+            results = [evaluate_fold(t) for t in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(rows,)) as pool:
+                results = list(pool.map(evaluate_fold, tasks))
+        for key, prefix, metrics in zip(task_keys, task_prefixes, results):
+            cache[key] = {"prefix": prefix, "used": now, "metrics": metrics}
+
+    table = {}
+    for ci, candidate in enumerate(candidates):
+        parts = [cache[keys[(ci, fi)]]["metrics"] for fi in range(len(folds))]
+        summary = summarize(parts)
+        summary["per_fold"] = parts
+        table[candidate.get("name", candidate["kind"])] = summary
+
+    if cache_path:
+        cache = _prune_cache(cache, set(prefix_hashes), CACHE_MAX_ENTRIES)
+        tmp = cache_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp, cache_path)
+
+    return table
+
+
+# =================================================
+# CLI
+# =================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Walk-forward evaluation of rule / model candidates")
+    parser.add_argument("--db", default="db/ai_learning.db")
+    parser.add_argument("--model", default="default", help="experience store model name")
+    parser.add_argument("--candidates", default=None, help="JSON file with a list of candidate configs")
+    parser.add_argument("--rules", default="config/risk_rules.json")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--min-train", type=int, default=50)
+    parser.add_argument("--payout", type=float, default=0.8)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args(argv)
+
+    candidates = DEFAULT_CANDIDATES
+    if args.candidates:
+        with open(args.candidates, "r", encoding="utf-8") as f:
+            candidates = json.load(f)
+
+    rules = load_rules(args.rules) if os.path.exists(args.rules) else default_rules()
+
+    store = ExperienceStore(args.db, model=args.model)
+    try:
+        rows = list(store.iter_rows())
+    finally:
+        store.close()
+
+    cache_path = None if args.no_cache else Path(os.path.dirname(args.db) or ".") / CACHE_FILE
+    table = run(
+        rows, candidates,
+        n_folds=args.folds, min_train=args.min_train, rules=rules,
+        payout=args.payout, workers=args.workers, cache_path=cache_path
+    )
+
+    print(f"{'candidate':<24} {'folds':>5} {'trades':>7} {'hit':>6} {'expect':>8} {'blocked':>8} {'blk_time':>8}")
+    for name, s in table.items():
+        print(f"{name:<24} {s['folds']:>5} {s['trades']:>7} {s['hit_rate']:>6.3f} "
+              f"{s['expectancy']:>8.3f} {s['blocked_signals']:>8} {s['blocked_time_share']:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -20,7 +20,7 @@ class Analyzer:
         """
         Feature dict -> analiz sonuçları dict
         """
-        bullish_pressure, bearish_pressure = self._pressure(feature)
+        bullish_pressure, bearish_pressure = self.pressure(feature)
         # Diğer analiz adımları burada eklenebilir
 
         return {
@@ -29,9 +29,10 @@ class Analyzer:
             # İhtiyaca göre diğer metrikler eklenebilir
         }
 
-    def _pressure(self, feature: Dict[str, Any]) -> tuple[int, int]:
+    def pressure(self, feature: Dict[str, Any]) -> tuple[int, int]:
         """
-        Candle yönüne göre bullish/bearish baskıyı hesaplar
+        Candle yönüne göre bullish/bearish baskıyı hesaplar.
+        Engine'in üst interval onayı da resample edilmiş mumlar için kullanır.
         """
         bullish = 0
         bearish = 0
@@ -1,35 +1,275 @@
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Tuple
+
 from core.analyzer import Analyzer, analysis_to_dict
 from core.image_analysis.feature_builder import feature_to_dict, FeatureBuilder
 from core.signal_logic import SignalLogic, Signal
-from core.risk_governor import RiskGovernor
+from core.risk_governor import RiskGovernor, DEFAULT_PROFILE
+from core.resampler import CandleSeries, Resampler
+from core.journal_writer import JournalWriter
+from core.feature_store import FeatureStore
+from core.session_logger import SessionLogger
+from core.metrics import Metrics, default_metrics
+
+# Base interval -> onay için bakılacak üst intervaller
+CONFIRM_INTERVALS: Dict[str, List[str]] = {
+    "1M": ["5M", "15M"],
+    "5M": ["15M", "1H"],
+    "15M": ["1H"],
+}
+
+# Onay serisi için mum başına gereken alanlar
+SERIES_FIELDS = ("timestamp", "open", "high", "low", "close")
+
+
+def _series_from_feature(feature_dict: dict) -> Optional[CandleSeries]:
+    """
+    Candle series from feature_dict["candles"] when every candle carries
+    a timestamp and OHLC (e.g. a data feed); None otherwise (screen
+    detected candles have no time axis).
+    """
+    candles = feature_dict.get("candles") or []
+    if not candles or not all(
+        all(c.get(k) is not None for k in SERIES_FIELDS) for c in candles
+    ):
+        return None
+    return CandleSeries.from_candles(candles)
+
+
+@dataclass
+class Evaluation:
+    """
+    Result of Engine.evaluate(): the signal plus what Engine.commit()
+    needs to log and store it. analysis is None when the profile was
+    already blocked (nothing to store).
+    """
+    signal: Signal
+    feature_dict: dict
+    interval: str
+    analysis: Any = None
+    risk_blocked: bool = False
+    region: Optional[str] = None
+    started: float = 0.0
+
 
 class Engine:
-    def __init__(self, risk_db_path: str, ai_manager=None):
+    def __init__(
+        self,
+        risk_db_path: str,
+        ai_manager=None,
+        confirm_lookback: int = 5,
+        risk_rules_path: Optional[str] = None,
+        journal_writer: Optional[JournalWriter] = None,
+        feature_store: Optional[FeatureStore] = None,
+        session_logger: Optional[SessionLogger] = None,
+        metrics: Optional[Metrics] = None
+    ):
         self.feature_builder = FeatureBuilder()
         self.analyzer = Analyzer()
         self.signal_logic = SignalLogic()
-        self.risk = RiskGovernor(risk_db_path)
+        self.risk = RiskGovernor(
+            risk_db_path,
+            rules_path=risk_rules_path,
+            writer=journal_writer
+        )
         self.ai = ai_manager
+        self.feature_store = feature_store
+        self.session_logger = session_logger
+        self.metrics = metrics or default_metrics()
+
+        # Higher timeframe onayı: (profile, base interval) -> Resampler
+        self.confirm_lookback = confirm_lookback
+        self._resamplers: Dict[Tuple[str, str], Resampler] = {}
 
-    def process(self, feature_dict: dict, interval: str):
+    def process(
+        self,
+        feature_dict: dict,
+        interval: str,
+        series: Optional[CandleSeries] = None,
+        profile: str = DEFAULT_PROFILE,
+        region: Optional[str] = None,
+        signal_id: Optional[int] = None,
+        session: Optional[str] = None,
+        frame: Optional[str] = None
+    ):
+        """
+        Features -> signal: evaluate() followed by commit().
+        """
+        evaluation = self.evaluate(feature_dict, interval, series, profile, region)
+        return self.commit(evaluation, signal_id=signal_id, session=session, frame=frame)
+
+    def evaluate(
+        self,
+        feature_dict: dict,
+        interval: str,
+        series: Optional[CandleSeries] = None,
+        profile: str = DEFAULT_PROFILE,
+        region: Optional[str] = None
+    ) -> Evaluation:
+        """
+        Analysis, confirmation, AI bias and risk gate without side
+        effects on the session log or the feature store; a result that
+        is thrown away (e.g. a cancelled job) leaves no trace.
+        """
         # Interval kontrolü
         if not interval in ["1M","5M","15M"]:
             raise ValueError(f"Invalid interval: {interval}")
 
         # Risk check
-        if self.risk.is_blocked():
-            return Signal(action="WAIT", confidence=0.0, reason="Risk blocked")
+        if self.risk.is_blocked(profile):
+            return Evaluation(
+                signal=Signal(action="WAIT", confidence=0.0, reason="Risk blocked"),
+                feature_dict=feature_dict,
+                interval=interval
+            )
+
+        # Aşama süreleri (ms) HUD için; ölçüm yalnızca perf_counter + deque append
+        clock = time.perf_counter
+        metrics = self.metrics
+        t0 = clock()
 
         # Analysis
         analysis = self.analyzer.analyze(feature_dict)
         signal = self.signal_logic.decide(analysis)
+        t1 = clock()
+        metrics.observe("engine.analyze", (t1 - t0) * 1000.0)
+
+        # Higher timeframe confirmation (opsiyonel, tek grafikten resample)
+        if series is None:
+            series = _series_from_feature(feature_dict)
+        if series is not None:
+            signal = self._confirm_higher(signal, series, interval, profile)
+            t2 = clock()
+            metrics.observe("engine.confirm", (t2 - t1) * 1000.0)
+            t1 = t2
 
         # AI bias (opsiyonel)
         if self.ai and self.ai.is_active():
-            signal = self.ai.adjust_signal(signal, feature_dict, analysis_to_dict(analysis))
+            signal = self.ai.adjust_signal(signal, feature_dict, analysis_to_dict(analysis), interval)
+            t2 = clock()
+            metrics.observe("engine.ai", (t2 - t1) * 1000.0)
+            t1 = t2
 
         # Risk gate
-        if not self.risk.allow_signal(signal.action):
+        risk_blocked = not self.risk.allow_signal(signal.action, profile)
+        if risk_blocked:
             signal = Signal(action="WAIT", confidence=0.0, reason="Blocked by risk governor")
+        metrics.observe("engine.risk", (clock() - t1) * 1000.0)
+
+        return Evaluation(
+            signal=signal,
+            feature_dict=feature_dict,
+            interval=interval,
+            analysis=analysis,
+            risk_blocked=risk_blocked,
+            region=region,
+            started=t0
+        )
+
+    def commit(
+        self,
+        evaluation: Evaluation,
+        signal_id: Optional[int] = None,
+        session: Optional[str] = None,
+        frame: Optional[str] = None
+    ) -> Signal:
+        """
+        Side effects of an evaluation. With a session_logger the signal
+        is logged (with frame, the captured chart image, for replay) and
+        its id is set on the returned Signal and, with the session key,
+        on the feature store row; (session, signal_id) is for callers
+        that log signals themselves.
+        """
+        signal = evaluation.signal
+        if evaluation.analysis is None:
+            return signal
+
+        clock = time.perf_counter
+        t1 = clock()
+
+        # Session log (opsiyonel): id, feature store satırını sonuca bağlar
+        if self.session_logger is not None:
+            logged_id = self.session_logger.log_signal(
+                evaluation.interval, signal, evaluation.risk_blocked, frame=frame
+            )
+            if logged_id is not None:
+                signal = replace(signal, signal_id=logged_id)
+                if signal_id is None:
+                    session, signal_id = self.session_logger.session, logged_id
+
+        # Feature store (opsiyonel): engine'in gördüğü veriyi sakla
+        if self.feature_store is not None:
+            self.feature_store.add(
+                evaluation.feature_dict,
+                evaluation.analysis,
+                interval=evaluation.interval,
+                region=evaluation.region,
+                session=session,
+                signal_id=signal_id,
+                action=signal.action,
+                confidence=signal.confidence
+            )
+            self.metrics.observe("engine.store", (clock() - t1) * 1000.0)
+
+        self.metrics.observe("engine.total", (clock() - evaluation.started) * 1000.0)
+        return signal
+
+    def register_trade_result(
+        self,
+        signal: Signal,
+        result: str,
+        interval: Optional[str] = None,
+        features: Optional[dict] = None,
+        profile: str = DEFAULT_PROFILE
+    ):
+        """
+        WIN / LOSS from the user: feeds risk governor and AI learning.
+        """
+        self.risk.register_trade_result(result, profile=profile)
+
+        if self.ai:
+            self.ai.learn_from_result(signal, result, interval=interval, features=features)
+
+    # ----------------------------------
+    # Multi-timeframe confirmation
+    # ----------------------------------
+
+    def _confirm_higher(
+        self,
+        signal: Signal,
+        series: CandleSeries,
+        interval: str,
+        profile: str
+    ) -> Signal:
+        """
+        Resamples the base series into higher intervals and
+        downgrades the signal to WAIT if a higher timeframe disagrees.
+        """
+        key = (profile, interval)
+        resampler = self._resamplers.get(key)
+        if resampler is None:
+            resampler = Resampler(interval, CONFIRM_INTERVALS.get(interval, []))
+            self._resamplers[key] = resampler
+        resampler.update(series)
+
+        if signal.action == "WAIT":
+            return signal
+
+        wanted = 1 if signal.action == "CALL" else -1
+        for code in resampler.targets:
+            bars = resampler.get(code).tail(self.confirm_lookback)
+            if len(bars) == 0:
+                continue
+
+            bullish, bearish = self.analyzer.pressure({"candles": bars.to_candle_dicts()})
+            direction = (bullish > bearish) - (bearish > bullish)
+
+            if direction == -wanted:
+                return Signal(
+                    action="WAIT",
+                    confidence=0.0,
+                    reason=f"{signal.reason} | {code} disagrees"
+                )
 
         return signal
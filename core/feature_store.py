@@ -0,0 +1,293 @@
+# FEATURE STORE - Engine'in gördüğü her analizin sabit genişlikli feature vektörü (db/analysis.db)
+
+import math
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.journal_writer import JournalWriter
+
+
+# =================================================
+# VECTOR LAYOUT
+# =================================================
+
+LAYOUT_VERSION = 1
+
+N_CANDLES = 32                                  # son N mum, en yenisi sonda
+CANDLE_FIELDS = ("open", "high", "low", "close", "candle_direction")
+SCALAR_FIELDS = ("volatility", "bullish_pressure", "bearish_pressure", "n_candles")
+
+FEATURE_COLUMNS: List[str] = [
+    f"c{i}.{f}" for i in range(N_CANDLES) for f in CANDLE_FIELDS
+] + list(SCALAR_FIELDS)
+
+FEATURE_DIM = len(FEATURE_COLUMNS)
+
+ROW_COLUMNS = ("ts", "session", "signal_id", "interval", "region", "action", "confidence", "version", "vector")
+
+
+def encode_features(
+    feature: Dict[str, Any],
+    analysis: Optional[Dict[str, Any]] = None
+) -> np.ndarray:
+    """
+    Feature dict (+ analysis) -> float32[FEATURE_DIM].
+    Missing candles (fewer than N_CANDLES) are NaN, left-padded.
+    """
+    vector = np.full(FEATURE_DIM, np.nan, dtype=np.float32)
+
+    candles = (feature.get("candles") or [])[-N_CANDLES:]
+    start = (N_CANDLES - len(candles)) * len(CANDLE_FIELDS)
+    for i, candle in enumerate(candles):
+        base = start + i * len(CANDLE_FIELDS)
+        for j, name in enumerate(CANDLE_FIELDS):
+            value = candle.get(name)
+            if isinstance(value, (int, float)):
+                vector[base + j] = value
+
+    analysis = analysis or {}
+    scalars = (
+        feature.get("volatility"),
+        analysis.get("bullish_pressure"),
+        analysis.get("bearish_pressure"),
+        len(feature.get("candles") or []),
+    )
+    base = N_CANDLES * len(CANDLE_FIELDS)
+    for j, value in enumerate(scalars):
+        if isinstance(value, (int, float)):
+            vector[base + j] = value
+
+    return vector
+
+
+# =================================================
+# SCAN RESULT
+# =================================================
+
+@dataclass
+class FeatureBatch:
+    """
+    Column arrays of a range scan; X is (rows, FEATURE_DIM) float32.
+    """
+    ts: np.ndarray
+    session: np.ndarray          # session dosyası adı (None: loglanmamış)
+    signal_id: np.ndarray        # -1: sinyal id yok
+    interval: np.ndarray
+    region: np.ndarray
+    action: np.ndarray
+    confidence: np.ndarray
+    X: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+
+# =================================================
+# STORE
+# =================================================
+
+class FeatureStore:
+    """
+    Append-only feature vectors in SQLite, indexed by time, interval,
+    region and (session, signal id). Signal ids are record numbers of
+    one session file and restart in every session, so a signal is
+    addressed by both. Rows are buffered and inserted in batches
+    (one transaction each), optionally on a JournalWriter thread.
+    """
+
+    def __init__(
+        self,
+        db_path: str = "db/analysis.db",
+        batch_size: int = 64,
+        writer: Optional[JournalWriter] = None
+    ):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.writer = writer
+
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+        self._pending: List[Tuple] = []
+        self._init_db()
+
+    def _init_db(self):
+        with self._db_lock:
+            conn = self._conn
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS feature_vectors (
+                    id INTEGER PRIMARY KEY,
+                    ts REAL NOT NULL,
+                    signal_id INTEGER,
+                    interval TEXT,
+                    region TEXT,
+                    action TEXT,
+                    confidence REAL,
+                    version INTEGER NOT NULL,
+                    vector BLOB NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_feature_vectors_ts ON feature_vectors (ts)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_feature_vectors_interval_ts ON feature_vectors (interval, ts)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_feature_vectors_region_ts ON feature_vectors (region, ts)")
+            # session kolonunu ekle (eski DB varsa); signal id tek başına oturumlar arasında tekrar eder
+            columns = [col[1] for col in conn.execute("PRAGMA table_info(feature_vectors)")]
+            if "session" not in columns:
+                conn.execute("ALTER TABLE feature_vectors ADD COLUMN session TEXT")
+            conn.execute("DROP INDEX IF EXISTS idx_feature_vectors_signal")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_feature_vectors_session_signal ON feature_vectors (session, signal_id)")
+
+    # -------------------------------------------------
+    # WRITE
+    # -------------------------------------------------
+
+    def add(
+        self,
+        feature: Dict[str, Any],
+        analysis: Optional[Dict[str, Any]] = None,
+        interval: Optional[str] = None,
+        region: Optional[str] = None,
+        signal_id: Optional[int] = None,
+        action: Optional[str] = None,
+        confidence: Optional[float] = None,
+        ts: Optional[float] = None,
+        session: Optional[str] = None
+    ):
+        """
+        session: session key (SessionLogger.session) of signal_id.
+        """
+        vector = encode_features(feature, analysis)
+        row = (
+            time.time() if ts is None else ts,
+            session,
+            signal_id,
+            interval,
+            region,
+            action,
+            confidence,
+            LAYOUT_VERSION,
+            vector.tobytes()
+        )
+
+        with self._lock:
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self, wait: bool = True):
+        with self._lock:
+            self._flush_locked()
+        if wait and self.writer is not None:
+            self.writer.flush()
+
+    def _flush_locked(self):
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        if self.writer is not None:
+            self.writer.call(lambda: self._insert(batch))
+        else:
+            self._insert(batch)
+
+    def _insert(self, rows: List[Tuple]):
+        with self._db_lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(f"""
+                    INSERT INTO feature_vectors ({", ".join(ROW_COLUMNS)})
+                    VALUES ({", ".join("?" * len(ROW_COLUMNS))})
+                """, rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def close(self):
+        self.flush()
+        with self._db_lock:
+            self._conn.close()
+
+    # -------------------------------------------------
+    # RANGE SCAN
+    # -------------------------------------------------
+
+    def scan(
+        self,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        interval: Optional[str] = None,
+        region: Optional[str] = None
+    ) -> FeatureBatch:
+        """
+        Rows in [since, until), oldest first, as NumPy columns.
+        Pending rows are flushed first.
+        """
+        self.flush()
+
+        where, args = ["version = ?"], [LAYOUT_VERSION]
+        for column, op, value in (
+            ("ts", ">=", since), ("ts", "<", until),
+            ("interval", "=", interval), ("region", "=", region)
+        ):
+            if value is not None:
+                where.append(f"{column} {op} ?")
+                args.append(value)
+
+        with self._db_lock:
+            rows = self._conn.execute(f"""
+                SELECT ts, session, signal_id, interval, region, action, confidence, vector
+                FROM feature_vectors
+                WHERE {" AND ".join(where)}
+                ORDER BY ts
+            """, args).fetchall()
+
+        if not rows:
+            return FeatureBatch(
+                ts=np.zeros(0), session=np.zeros(0, dtype=object),
+                signal_id=np.zeros(0, dtype=np.int64),
+                interval=np.zeros(0, dtype=object), region=np.zeros(0, dtype=object),
+                action=np.zeros(0, dtype=object), confidence=np.zeros(0, dtype=np.float32),
+                X=np.zeros((0, FEATURE_DIM), dtype=np.float32)
+            )
+
+        ts, sessions, signal_id, intervals, regions, actions, confidences, vectors = zip(*rows)
+        return FeatureBatch(
+            ts=np.array(ts, dtype=np.float64),
+            session=np.array(sessions, dtype=object),
+            signal_id=np.array([-1 if s is None else s for s in signal_id], dtype=np.int64),
+            interval=np.array(intervals, dtype=object),
+            region=np.array(regions, dtype=object),
+            action=np.array(actions, dtype=object),
+            confidence=np.array([math.nan if c is None else c for c in confidences], dtype=np.float32),
+            X=np.frombuffer(b"".join(vectors), dtype=np.float32).reshape(len(rows), FEATURE_DIM)
+        )
+
+    def by_signal(self, session: str, signal_id: int) -> Optional[np.ndarray]:
+        """
+        Feature vector behind signal_id of the given session.
+        """
+        self.flush()
+        with self._db_lock:
+            row = self._conn.execute(
+                """
+                SELECT vector FROM feature_vectors
+                WHERE session = ? AND signal_id = ? AND version = ?
+                ORDER BY ts DESC LIMIT 1
+                """,
+                (session, signal_id, LAYOUT_VERSION)
+            ).fetchone()
+        return np.frombuffer(row[0], dtype=np.float32) if row else None
@@ -0,0 +1,282 @@
+# FRAME CACHE - Session replay için küçültülmüş kare (thumbnail) önbelleği: bellek LRU + disk + arka plan prefetch
+
+import hashlib
+import os
+import struct
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+THUMB_HEADER = struct.Struct("<HH")     # width, height; ardından zlib(RGB888)
+THUMB_SUFFIX = ".thumb"
+TMP_SUFFIX = ".tmp"
+
+
+@dataclass(frozen=True)
+class Thumbnail:
+    width: int
+    height: int
+    rgb: bytes          # RGB888, satır satır (stride = 3 * width)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.rgb)
+
+
+def decode_frame(path: str, size: Tuple[int, int]) -> Thumbnail:
+    """
+    Full-resolution capture -> downscaled RGB thumbnail (fits in size).
+    """
+    from PIL import Image
+
+    with Image.open(path) as img:
+        img = img.convert("RGB")
+        img.thumbnail(size)
+        return Thumbnail(img.width, img.height, img.tobytes())
+
+
+def thumbs_dir(session_path: str) -> str:
+    return session_path + ".thumbs"
+
+
+class FrameCache:
+    """
+    Thumbnails of one session's captured frames.
+
+    get() never touches disk: it returns the in-memory thumbnail or
+    None and queues a load. A background thread serves the queue
+    (newest requests first), reading the per-session disk cache or
+    decoding and downscaling the capture, and calls on_ready(path).
+    Memory use is capped by max_bytes (LRU). A failed load is not
+    retried for retry_after seconds. The disk cache is capped by
+    max_disk_bytes: least recently used files (by mtime, touched on
+    read) go first, so keys of replaced captures or an old thumb_size
+    age out.
+
+    Frames come from the "frame" field of signal records
+    (SessionLogger.log_signal(frame=...)); sessions without it have
+    nothing to show.
+    """
+
+    def __init__(
+        self,
+        session_path: str,
+        thumb_size: Tuple[int, int] = (480, 270),
+        max_bytes: int = 64 * 1024 * 1024,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+        retry_after: float = 30.0,
+        on_ready: Optional[Callable[[str], None]] = None,
+        decoder: Callable[[str, Tuple[int, int]], Thumbnail] = decode_frame
+    ):
+        self.thumb_size = thumb_size
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.retry_after = retry_after
+        self.on_ready = on_ready
+        self.decoder = decoder
+        self.cache_dir = thumbs_dir(session_path)
+
+        self._lru: "OrderedDict[str, Thumbnail]" = OrderedDict()
+        self._bytes = 0
+
+        # path -> None; sonda olan önce yüklenir
+        self._wanted: "OrderedDict[str, None]" = OrderedDict()
+        self._failed: Dict[str, float] = {}   # path -> başarısızlık zamanı (monotonic)
+        self._disk_bytes: Optional[int] = None  # ilk yazmada diskten sayılır
+        self._protected: Dict[str, int] = {}   # son prefetch penceresi (path -> öncelik sırası)
+        self._cond = threading.Condition()
+        self._stopping = False
+
+        self.hits = 0
+        self.misses = 0
+
+        self._thread = threading.Thread(target=self._run, name="FrameCache", daemon=True)
+        self._thread.start()
+
+    # -------------------------------------------------
+    # GUI THREAD API (never blocks on disk)
+    # -------------------------------------------------
+
+    def get(self, path: str) -> Optional[Thumbnail]:
+        with self._cond:
+            thumb = self._lru.get(path)
+            if thumb is not None:
+                self._lru.move_to_end(path)
+                self.hits += 1
+                return thumb
+
+            self.misses += 1
+            self._want([path])
+        return None
+
+    def prefetch(self, paths: List[str]):
+        """
+        Replaces the prefetch queue. paths are in priority order
+        (first = most urgent), e.g. current, next, previous, ...
+        """
+        with self._cond:
+            self._protected = {p: rank for rank, p in reversed(list(enumerate(paths)))}
+            self._wanted.clear()
+            self._want([p for p in paths if p and p not in self._lru])
+
+    def close(self):
+        with self._cond:
+            self._stopping = True
+            self._wanted.clear()
+            self._cond.notify()
+        self._thread.join(2.0)
+
+    def memory_bytes(self) -> int:
+        return self._bytes
+
+    # -------------------------------------------------
+    # INTERNAL
+    # -------------------------------------------------
+
+    def _want(self, paths: List[str]):
+        """
+        Caller holds self._cond. Queue is popped from the end.
+        """
+        now = time.monotonic()
+        for path in reversed(paths):
+            failed_at = self._failed.get(path)
+            if failed_at is not None:
+                if now - failed_at < self.retry_after:
+                    continue
+                del self._failed[path]
+            self._wanted[path] = None
+            self._wanted.move_to_end(path)
+        if self._wanted:
+            self._cond.notify()
+
+    def _put(self, path: str, thumb: Thumbnail):
+        with self._cond:
+            old = self._lru.pop(path, None)
+            if old is not None:
+                self._bytes -= old.nbytes
+            self._lru[path] = thumb
+            self._bytes += thumb.nbytes
+
+            while self._bytes > self.max_bytes and len(self._lru) > 1:
+                # Önce pencere dışındaki en eski; yoksa penceredeki en düşük öncelikli
+                victim = next(
+                    (k for k in self._lru if k not in self._protected),
+                    None
+                ) or max(self._lru, key=self._protected.get)
+                self._bytes -= self._lru.pop(victim).nbytes
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._wanted and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                path, _ = self._wanted.popitem(last=True)
+                if path in self._lru:
+                    continue
+
+            try:
+                thumb = self._load(path)
+            except Exception as e:
+                print(f"FrameCache: cannot load {path}: {e}")
+                with self._cond:
+                    self._failed[path] = time.monotonic()
+                continue
+
+            self._put(path, thumb)
+            if self.on_ready is not None:
+                self.on_ready(path)
+
+    def _load(self, path: str) -> Thumbnail:
+        disk_path = self._disk_path(path)
+        if os.path.exists(disk_path):
+            try:
+                thumb = self._read_disk(disk_path)
+                os.utime(disk_path)     # LRU: son kullanım
+                return thumb
+            except (OSError, ValueError, zlib.error, struct.error):
+                pass    # bozuk önbellek dosyası: yeniden üret
+
+        thumb = self.decoder(path, self.thumb_size)
+        self._write_disk(disk_path, thumb)
+        return thumb
+
+    def _disk_path(self, path: str) -> str:
+        """
+        Keyed by source path, mtime/size and thumbnail size, so a
+        replaced capture or a new thumb_size is decoded again.
+        """
+        st = os.stat(path)
+        key = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}|{self.thumb_size}"
+        return os.path.join(self.cache_dir, hashlib.sha1(key.encode()).hexdigest()[:20] + THUMB_SUFFIX)
+
+    @staticmethod
+    def _read_disk(disk_path: str) -> Thumbnail:
+        with open(disk_path, "rb") as f:
+            data = f.read()
+        width, height = THUMB_HEADER.unpack_from(data)
+        rgb = zlib.decompress(data[THUMB_HEADER.size:])
+        if len(rgb) != width * height * 3:
+            raise ValueError("corrupt thumbnail")
+        return Thumbnail(width, height, rgb)
+
+    def _write_disk(self, disk_path: str, thumb: Thumbnail):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, size, _ in self._disk_files())
+            tmp = disk_path + TMP_SUFFIX
+            with open(tmp, "wb") as f:
+                f.write(THUMB_HEADER.pack(thumb.width, thumb.height))
+                f.write(zlib.compress(thumb.rgb, 1))
+            os.replace(tmp, disk_path)
+            self._disk_bytes += os.path.getsize(disk_path)
+        except OSError as e:
+            print(f"FrameCache: cannot persist thumbnail: {e}")
+            return
+
+        if self._disk_bytes > self.max_disk_bytes:
+            self._prune_disk(keep=disk_path)
+
+    def _disk_files(self) -> List[Tuple[float, int, str]]:
+        """
+        (mtime, size, path) of the disk cache files. Leftover .tmp
+        files of an interrupted write are deleted.
+        """
+        files = []
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                try:
+                    if entry.name.endswith(TMP_SUFFIX):
+                        os.remove(entry.path)
+                    elif entry.name.endswith(THUMB_SUFFIX):
+                        st = entry.stat()
+                        files.append((st.st_mtime, st.st_size, entry.path))
+                except OSError:
+                    pass
+        return files
+
+    def _prune_disk(self, keep: str):
+        """
+        Deletes least recently used files down to 3/4 of max_disk_bytes
+        (hysteresis: not on every write).
+        """
+        files = sorted(self._disk_files())
+        total = sum(size for _, size, _ in files)
+        target = self.max_disk_bytes * 3 // 4
+        for _, size, path in files:
+            if total <= target:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                pass
+        self._disk_bytes = total
@@ -0,0 +1,331 @@
+# JOURNAL WRITER - Kayıtları arka plan thread'inde dosyaya yazar (GUI / engine thread'i bloke olmaz)
+
+import atexit
+import os
+import queue
+import threading
+import time
+from typing import Callable, Dict, IO, List, Optional, Tuple
+
+
+FSYNC_POLICIES = ("none", "interval", "always")
+
+# Kuyruk elemanı türleri
+_APPEND = 0
+_CALL = 1
+_BARRIER = 2
+_STOP = 3
+
+
+class JournalWriter:
+    """
+    Asynchronous append-only writer shared by loggers.
+
+    Records go to a bounded queue and are written by one background
+    thread. Queued records are group-committed: written to buffered
+    handles, flushed once per batch, fsync'ed according to policy:
+
+        "none"     : flush to OS only
+        "interval" : fsync at most every fsync_interval seconds
+        "always"   : fsync after every record
+
+    call() functions that raise (e.g. a locked DB) are retried with
+    backoff up to call_retries times; they must be idempotent (one
+    transaction). After close(), append/call return False and count
+    the record as dropped instead of raising. An append that fails on
+    the writer thread is rolled back (files truncated to their previous
+    size), counted in failed and reported through its on_error.
+    """
+
+    def __init__(
+        self,
+        max_queue: int = 10000,
+        flush_interval: float = 0.2,
+        fsync: str = "interval",
+        fsync_interval: float = 1.0,
+        max_open_files: int = 32,
+        call_retries: int = 5,
+        retry_delay: float = 0.5
+    ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unsupported fsync policy: {fsync}")
+
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.max_open_files = max_open_files
+        self.call_retries = call_retries
+        self.retry_delay = retry_delay
+
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+
+        self._queue: "queue.Queue[tuple]" = queue.Queue(maxsize=max_queue)
+        self._handles: Dict[str, IO[bytes]] = {}
+        self._dirty: Dict[str, IO[bytes]] = {}
+        self._last_fsync = time.monotonic()
+        self._retries: List[Tuple[float, Callable[[], None], int]] = []   # (due, fn, attempt)
+        self._closed = False
+
+        self._thread = threading.Thread(
+            target=self._run,
+            name="JournalWriter",
+            daemon=True
+        )
+        self._thread.start()
+
+    # -------------------------------------------------
+    # PUBLIC API (never blocks, except flush / close)
+    # -------------------------------------------------
+
+    def append(
+        self,
+        path: str,
+        data: bytes,
+        index_path: Optional[str] = None,
+        index_entry: Optional[Callable[[int], bytes]] = None,
+        on_error: Optional[Callable[[Exception], None]] = None
+    ) -> bool:
+        """
+        Queues data for append to path.
+        index_entry(offset) -> bytes is appended to index_path after the
+        data is written, with the data's start offset.
+        Returns False if the queue is full (record dropped). If the write
+        itself fails later, on_error(exc) is called on the writer thread.
+        """
+        return self._put((_APPEND, path, data, index_path, index_entry, on_error))
+
+    def call(self, fn: Callable[[], None]) -> bool:
+        """
+        Runs fn on the writer thread, in queue order (e.g. DB batch inserts).
+        """
+        return self._put((_CALL, fn))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Waits until everything queued so far is written and flushed.
+        """
+        if self._closed:
+            return True
+
+        done = threading.Event()
+        self._queue.put((_BARRIER, done))
+        return done.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """
+        Drains the queue, fsyncs and closes all files.
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        self._queue.put((_STOP,))
+        self._thread.join(timeout)
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    # -------------------------------------------------
+    # INTERNAL HELPERS
+    # -------------------------------------------------
+
+    def _put(self, item: tuple) -> bool:
+        if self._closed:
+            self.dropped += 1
+            return False
+        try:
+            self._queue.put_nowait(item)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def _run(self):
+        while True:
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._run_retries()
+                self._commit()
+                continue
+
+            # Group commit: kuyruktaki her şeyi tek seferde yaz
+            batch = [item]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            barriers = []
+            for entry in batch:
+                kind = entry[0]
+                if kind == _APPEND:
+                    self._write(*entry[1:])
+                elif kind == _CALL:
+                    self._safe_call(entry[1])
+                elif kind == _BARRIER:
+                    barriers.append(entry[1])
+                elif kind == _STOP:
+                    stop = True
+
+            # Bekleyen tekrar denemeleri: kapanışta vadesi beklenmez
+            self._run_retries(force=stop)
+
+            self._commit(force_fsync=stop)
+            for done in barriers:
+                done.set()
+
+            if stop:
+                self._close_all()
+                return
+
+    def _write(self, path, data, index_path, index_entry, on_error):
+        sizes: Dict[str, int] = {}
+        try:
+            fh = self._handle(path)
+            offset = fh.tell()
+            sizes[path] = offset
+            # Index girdisi veriden önce üretilir: callback hatası yarım kayıt bırakmaz
+            entry = index_entry(offset) if index_path is not None and index_entry is not None else None
+
+            fh.write(data)
+            self._dirty[path] = fh
+
+            if entry is not None:
+                idx = self._handle(index_path)
+                sizes[index_path] = idx.tell()
+                idx.write(entry)
+                self._dirty[index_path] = idx
+
+            self.written += 1
+            if self.fsync == "always":
+                self._commit(force_fsync=True)
+        except Exception as e:
+            self.failed += 1
+            print(f"JournalWriter: write failed for {path}: {e}")
+            self._rollback(sizes)
+            if on_error is not None:
+                try:
+                    on_error(e)
+                except Exception as cb_error:
+                    print(f"JournalWriter: on_error failed for {path}: {cb_error}")
+
+    def _rollback(self, sizes: Dict[str, int]):
+        """
+        Truncates files back to their size before a failed append, so
+        data and index stay in step.
+        """
+        for path, size in sizes.items():
+            fh = self._handles.pop(path, None)
+            self._dirty.pop(path, None)
+            try:
+                if fh is not None:
+                    fh.close()      # önceki kayıtların tamponu diske gider
+                if os.path.getsize(path) > size:
+                    os.truncate(path, size)
+            except OSError as e:
+                print(f"JournalWriter: rollback failed for {path}: {e}")
+
+    def _safe_call(self, fn, attempt: int = 0):
+        try:
+            fn()
+        except Exception as e:
+            if attempt < self.call_retries:
+                print(f"JournalWriter: call failed (attempt {attempt + 1}), retrying: {e}")
+                due = time.monotonic() + self.retry_delay * (2 ** attempt)
+                self._retries.append((due, fn, attempt + 1))
+            else:
+                self.dropped += 1
+                print(f"JournalWriter: call failed after {attempt + 1} attempts, dropped: {e}")
+
+    def _run_retries(self, force: bool = False):
+        """
+        Re-runs failed calls whose backoff has passed. With force (at
+        close), every remaining attempt runs now.
+        """
+        while self._retries:
+            now = time.monotonic()
+            due = [r for r in self._retries if force or r[0] <= now]
+            if not due:
+                return
+            self._retries = [r for r in self._retries if not (force or r[0] <= now)]
+            for _, fn, attempt in due:
+                self._safe_call(fn, attempt)
+
+    def _handle(self, path: str) -> IO[bytes]:
+        fh = self._handles.get(path)
+        if fh is not None:
+            return fh
+
+        if len(self._handles) >= self.max_open_files:
+            self._commit(force_fsync=self.fsync != "none")
+            oldest = next(iter(self._handles))
+            self._handles.pop(oldest).close()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        fh = open(path, "ab")
+        self._handles[path] = fh
+        return fh
+
+    def _commit(self, force_fsync: bool = False):
+        """
+        Flushes dirty handles (data files before their index files,
+        in first-write order) and fsyncs according to policy.
+        """
+        if not self._dirty:
+            return
+
+        do_fsync = force_fsync or (
+            self.fsync == "interval"
+            and time.monotonic() - self._last_fsync >= self.fsync_interval
+        )
+
+        for fh in self._dirty.values():
+            try:
+                fh.flush()
+                if do_fsync:
+                    os.fsync(fh.fileno())
+            except OSError as e:
+                print(f"JournalWriter: flush failed for {fh.name}: {e}")
+
+        if do_fsync:
+            self._last_fsync = time.monotonic()
+            self._dirty.clear()
+        elif self.fsync != "interval":
+            self._dirty.clear()
+
+    def _close_all(self):
+        for fh in self._handles.values():
+            try:
+                fh.close()
+            except OSError:
+                pass
+        self._handles.clear()
+        self._dirty.clear()
+
+
+# =================================================
+# SHARED INSTANCE
+# =================================================
+
+_default_writer: Optional[JournalWriter] = None
+_default_lock = threading.Lock()
+
+
+def default_writer() -> JournalWriter:
+    """
+    Process-wide writer, closed (drained) at interpreter exit.
+    """
+    global _default_writer
+    with _default_lock:
+        if _default_writer is None or _default_writer._closed:
+            _default_writer = JournalWriter()
+            atexit.register(_default_writer.close)
+        return _default_writer
@@ -0,0 +1,149 @@
+# METRICS - Pipeline sayaçları / gauge'lar / gecikme örnekleri (HUD için paylaşılan snapshot)
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Optional
+
+import numpy as np
+
+
+PERCENTILES = (50, 90, 99)
+
+# Ortak metrik isimleri (yazanlar ve HUD aynı anahtarları kullanır)
+CAPTURE_FRAMES = "capture.frames"               # rate: yakalanan kare
+ANALYZE_SUPERSEDED = "analyze.superseded"       # counter: yeni kare bekleyen işi ezdi
+QUEUE_ANALYZE = "queue.analyze"                 # gauge
+QUEUE_JOURNAL = "queue.journal"                 # gauge
+RISK_BLOCKED_UNTIL = "risk.blocked_until"       # gauge: UTC datetime veya None
+
+
+class Metrics:
+    """
+    Process-wide pipeline metrics.
+
+    Recording is cheap (a deque append or a short locked increment) and
+    never computes anything; aggregation happens only in snapshot(),
+    which readers such as the HUD call at a low fixed rate.
+
+        observe(name, ms)  : latency sample (last `samples` kept)
+        mark(name)         : event for a rate (per second, last `rate_window` s)
+        incr(name, n)      : counter
+        set(name, value)   : gauge value
+        gauge(name, fn)    : gauge read from fn() at snapshot time
+    """
+
+    def __init__(self, samples: int = 1024, rate_window: float = 5.0):
+        self.samples = samples
+        self.rate_window = rate_window
+
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self._gauges: Dict[str, Any] = {}
+        self._gauge_fns: Dict[str, Callable[[], Any]] = {}
+        self._latency: Dict[str, Deque[float]] = {}
+        self._events: Dict[str, Deque[float]] = {}
+
+    # -------------------------------------------------
+    # RECORDING (hot path)
+    # -------------------------------------------------
+
+    def observe(self, name: str, ms: float):
+        series = self._latency.get(name)
+        if series is None:
+            series = self._latency.setdefault(name, deque(maxlen=self.samples))
+        series.append(ms)
+
+    def mark(self, name: str):
+        events = self._events.get(name)
+        if events is None:
+            events = self._events.setdefault(name, deque(maxlen=4096))
+        events.append(time.monotonic())
+
+    def incr(self, name: str, n: int = 1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def set(self, name: str, value: Any):
+        self._gauges[name] = value
+
+    def gauge(self, name: str, fn: Optional[Callable[[], Any]]):
+        """
+        Registers (or with fn=None removes) a pulled gauge.
+        """
+        with self._lock:
+            if fn is None:
+                self._gauge_fns.pop(name, None)
+            else:
+                self._gauge_fns[name] = fn
+
+    @contextmanager
+    def timer(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, (time.perf_counter() - start) * 1000.0)
+
+    # -------------------------------------------------
+    # SNAPSHOT (reader side)
+    # -------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Plain-dict view: counters, gauges, rates (/s) and latency
+        percentiles (ms) per stage.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            gauge_fns = dict(self._gauge_fns)
+        gauges = dict(self._gauges)
+
+        for name, fn in gauge_fns.items():
+            try:
+                gauges[name] = fn()
+            except Exception:
+                gauges[name] = None
+
+        now = time.monotonic()
+        rates = {}
+        for name, events in list(self._events.items()):
+            stamps = np.fromiter(tuple(events), dtype=np.float64)
+            recent = stamps[stamps >= now - self.rate_window]
+            rates[name] = len(recent) / self.rate_window
+
+        latency = {}
+        for name, series in list(self._latency.items()):
+            values = np.fromiter(tuple(series), dtype=np.float64)
+            if len(values) == 0:
+                continue
+            p = np.percentile(values, PERCENTILES)
+            latency[name] = {
+                "n": len(values),
+                **{f"p{q}": float(v) for q, v in zip(PERCENTILES, p)}
+            }
+
+        return {
+            "ts": time.time(),
+            "counters": counters,
+            "gauges": gauges,
+            "rates": rates,
+            "latency": latency,
+        }
+
+
+# =================================================
+# SHARED INSTANCE
+# =================================================
+
+_default_metrics: Optional[Metrics] = None
+_default_lock = threading.Lock()
+
+
+def default_metrics() -> Metrics:
+    global _default_metrics
+    with _default_lock:
+        if _default_metrics is None:
+            _default_metrics = Metrics()
+        return _default_metrics
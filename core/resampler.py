@@ -0,0 +1,244 @@
+# RESAMPLER - Düşük interval mum serisinden yüksek interval mumları üretir (MTF onayı tek grafikten)
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from core.intervals import get_interval, higher_interval
+
+
+# =================================================
+# DATA STRUCTURE
+# =================================================
+
+@dataclass
+class CandleSeries:
+    """
+    Time-indexed OHLC series.
+    timestamps: candle open time, epoch seconds (ascending).
+    """
+    timestamps: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def empty(cls) -> "CandleSeries":
+        return cls(
+            timestamps=np.empty(0, dtype=np.int64),
+            open=np.empty(0, dtype=np.float64),
+            high=np.empty(0, dtype=np.float64),
+            low=np.empty(0, dtype=np.float64),
+            close=np.empty(0, dtype=np.float64)
+        )
+
+    @classmethod
+    def from_candles(cls, candles: List[Dict[str, Any]]) -> "CandleSeries":
+        """
+        Candle dict listesi -> series.
+        Her candle "timestamp", "open", "high", "low", "close" içermeli.
+        """
+        if not candles:
+            return cls.empty()
+
+        return cls(
+            timestamps=np.array([c["timestamp"] for c in candles], dtype=np.int64),
+            open=np.array([c["open"] for c in candles], dtype=np.float64),
+            high=np.array([c["high"] for c in candles], dtype=np.float64),
+            low=np.array([c["low"] for c in candles], dtype=np.float64),
+            close=np.array([c["close"] for c in candles], dtype=np.float64)
+        )
+
+    def to_candle_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Series -> feature_dict["candles"] uyumlu liste (Analyzer girdisi).
+        """
+        direction = np.sign(self.close - self.open).astype(int)
+        return [
+            {
+                "timestamp": int(t),
+                "open": float(o),
+                "high": float(h),
+                "low": float(l),
+                "close": float(c),
+                "candle_direction": int(d)
+            }
+            for t, o, h, l, c, d in zip(
+                self.timestamps, self.open, self.high,
+                self.low, self.close, direction
+            )
+        ]
+
+    def slice(self, start: int, stop: Optional[int] = None) -> "CandleSeries":
+        return CandleSeries(
+            timestamps=self.timestamps[start:stop],
+            open=self.open[start:stop],
+            high=self.high[start:stop],
+            low=self.low[start:stop],
+            close=self.close[start:stop]
+        )
+
+    def tail(self, n: int) -> "CandleSeries":
+        return self.slice(max(len(self) - n, 0))
+
+    @staticmethod
+    def concat(parts: List["CandleSeries"]) -> "CandleSeries":
+        parts = [p for p in parts if len(p)]
+        if not parts:
+            return CandleSeries.empty()
+        if len(parts) == 1:
+            return parts[0]
+
+        return CandleSeries(
+            timestamps=np.concatenate([p.timestamps for p in parts]),
+            open=np.concatenate([p.open for p in parts]),
+            high=np.concatenate([p.high for p in parts]),
+            low=np.concatenate([p.low for p in parts]),
+            close=np.concatenate([p.close for p in parts])
+        )
+
+
+# =================================================
+# VECTORIZED RESAMPLING
+# =================================================
+
+def _bucket_seconds(base: str, target: str) -> int:
+    base_sec = get_interval(base).seconds
+    target_sec = get_interval(target).seconds
+
+    if target_sec <= base_sec or target_sec % base_sec != 0:
+        raise ValueError(f"Cannot resample {base} into {target}")
+
+    return target_sec
+
+
+def resample(series: CandleSeries, base: str, target: str) -> CandleSeries:
+    """
+    Aggregates a base interval series into target interval candles.
+    Buckets are aligned to epoch multiples of the target interval.
+    The last bucket may still be forming.
+    """
+    step = _bucket_seconds(base, target)
+
+    if len(series) == 0:
+        return CandleSeries.empty()
+
+    keys = series.timestamps // step * step
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    ends = np.r_[starts[1:] - 1, len(series) - 1]
+
+    return CandleSeries(
+        timestamps=keys[starts],
+        open=series.open[starts],
+        high=np.maximum.reduceat(series.high, starts),
+        low=np.minimum.reduceat(series.low, starts),
+        close=series.close[ends]
+    )
+
+
+# =================================================
+# INCREMENTAL RESAMPLER
+# =================================================
+
+class Resampler:
+    """
+    Keeps higher interval candles up to date as base candles arrive.
+    Only candles newer than the last seen timestamp are aggregated.
+    """
+
+    def __init__(
+        self,
+        base: str,
+        targets: Optional[List[str]] = None,
+        max_bars: int = 500
+    ):
+        self.base = get_interval(base).code
+        self.max_bars = max_bars
+
+        if targets is None:
+            base_sec = get_interval(base).seconds
+            targets = [
+                i.code for i in higher_interval(base)
+                if i.seconds % base_sec == 0
+            ]
+
+        for code in targets:
+            _bucket_seconds(self.base, code)
+
+        self.targets = list(targets)
+        self._last_ts: Optional[int] = None
+
+        # closed: tamamlanmış mumlar, forming: henüz kapanmamış son mum
+        self._closed: Dict[str, CandleSeries] = {
+            code: CandleSeries.empty() for code in self.targets
+        }
+        self._forming: Dict[str, Optional[CandleSeries]] = {
+            code: None for code in self.targets
+        }
+
+    # -------------------------------------------------
+    # PUBLIC API
+    # -------------------------------------------------
+
+    def update(self, series: CandleSeries) -> int:
+        """
+        Feeds base candles. Already seen candles are skipped.
+        Returns number of new base candles consumed.
+        """
+        if self._last_ts is not None and len(series):
+            start = int(np.searchsorted(series.timestamps, self._last_ts, side="right"))
+            series = series.slice(start)
+
+        if len(series) == 0:
+            return 0
+
+        for code in self.targets:
+            self._merge(code, resample(series, self.base, code))
+
+        self._last_ts = int(series.timestamps[-1])
+        return len(series)
+
+    def get(self, code: str, include_forming: bool = True) -> CandleSeries:
+        if code not in self._closed:
+            raise ValueError(f"Interval not tracked by resampler: {code}")
+
+        forming = self._forming[code]
+        if include_forming and forming is not None:
+            return CandleSeries.concat([self._closed[code], forming])
+        return self._closed[code]
+
+    def reset(self) -> None:
+        self._last_ts = None
+        for code in self.targets:
+            self._closed[code] = CandleSeries.empty()
+            self._forming[code] = None
+
+    # -------------------------------------------------
+    # INTERNAL HELPERS
+    # -------------------------------------------------
+
+    def _merge(self, code: str, bars: CandleSeries) -> None:
+        forming = self._forming[code]
+
+        if forming is not None:
+            if bars.timestamps[0] == forming.timestamps[0]:
+                # Yeni parça hâlâ açık mumun içinde başlıyor
+                bars.open[0] = forming.open[0]
+                bars.high[0] = max(bars.high[0], forming.high[0])
+                bars.low[0] = min(bars.low[0], forming.low[0])
+            else:
+                self._close(code, forming)
+
+        if len(bars) > 1:
+            self._close(code, bars.slice(0, -1))
+
+        self._forming[code] = bars.slice(len(bars) - 1)
+
+    def _close(self, code: str, bars: CandleSeries) -> None:
+        closed = CandleSeries.concat([self._closed[code], bars])
+        self._closed[code] = closed.tail(self.max_bars)
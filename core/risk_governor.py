@@ -1,8 +1,192 @@
 # RISK GOVERNOR temel yapı
 
+import bisect
 import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from core.risk_rules import RiskRules, RiskRulesLoader, WindowRule
+from core.journal_writer import JournalWriter
+
+
+# ----------------------------------
+# Rolling windows
+# ----------------------------------
+
+class RollingWindow:
+    """
+    Sliding time window over trade results.
+    add/expire are O(1) amortized; aggregates are kept as running sums.
+    """
+
+    def __init__(self, seconds: int):
+        self.seconds = seconds
+        self._events: Deque[Tuple[float, bool, float]] = deque()
+        self.trades = 0
+        self.losses = 0
+        self.loss_amount = 0.0
+
+    def add(self, ts: float, is_loss: bool, pnl: float):
+        events = self._events
+        if events and ts < events[-1][0]:
+            # Başka process'ten geç gelen olay: expire için zaman sırası korunur
+            events.insert(bisect.bisect(events, (ts, is_loss, pnl)), (ts, is_loss, pnl))
+        else:
+            events.append((ts, is_loss, pnl))
+        self.trades += 1
+        if is_loss:
+            self.losses += 1
+            self.loss_amount += -pnl
+
+    def expire(self, now: float):
+        cutoff = now - self.seconds
+        events = self._events
+        while events and events[0][0] <= cutoff:
+            _, is_loss, pnl = events.popleft()
+            self.trades -= 1
+            if is_loss:
+                self.losses -= 1
+                self.loss_amount -= -pnl
+
+    def win_rate(self) -> float:
+        if self.trades == 0:
+            return 1.0
+        return (self.trades - self.losses) / self.trades
+
+    def violates(self, rule: WindowRule) -> bool:
+        return _violates(rule, self.trades, self.losses, self.loss_amount)
+
+    def leave_times(self):
+        """
+        (time the event leaves the window, is_loss, pnl) per event.
+        """
+        return [(ts + self.seconds, is_loss, pnl) for ts, is_loss, pnl in self._events]
+
+
+def _violates(rule: WindowRule, trades: int, losses: int, loss_amount: float) -> bool:
+    if rule.kind == "max_losses":
+        return losses >= rule.threshold
+    if rule.kind == "max_loss":
+        return loss_amount >= rule.threshold
+    if rule.kind == "min_win_rate":
+        win_rate = (trades - losses) / trades if trades else 1.0
+        return trades >= rule.min_trades and win_rate < rule.threshold
+    raise ValueError(f"Unknown window rule kind: {rule.kind}")
+
+
+def window_block(
+    windows: Dict[int, RollingWindow],
+    rules: Tuple[WindowRule, ...]
+) -> Optional[Tuple[float, WindowRule]]:
+    """
+    (clear time, violated rule) if a window rule is violated now.
+    Clear time is when, without new trades, no rule is violated any
+    more: events are replayed out of their windows in time order.
+    Windows must be expired to now.
+    """
+    active = [rule for rule in rules if rule.window_seconds in windows]
+    violated = next((r for r in active if windows[r.window_seconds].violates(r)), None)
+    if violated is None:
+        return None
+
+    counters = {
+        seconds: [w.trades, w.losses, w.loss_amount]
+        for seconds, w in windows.items()
+    }
+    leaves = sorted(
+        (leave, seconds, is_loss, pnl)
+        for seconds, w in windows.items()
+        for leave, is_loss, pnl in w.leave_times()
+    )
+
+    for leave, seconds, is_loss, pnl in leaves:
+        c = counters[seconds]
+        c[0] -= 1
+        if is_loss:
+            c[1] -= 1
+            c[2] -= -pnl
+        if not any(_violates(r, *counters[r.window_seconds]) for r in active):
+            return leave, violated
+
+    return (leaves[-1][0] if leaves else time.time()), violated
+
+
+# ----------------------------------
+# Profile state
+# ----------------------------------
+
+DEFAULT_PROFILE = "default"
+
+
+class _Profile:
+    """
+    Cached risk state of one profile (symbol / account).
+    Each profile has its own lock, windows and journal buffer.
+    """
+
+    def __init__(self, name: str, windows: Dict[int, RollingWindow]):
+        self.name = name
+        self.lock = threading.RLock()
+        self.windows = windows
+        self.pending: List[Tuple[str, float, str, float]] = []
+        # Pencerelere işlenmiş en büyük risk_events id'si (replay tekrar eklemesin)
+        self.event_id = 0
+        self.blocked_until_dt: Optional[datetime] = None
+        # Rolling-window bloğu (bellekte, journal'dan yeniden kurulur): (bitiş, sebep)
+        self.window_block: Optional[Tuple[datetime, str]] = None
+        self.last_event: Optional["RiskStatusEvent"] = None
+        self.state: dict = {}
+        # Yerel yazımlarda artar; eşzamanlı reload eski satırı geri yazmasın
+        self.version = 0
+        self.set_state({
+            "consecutive_losses": 0,
+            "last_loss_time": None,
+            "blocked_until": None,
+            "block_reason": None
+        })
+
+    def set_state(self, state: dict):
+        self.state = state
+        self.blocked_until_dt = (
+            datetime.fromisoformat(state["blocked_until"])
+            if state["blocked_until"] else None
+        )
+
+    def block(self, now: datetime) -> Optional[Tuple[datetime, Optional[str]]]:
+        """
+        Active block (ladder or rolling window) that lasts longest.
+        """
+        blocks = []
+        if self.blocked_until_dt is not None and now < self.blocked_until_dt:
+            blocks.append((self.blocked_until_dt, self.state["block_reason"]))
+        if self.window_block is not None and now < self.window_block[0]:
+            blocks.append(self.window_block)
+        return max(blocks, key=lambda b: b[0]) if blocks else None
+
+    def is_blocked(self, now: datetime) -> bool:
+        return self.block(now) is not None
+
+
+# ----------------------------------
+# Status events
+# ----------------------------------
+
+@dataclass(frozen=True)
+class RiskStatusEvent:
+    """
+    Published when a profile's block state changes (consecutive-loss
+    ladder or rolling-window rules, whichever lasts longer).
+    blocked_until (UTC ISO) lets subscribers count down locally.
+    """
+    profile: str
+    blocked: bool
+    blocked_until: Optional[str]
+    reason: Optional[str]
 
 
 # ----------------------------------
@@ -12,114 +196,581 @@ from typing import Optional
 class RiskGovernor:
     """
     Behavioral risk protection module.
-    Controls loss streaks and temporary trading blocks.
+    Controls loss streaks and temporary trading blocks,
+    independently per profile (symbol / account).
     """
 
-    def __init__(self, db_path: str):
+    def __init__(
+        self,
+        db_path: str,
+        rules_path: Optional[str] = None,
+        journal_batch_size: int = 1,
+        writer: Optional[JournalWriter] = None,
+        sync_interval: float = 1.0
+    ):
         self.db_path = db_path
+        self.journal_batch_size = journal_batch_size
+        self.sync_interval = sync_interval
+
+        # Verilirse journal batch'leri writer thread'inde yazılır
+        self.writer = writer
+
+        # Blok kuralları config/risk_rules.json'dan (yoksa varsayılanlar)
+        self.rules_loader = RiskRulesLoader(rules_path)
+        self.rules: RiskRules = self.rules_loader.rules
+        self._rules_lock = threading.Lock()
+
+        # Yazma bağlantısı; sadece yazma / yükleme işlemleri için kilitlenir
+        self._db_lock = threading.Lock()
+        self._conn = self._connect()
+
+        # Diğer process'lerin commit'lerini izleyen ayrı bağlantı (okuma yolu _db_lock almaz)
+        self._sync_lock = threading.Lock()
+        self._sync_conn = self._connect()
+        self._data_version: Optional[int] = None
+        self._last_sync = 0.0
+
+        # risk_events.origin: kendi olaylarımız replay'de atlanır
+        self._origin = uuid.uuid4().hex
+        self._last_event_id = 0
+
+        # profile -> cached state (registry kilidi sadece yeni profil eklerken)
+        self._profiles: Dict[str, _Profile] = {}
+        self._profiles_lock = threading.Lock()
+
+        # Durum değişikliği aboneleri + diğer process'ler için izleyici thread
+        self._subscribers: List[Callable[[RiskStatusEvent], None]] = []
+        self._subscribers_lock = threading.Lock()
+        self._watch_stop: Optional[threading.Event] = None
+
         self._init_db()
 
     # ----------------------------------
     # Public API (Engine calls these)
     # ----------------------------------
 
-    def is_blocked(self) -> bool:
-        state = self._get_state()
-        if not state["blocked_until"]:
-            return False
+    def is_blocked(self, profile: str = DEFAULT_PROFILE) -> bool:
+        self._maybe_sync()
+        return self._profile(profile).is_blocked(datetime.utcnow())
+
+    def blocked_until(self, profile: str = DEFAULT_PROFILE) -> Optional[str]:
+        self._maybe_sync()
+        block = self._profile(profile).block(datetime.utcnow())
+        return block[0].isoformat() if block else None
+
+    def block_status_all(self) -> Dict[str, dict]:
+        """
+        Block status of every known profile in one call (for the GUI).
+        """
+        self._maybe_sync()
+        now = datetime.utcnow()
+
+        status = {}
+        for name, p in list(self._profiles.items()):
+            block = p.block(now)
+            status[name] = {
+                "blocked": block is not None,
+                "blocked_until": block[0].isoformat() if block else None,
+                "block_reason": block[1] if block else None,
+                "consecutive_losses": p.state["consecutive_losses"]
+            }
+        return status
+
+    def profiles(self) -> List[str]:
+        return list(self._profiles)
+
+    def subscribe(
+        self,
+        callback: Callable[[RiskStatusEvent], None],
+        replay: bool = True
+    ) -> Callable[[], None]:
+        """
+        Registers callback(event) for block / unblock changes.
+        Callbacks run on the thread that made the change (or the watch
+        thread for changes from other processes) and must not block.
+        replay: immediately sends the current status of every profile.
+        Returns an unsubscribe function.
+        """
+        with self._subscribers_lock:
+            self._subscribers.append(callback)
 
-        blocked_until = datetime.fromisoformat(state["blocked_until"])
-        return datetime.utcnow() < blocked_until
+        if replay:
+            now = datetime.utcnow()
+            for p in list(self._profiles.values()):
+                self._safe_notify(callback, self._status_event(p, now))
 
-    def blocked_until(self) -> Optional[str]:
-        state = self._get_state()
-        return state["blocked_until"]
+        def unsubscribe():
+            with self._subscribers_lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+        return unsubscribe
 
-    def register_trade_result(self, result: str):
+    def watch(self, interval: float = 1.0):
+        """
+        Starts a daemon thread that picks up commits from other
+        processes (PRAGMA data_version) and publishes their events.
+        """
+        if self._watch_stop is not None:
+            return
+        stop = self._watch_stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval):
+                try:
+                    self._sync()
+                except sqlite3.Error as e:
+                    print(f"RiskGovernor: watch failed: {e}")
+                # Pencere kuralları zamanla da ihlal edilebilir (ör. min_win_rate)
+                for p in list(self._profiles.values()):
+                    with p.lock:
+                        self._refresh_window_block(p)
+
+        threading.Thread(target=run, name="RiskGovernorWatch", daemon=True).start()
+
+    def register_trade_result(
+        self,
+        result: str,
+        pnl: Optional[float] = None,
+        profile: str = DEFAULT_PROFILE
+    ):
         """
         result: "WIN" | "LOSS"
+        pnl: trade outcome in account units (default: +1 / -1)
         """
-        state = self._get_state()
+        if pnl is None:
+            pnl = 1.0 if result == "WIN" else -1.0 if result == "LOSS" else 0.0
+
+        self._poll_rules()
+        self._sync()
+        p = self._profile(profile)
 
-        if result == "LOSS":
-            consecutive = state["consecutive_losses"] + 1
-            self._update_losses(consecutive)
+        with p.lock:
+            self._record_event(p, time.time(), result, pnl)
 
-            self._check_and_apply_block(consecutive)
+            if result == "LOSS":
+                consecutive = p.state["consecutive_losses"] + 1
+                self._update_losses(p, consecutive)
 
-        elif result == "WIN":
-            self._reset_losses()
+                self._check_and_apply_block(p, consecutive)
 
-    def allow_signal(self, signal_action: str) -> bool:
+            elif result == "WIN":
+                self._reset_losses(p)
+
+            self._refresh_window_block(p)
+
+    def allow_signal(self, signal_action: str, profile: str = DEFAULT_PROFILE) -> bool:
         """
         Final gate before signal is shown to user.
+        Window rules are re-checked exactly here; is_blocked() uses the
+        window block computed at the last trade / rules change.
         """
-        if self.is_blocked():
+        if self.is_blocked(profile):
             return False
 
         # Optional: WAIT always allowed
         if signal_action == "WAIT":
             return True
 
-        return True
+        return self.violated_window_rule(profile) is None
+
+    def violated_window_rule(self, profile: str = DEFAULT_PROFILE) -> Optional[WindowRule]:
+        """
+        First rolling-window rule currently violated, if any.
+        Memory only; history is never re-queried.
+        """
+        self._poll_rules()
+        p = self._profile(profile)
+        now = time.time()
+
+        with p.lock:
+            for window in p.windows.values():
+                window.expire(now)
+
+            for rule in self.rules.window_rules:
+                window = p.windows.get(rule.window_seconds)
+                if window is not None and window.violates(rule):
+                    return rule
+        return None
+
+    def flush(self):
+        """
+        Writes pending journal events of all profiles.
+        """
+        for p in list(self._profiles.values()):
+            with p.lock:
+                self._flush_profile(p)
+
+    def close(self):
+        if self._watch_stop is not None:
+            self._watch_stop.set()
+        self.flush()
+        if self.writer is not None:
+            self.writer.flush()
+        with self._db_lock:
+            self._conn.close()
+        with self._sync_lock:
+            self._sync_conn.close()
 
     # ----------------------------------
     # Internal logic
     # ----------------------------------
 
-    def _check_and_apply_block(self, consecutive_losses: int):
+    def _check_and_apply_block(self, p: _Profile, consecutive_losses: int):
         """
-        Applies progressive blocking rules.
+        Applies progressive blocking rules (see config/risk_rules.json).
         """
-        block_minutes = None
-
-        if consecutive_losses >= 10:
-            block_minutes = 60
-        elif consecutive_losses >= 7:
-            block_minutes = 30
-        elif consecutive_losses >= 5:
-            block_minutes = 15
+        block_minutes = self.rules.ladder.lookup(consecutive_losses)
 
         if block_minutes:
             blocked_until = datetime.utcnow() + timedelta(minutes=block_minutes)
-            self._set_block(blocked_until, f"{consecutive_losses} consecutive losses")
+            self._set_block(p, blocked_until, f"{consecutive_losses} consecutive losses")
+
+    def _poll_rules(self):
+        """
+        Cheap mtime poll; swaps the rule set if the file changed and is valid.
+        Never waits: if another thread is polling, this call is skipped.
+        """
+        if not self._rules_lock.acquire(blocking=False):
+            return
+        try:
+            if not self.rules_loader.poll():
+                return
+
+            rules = self.rules_loader.rules
+            if self._window_lengths(rules) != self._window_lengths(self.rules):
+                for p in list(self._profiles.values()):
+                    with p.lock:
+                        self._flush_profile(p)
+                        if self.writer is not None:
+                            self.writer.flush()
+                        windows = self._build_windows(rules)
+                        p.event_id = max(p.event_id, self._load_windows(p.name, windows))
+                        p.windows = windows
+            self.rules = rules
+
+            for p in list(self._profiles.values()):
+                with p.lock:
+                    self._refresh_window_block(p)
+        finally:
+            self._rules_lock.release()
+
+    @staticmethod
+    def _window_lengths(rules: RiskRules) -> set:
+        return {rule.window_seconds for rule in rules.window_rules}
+
+    @staticmethod
+    def _build_windows(rules: RiskRules) -> Dict[int, RollingWindow]:
+        return {
+            seconds: RollingWindow(seconds)
+            for seconds in RiskGovernor._window_lengths(rules)
+        }
+
+    def _refresh_window_block(self, p: _Profile):
+        """
+        Recomputes the profile's rolling-window block and publishes
+        if the effective status changed. Caller holds p.lock.
+        """
+        now = time.time()
+        for window in p.windows.values():
+            window.expire(now)
+
+        block = window_block(p.windows, self.rules.window_rules)
+        p.window_block = (
+            (datetime.utcfromtimestamp(block[0]), f"Rolling window: {block[1].name}")
+            if block else None
+        )
+        self._publish_status(p)
+
+    def _record_event(self, p: _Profile, ts: float, result: str, pnl: float):
+        for window in p.windows.values():
+            window.add(ts, result == "LOSS", pnl)
+
+        p.pending.append((p.name, ts, result, pnl))
+        if len(p.pending) >= self.journal_batch_size:
+            self._flush_profile(p)
+
+    def _flush_profile(self, p: _Profile):
+        """
+        Hands one profile's pending journal events over as a batch.
+        Caller holds p.lock.
+        """
+        if not p.pending:
+            return
+
+        batch, p.pending = p.pending, []
+        if self.writer is not None:
+            self.writer.call(lambda: self._insert_events(batch))
+        else:
+            self._insert_events(batch)
+
+    def _insert_events(self, batch: List[Tuple[str, float, str, float]]):
+        """
+        Writes a journal batch in a single transaction.
+        """
+        with self._db_lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO risk_events (profile, ts, result, pnl, origin) VALUES (?, ?, ?, ?, ?)",
+                    [(*event, self._origin) for event in batch]
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
 
     # ----------------------------------
     # Database
     # ----------------------------------
 
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Single long-lived connection (WAL). Engine worker threads and
+        GUI timer share it, guarded by self._db_lock.
+        """
+        conn = sqlite3.connect(
+            self.db_path,
+            check_same_thread=False,
+            isolation_level=None
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
     def _init_db(self):
-        with sqlite3.connect(self.db_path) as conn:
+        with self._db_lock:
+            conn = self._conn
             conn.execute("""
-                CREATE TABLE IF NOT EXISTS risk_state (
-                    id INTEGER PRIMARY KEY,
-                    consecutive_losses INTEGER,
+                CREATE TABLE IF NOT EXISTS risk_profiles (
+                    profile TEXT PRIMARY KEY,
+                    consecutive_losses INTEGER NOT NULL DEFAULT 0,
                     last_loss_time TEXT,
                     blocked_until TEXT,
                     block_reason TEXT
                 )
             """)
-            cur = conn.execute("SELECT COUNT(*) FROM risk_state")
-            if cur.fetchone()[0] == 0:
-                conn.execute("""
-                    INSERT INTO risk_state (
-                        consecutive_losses,
-                        last_loss_time,
-                        blocked_until,
-                        block_reason
-                    ) VALUES (0, NULL, NULL, NULL)
+
+            # Eski tek satırlı risk_state varsa "default" profiline taşı
+            legacy = conn.execute("""
+                SELECT name FROM sqlite_master
+                WHERE type='table' AND name='risk_state'
+            """).fetchone()
+            if legacy:
+                conn.execute("BEGIN")
+                try:
+                    conn.execute("""
+                        INSERT OR IGNORE INTO risk_profiles (
+                            profile, consecutive_losses, last_loss_time,
+                            blocked_until, block_reason
+                        )
+                        SELECT ?, consecutive_losses, last_loss_time,
+                               blocked_until, block_reason
+                        FROM risk_state
+                        LIMIT 1
+                    """, (DEFAULT_PROFILE,))
+                    conn.execute("DROP TABLE risk_state")
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS risk_events (
+                    id INTEGER PRIMARY KEY,
+                    ts REAL NOT NULL,
+                    result TEXT NOT NULL,
+                    pnl REAL NOT NULL
+                )
+            """)
+            # profile kolonunu ekle (eski DB varsa)
+            columns = [col[1] for col in conn.execute("PRAGMA table_info(risk_events)")]
+            if "profile" not in columns:
+                conn.execute(f"""
+                    ALTER TABLE risk_events
+                    ADD COLUMN profile TEXT NOT NULL DEFAULT '{DEFAULT_PROFILE}'
                 """)
+            # Olayı yazan governor (diğer process'lerin olaylarını ayırmak için)
+            if "origin" not in columns:
+                conn.execute("ALTER TABLE risk_events ADD COLUMN origin TEXT")
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_risk_events_ts
+                ON risk_events (ts)
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_risk_events_profile_ts
+                ON risk_events (profile, ts)
+            """)
+            self._last_event_id = conn.execute(
+                "SELECT COALESCE(MAX(id), 0) FROM risk_events"
+            ).fetchone()[0]
+
+        self._reload_states()
+        self._profile(DEFAULT_PROFILE)
+
+    def _load_windows(self, profile: str, windows: Dict[int, RollingWindow]) -> int:
+        """
+        Rebuilds a profile's rolling windows from the journal
+        (once per profile, or when the window set changes).
+        Returns the largest event id loaded.
+        """
+        if not windows:
+            return 0
+
+        since = time.time() - max(windows)
+        with self._db_lock:
+            rows = self._conn.execute("""
+                SELECT id, ts, result, pnl FROM risk_events
+                WHERE profile = ? AND ts > ?
+                ORDER BY ts
+            """, (profile, since)).fetchall()
+
+        for _, ts, result, pnl in rows:
+            for window in windows.values():
+                window.add(ts, result == "LOSS", pnl)
+        return max((row[0] for row in rows), default=0)
+
+    # ----------------------------------
+    # In-memory state cache
+    # ----------------------------------
 
-    def _get_state(self) -> dict:
-        with sqlite3.connect(self.db_path) as conn:
-            cur = conn.execute("""
+    def _profile(self, name: str) -> _Profile:
+        p = self._profiles.get(name)
+        if p is not None:
+            return p
+
+        with self._profiles_lock:
+            p = self._profiles.get(name)
+            if p is None:
+                p = self._new_profile(name)
+                self._profiles[name] = p
+        return p
+
+    def _new_profile(self, name: str) -> _Profile:
+        windows = self._build_windows(self.rules)
+        event_id = self._load_windows(name, windows)
+        p = _Profile(name, windows)
+        p.event_id = event_id
+
+        with self._db_lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO risk_profiles (profile) VALUES (?)",
+                (name,)
+            )
+            row = self._conn.execute("""
                 SELECT consecutive_losses, last_loss_time,
                        blocked_until, block_reason
-                FROM risk_state
-                LIMIT 1
-            """)
-            row = cur.fetchone()
+                FROM risk_profiles
+                WHERE profile = ?
+            """, (name,)).fetchone()
+
+        p.set_state(self._row_to_state(row))
+        self._refresh_window_block(p)
+        return p
+
+    def _maybe_sync(self):
+        """
+        Hot-path variant of _sync: nothing while the watch thread runs,
+        otherwise at most every sync_interval seconds, and never waits
+        for another thread's sync.
+        """
+        if self._watch_stop is not None:
+            return
+        if time.monotonic() - self._last_sync < self.sync_interval:
+            return
+        if not self._sync_lock.acquire(blocking=False):
+            return
+        try:
+            self._sync_locked()
+        finally:
+            self._sync_lock.release()
+
+    def _sync(self):
+        """
+        Reloads cached states only if a commit happened since the last
+        check (PRAGMA data_version on the separate sync connection).
+        """
+        with self._sync_lock:
+            self._sync_locked()
+
+    def _sync_locked(self):
+        self._last_sync = time.monotonic()
+        version = self._sync_conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._data_version:
+            self._reload_states_locked()
+
+    def _reload_states(self):
+        with self._sync_lock:
+            self._reload_states_locked()
+
+    def _reload_states_locked(self):
+        """
+        Caller holds self._sync_lock. Reads on the sync connection, so
+        engine threads never wait on the write connection. Journal
+        events other processes wrote since the last reload are replayed
+        into the rolling windows.
+        """
+        versions = {name: p.version for name, p in list(self._profiles.items())}
+        conn = self._sync_conn
+        conn.execute("BEGIN")
+        try:
+            rows = conn.execute("""
+                SELECT profile, consecutive_losses, last_loss_time,
+                       blocked_until, block_reason
+                FROM risk_profiles
+            """).fetchall()
+            events = conn.execute("""
+                SELECT id, profile, ts, result, pnl FROM risk_events
+                WHERE id > ? AND origin IS NOT ?
+                ORDER BY id
+            """, (self._last_event_id, self._origin)).fetchall()
+            last_id = conn.execute(
+                "SELECT COALESCE(MAX(id), 0) FROM risk_events"
+            ).fetchone()[0]
+            self._data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        finally:
+            conn.execute("COMMIT")
+
+        self._last_event_id = max(self._last_event_id, last_id)
+        self._replay_events(events)
+
+        for row in rows:
+            name = row[0]
+            p = self._profiles.get(name)
+            if p is None:
+                self._profile(name)
+                continue
+            with p.lock:
+                # Okumadan sonra yerel yazım olduysa bellek daha yeni
+                if p.version != versions.get(name):
+                    continue
+                self._apply_state(p, self._row_to_state(row[1:]))
+
+    def _replay_events(self, events: List[Tuple[int, str, float, str, float]]):
+        """
+        Adds other processes' journal events to the rolling windows and
+        republishes the window block of every profile they touched.
+        Profiles not loaded yet read them from the journal on first use.
+        """
+        touched: Dict[str, _Profile] = {}
+        for event_id, name, ts, result, pnl in events:
+            p = self._profiles.get(name)
+            if p is None:
+                continue
+            with p.lock:
+                # _load_windows bu olayı zaten okumuş olabilir
+                if event_id <= p.event_id:
+                    continue
+                for window in p.windows.values():
+                    window.add(ts, result == "LOSS", pnl)
+                p.event_id = event_id
+            touched[name] = p
 
+        for p in touched.values():
+            with p.lock:
+                self._refresh_window_block(p)
+
+    @staticmethod
+    def _row_to_state(row) -> dict:
         return {
             "consecutive_losses": row[0],
             "last_loss_time": row[1],
@@ -127,28 +778,92 @@ class RiskGovernor:
             "block_reason": row[3]
         }
 
-    def _update_losses(self, count: int):
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                UPDATE risk_state
+    def _write_state(self, p: _Profile, **changes):
+        """
+        Write-through: memory is updated and the profile row persisted.
+        Caller holds p.lock.
+        """
+        state = dict(p.state)
+        state.update(changes)
+
+        with self._db_lock:
+            self._conn.execute("""
+                UPDATE risk_profiles
                 SET consecutive_losses = ?,
-                    last_loss_time = ?
-            """, (count, datetime.utcnow().isoformat()))
+                    last_loss_time = ?,
+                    blocked_until = ?,
+                    block_reason = ?
+                WHERE profile = ?
+            """, (
+                state["consecutive_losses"],
+                state["last_loss_time"],
+                state["blocked_until"],
+                state["block_reason"],
+                p.name
+            ))
 
-    def _reset_losses(self):
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                UPDATE risk_state
-                SET consecutive_losses = 0,
-                    last_loss_time = NULL,
-                    blocked_until = NULL,
-                    block_reason = NULL
-            """)
+        p.version += 1
+        self._apply_state(p, state)
 
-    def _set_block(self, until: datetime, reason: str):
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                UPDATE risk_state
-                SET blocked_until = ?,
-                    block_reason = ?
-            """, (until.isoformat(), reason))
+    def _apply_state(self, p: _Profile, state: dict):
+        """
+        Swaps the cached state; publishes an event if the block changed.
+        """
+        p.set_state(state)
+        self._publish_status(p)
+
+    def _publish_status(self, p: _Profile):
+        """
+        Publishes the profile's effective status if it differs from the
+        last published one. Caller holds p.lock.
+        """
+        event = self._status_event(p, datetime.utcnow())
+        if event != p.last_event:
+            p.last_event = event
+            self._publish(event)
+
+    @staticmethod
+    def _status_event(p: _Profile, now: datetime) -> RiskStatusEvent:
+        block = p.block(now)
+        return RiskStatusEvent(
+            profile=p.name,
+            blocked=block is not None,
+            blocked_until=block[0].isoformat() if block else None,
+            reason=block[1] if block else None
+        )
+
+    def _publish(self, event: RiskStatusEvent):
+        with self._subscribers_lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            self._safe_notify(callback, event)
+
+    @staticmethod
+    def _safe_notify(callback, event: RiskStatusEvent):
+        try:
+            callback(event)
+        except Exception as e:
+            print(f"RiskGovernor: subscriber failed: {e}")
+
+    def _update_losses(self, p: _Profile, count: int):
+        self._write_state(
+            p,
+            consecutive_losses=count,
+            last_loss_time=datetime.utcnow().isoformat()
+        )
+
+    def _reset_losses(self, p: _Profile):
+        self._write_state(
+            p,
+            consecutive_losses=0,
+            last_loss_time=None,
+            blocked_until=None,
+            block_reason=None
+        )
+
+    def _set_block(self, p: _Profile, until: datetime, reason: str):
+        self._write_state(
+            p,
+            blocked_until=until.isoformat(),
+            block_reason=reason
+        )
@@ -0,0 +1,173 @@
+# RISK RULES - config/risk_rules.json içindeki blok kurallarını yükler (hot reload)
+
+import bisect
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# ----------------------------------
+# Rule structures
+# ----------------------------------
+
+@dataclass(frozen=True)
+class WindowRule:
+    name: str
+    window_seconds: int
+    kind: str                # "max_losses" | "max_loss" | "min_win_rate"
+    threshold: float
+    min_trades: int = 0      # min_win_rate için örneklem eşiği
+
+
+WINDOW_RULE_KINDS = ("max_losses", "max_loss", "min_win_rate")
+
+
+class BlockLadder:
+    """
+    Precompiled consecutive-loss -> block minutes table.
+    Thresholds are sorted once; lookup is a binary search.
+    """
+
+    def __init__(self, steps: List[Tuple[int, int]]):
+        steps = sorted(steps)
+        self._thresholds = [t for t, _ in steps]
+        self._minutes = [m for _, m in steps]
+
+    def lookup(self, consecutive_losses: int) -> Optional[int]:
+        i = bisect.bisect_right(self._thresholds, consecutive_losses)
+        if i == 0:
+            return None
+        return self._minutes[i - 1]
+
+    def steps(self) -> List[Tuple[int, int]]:
+        return list(zip(self._thresholds, self._minutes))
+
+
+@dataclass(frozen=True)
+class RiskRules:
+    ladder: BlockLadder
+    window_rules: Tuple[WindowRule, ...]
+
+
+DEFAULT_LADDER: List[Tuple[int, int]] = [(5, 15), (7, 30), (10, 60)]
+
+DEFAULT_WINDOW_RULES: List[WindowRule] = [
+    WindowRule("hourly_losses", 3600, "max_losses", 6),
+    WindowRule("daily_loss_cap", 86400, "max_loss", 20.0),
+    WindowRule("win_rate_floor", 3600, "min_win_rate", 0.35, min_trades=10),
+]
+
+
+def default_rules() -> RiskRules:
+    return RiskRules(
+        ladder=BlockLadder(DEFAULT_LADDER),
+        window_rules=tuple(DEFAULT_WINDOW_RULES)
+    )
+
+
+# ----------------------------------
+# Parsing / validation
+# ----------------------------------
+
+def parse_rules(data: Dict[str, Any]) -> RiskRules:
+    """
+    Validates a risk_rules.json payload.
+    Raises ValueError on any invalid entry.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Risk rules must be a JSON object")
+
+    # Eksik bölüm kuralı sessizce kapatmasın: dosya reddedilir, eski kurallar kalır
+    for key in ("block_ladder", "window_rules"):
+        if not isinstance(data.get(key), list):
+            raise ValueError(f"Risk rules need a '{key}' list")
+
+    steps = []
+    for step in data["block_ladder"]:
+        losses = int(step["consecutive_losses"])
+        minutes = int(step["block_minutes"])
+        if losses <= 0 or minutes <= 0:
+            raise ValueError(f"Invalid block ladder step: {step}")
+        steps.append((losses, minutes))
+
+    if len({t for t, _ in steps}) != len(steps):
+        raise ValueError("Duplicate consecutive_losses in block ladder")
+
+    window_rules = []
+    for rule in data["window_rules"]:
+        parsed = WindowRule(
+            name=str(rule["name"]),
+            window_seconds=int(rule["window_seconds"]),
+            kind=str(rule["kind"]),
+            threshold=float(rule["threshold"]),
+            min_trades=int(rule.get("min_trades", 0))
+        )
+        if parsed.kind not in WINDOW_RULE_KINDS:
+            raise ValueError(f"Unknown window rule kind: {parsed.kind}")
+        if parsed.window_seconds <= 0:
+            raise ValueError(f"Invalid window_seconds in rule: {parsed.name}")
+        window_rules.append(parsed)
+
+    return RiskRules(ladder=BlockLadder(steps), window_rules=tuple(window_rules))
+
+
+def load_rules(path: str) -> RiskRules:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return parse_rules(data)
+
+
+# ----------------------------------
+# Hot reload
+# ----------------------------------
+
+class RiskRulesLoader:
+    """
+    Polls the rules file by mtime and swaps in a new RiskRules
+    only if it parses. Invalid files keep the running rules.
+    """
+
+    def __init__(self, path: Optional[str], poll_interval: float = 1.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.rules = default_rules()
+        self.last_error: Optional[str] = None
+
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._next_poll = 0.0
+
+        self.poll(force=True)
+
+    def poll(self, force: bool = False) -> bool:
+        """
+        Returns True if a new rule set was swapped in.
+        """
+        if self.path is None:
+            return False
+
+        now = time.monotonic()
+        if not force and now < self._next_poll:
+            return False
+        self._next_poll = now + self.poll_interval
+
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return False
+
+        stamp = (st.st_mtime_ns, st.st_size)
+        if stamp == self._stamp:
+            return False
+        self._stamp = stamp
+
+        try:
+            rules = load_rules(self.path)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.last_error = f"{self.path}: {e}"
+            return False
+
+        self.rules = rules
+        self.last_error = None
+        return True
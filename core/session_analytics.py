@@ -0,0 +1,242 @@
+# SESSION ANALYTICS - sessions/*.jsonl dosyaları üzerinde toplu istatistik (paralel tarama + mtime cache)
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from core.session_logger import SessionReader
+
+
+CONFIDENCE_BINS = 10
+CACHE_FILE = ".analytics_cache.json"
+
+
+# =================================================
+# MERGEABLE PARTIAL AGGREGATE
+# =================================================
+
+def _bucket() -> Dict[str, int]:
+    return {"signals": 0, "wins": 0, "losses": 0}
+
+
+@dataclass
+class SessionStats:
+    """
+    Partial aggregate of one or more session files.
+    Partials are combined with merge(); order does not matter.
+    """
+    files: int = 0
+    signals: int = 0
+    wins: int = 0
+    losses: int = 0
+    risk_blocked: int = 0
+    actions: Dict[str, int] = field(default_factory=dict)
+    confidence_hist: List[int] = field(default_factory=lambda: [0] * CONFIDENCE_BINS)
+    by_interval: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    by_reason: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    # -------------------------------------------------
+    # UPDATE
+    # -------------------------------------------------
+
+    def add(self, record: Dict[str, Any]) -> None:
+        signal = record.get("signal") or {}
+        action = signal.get("action") or "UNKNOWN"
+        result = record.get("result")
+
+        self.signals += 1
+        self.actions[action] = self.actions.get(action, 0) + 1
+        if record.get("risk_blocked"):
+            self.risk_blocked += 1
+
+        confidence = signal.get("confidence") or 0.0
+        b = min(int(confidence * CONFIDENCE_BINS), CONFIDENCE_BINS - 1)
+        self.confidence_hist[max(b, 0)] += 1
+
+        groups = (
+            self.by_interval.setdefault(record.get("interval") or "UNKNOWN", _bucket()),
+            self.by_reason.setdefault(signal.get("reason") or "", _bucket()),
+        )
+        for g in groups:
+            g["signals"] += 1
+
+        if result == "WIN":
+            self.wins += 1
+            for g in groups:
+                g["wins"] += 1
+        elif result == "LOSS":
+            self.losses += 1
+            for g in groups:
+                g["losses"] += 1
+
+    def merge(self, other: "SessionStats") -> "SessionStats":
+        self.files += other.files
+        self.signals += other.signals
+        self.wins += other.wins
+        self.losses += other.losses
+        self.risk_blocked += other.risk_blocked
+
+        for k, v in other.actions.items():
+            self.actions[k] = self.actions.get(k, 0) + v
+
+        self.confidence_hist = [a + b for a, b in zip(self.confidence_hist, other.confidence_hist)]
+
+        for mine, theirs in ((self.by_interval, other.by_interval), (self.by_reason, other.by_reason)):
+            for key, bucket in theirs.items():
+                target = mine.setdefault(key, _bucket())
+                for k, v in bucket.items():
+                    target[k] += v
+        return self
+
+    # -------------------------------------------------
+    # QUERY / SERIALIZATION
+    # -------------------------------------------------
+
+    def win_rate(self) -> float:
+        resolved = self.wins + self.losses
+        return self.wins / resolved if resolved else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "files": self.files,
+            "signals": self.signals,
+            "wins": self.wins,
+            "losses": self.losses,
+            "risk_blocked": self.risk_blocked,
+            "actions": self.actions,
+            "confidence_hist": self.confidence_hist,
+            "by_interval": self.by_interval,
+            "by_reason": self.by_reason,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SessionStats":
+        return cls(**data)
+
+
+# =================================================
+# WORKER
+# =================================================
+
+def scan_file(path: str) -> Dict[str, Any]:
+    """
+    Process-pool worker: one session file -> partial aggregate dict.
+    """
+    stats = SessionStats(files=1)
+
+    reader = SessionReader(path)
+    reader.ensure_index()
+    try:
+        for record in reader.joined():
+            stats.add(record)
+    finally:
+        reader.close()
+
+    return stats.to_dict()
+
+
+# =================================================
+# DIRECTORY SCAN (CACHED)
+# =================================================
+
+def _stamp(path: Path) -> List[int]:
+    st = path.stat()
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _load_cache(cache_path: Path) -> Dict[str, Any]:
+    if not cache_path.exists():
+        return {}
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def analyze_sessions(
+    session_dir: str | Path,
+    workers: Optional[int] = None,
+    cache_path: Optional[str | Path] = None,
+    use_cache: bool = True
+) -> SessionStats:
+    """
+    Aggregates every session file in session_dir.
+    Only files whose mtime/size changed since the last run are rescanned,
+    one file per worker process.
+    """
+    session_dir = Path(session_dir)
+    cache_path = Path(cache_path) if cache_path else session_dir / CACHE_FILE
+
+    files = sorted(session_dir.glob("*.jsonl"))
+    cache = _load_cache(cache_path) if use_cache else {}
+
+    stamps = {str(p): _stamp(p) for p in files}
+    stale = [p for p, stamp in stamps.items() if cache.get(p, {}).get("stamp") != stamp]
+
+    if stale:
+        if workers == 1 or len(stale) == 1:
+            results = [scan_file(p) for p in stale]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(scan_file, stale))
+
+        for path, partial in zip(stale, results):
+            cache[path] = {"stamp": stamps[path], "stats": partial}
+
+    # Silinmiş dosyaları cache'ten çıkar
+    cache = {p: entry for p, entry in cache.items() if p in stamps}
+
+    if use_cache:
+        tmp = cache_path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp, cache_path)
+
+    total = SessionStats()
+    for entry in cache.values():
+        total.merge(SessionStats.from_dict(entry["stats"]))
+    return total
+
+
+# =================================================
+# CLI
+# =================================================
+
+def _print_breakdown(title: str, table: Dict[str, Dict[str, int]]):
+    print(f"\n{title}")
+    for key, b in sorted(table.items(), key=lambda kv: -kv[1]["signals"]):
+        resolved = b["wins"] + b["losses"]
+        rate = b["wins"] / resolved if resolved else 0.0
+        print(f"  {key or '-':<30} signals={b['signals']:<6} W={b['wins']:<5} L={b['losses']:<5} win_rate={rate:.2f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Aggregate statistics across session files")
+    parser.add_argument("session_dir", nargs="?", default="sessions")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--no-cache", action="store_true")
+    parser.add_argument("--json", action="store_true", help="print raw aggregate as JSON")
+    args = parser.parse_args(argv)
+
+    stats = analyze_sessions(args.session_dir, workers=args.workers, use_cache=not args.no_cache)
+
+    if args.json:
+        print(json.dumps(stats.to_dict(), indent=2))
+        return
+
+    print(f"Files     : {stats.files}")
+    print(f"Signals   : {stats.signals}  {stats.actions}")
+    print(f"Results   : W={stats.wins} L={stats.losses} win_rate={stats.win_rate():.2f}")
+    print(f"Blocked   : {stats.risk_blocked}")
+    print(f"Confidence: {stats.confidence_hist}")
+    _print_breakdown("By interval", stats.by_interval)
+    _print_breakdown("By reason", stats.by_reason)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+# SESSION ARCHIVE - Kapanmış session JSONL dosyalarını kolon bazlı (.npy) arşive çevirir
+
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.intervals import INTERVALS
+from core.session_logger import SessionReader
+
+
+# =================================================
+# CODES / DICTIONARIES
+# =================================================
+
+INTERVAL_CODES: List[str] = list(INTERVALS.keys())
+ACTION_CODES: List[str] = ["CALL", "PUT", "WAIT"]
+RESULT_CODES: List[str] = ["LOSS", "WIN"]
+
+NO_CODE = -1    # bilinmeyen interval / action, ya da sonuçsuz sinyal
+
+FIELDS = ("timestamp", "interval", "action", "confidence", "result", "risk_blocked", "reason")
+
+META_FILE = "meta.json"
+
+
+def _code(table: List[str], value) -> int:
+    try:
+        return table.index(value)
+    except ValueError:
+        return NO_CODE
+
+
+def _epoch(ts: Optional[str]) -> float:
+    if not ts:
+        return np.nan
+    dt = datetime.fromisoformat(ts)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)   # SessionLogger utcnow() yazar
+    return dt.timestamp()
+
+
+# =================================================
+# COMPACTION
+# =================================================
+
+def closed_sessions(session_dir: str | Path, min_age: float = 300.0) -> List[Path]:
+    """
+    Session files not modified for min_age seconds (no longer written).
+    """
+    now = time.time()
+    return sorted(
+        p for p in Path(session_dir).glob("*.jsonl")
+        if now - p.stat().st_mtime >= min_age
+    )
+
+
+def build_archive(session_files: List[str | Path], archive_dir: str | Path) -> int:
+    """
+    Converts session files into one columnar archive directory:
+    one .npy per field + meta.json (code dictionaries, reason strings).
+    Returns number of rows.
+    """
+    timestamps, intervals, actions = [], [], []
+    confidences, results, blocked, reasons = [], [], [], []
+
+    reason_table: Dict[str, int] = {}
+
+    for path in session_files:
+        reader = SessionReader(str(path))
+        reader.ensure_index()
+
+        for record in reader.joined():
+            signal = record.get("signal") or {}
+            reason = signal.get("reason") or ""
+
+            timestamps.append(_epoch(record.get("timestamp")))
+            intervals.append(_code(INTERVAL_CODES, record.get("interval")))
+            actions.append(_code(ACTION_CODES, signal.get("action")))
+            confidences.append(signal.get("confidence") or 0.0)
+            results.append(_code(RESULT_CODES, record.get("result")))
+            blocked.append(bool(record.get("risk_blocked")))
+            reasons.append(reason_table.setdefault(reason, len(reason_table)))
+
+    columns = {
+        "timestamp": np.asarray(timestamps, dtype=np.float64),
+        "interval": np.asarray(intervals, dtype=np.int8),
+        "action": np.asarray(actions, dtype=np.int8),
+        "confidence": np.asarray(confidences, dtype=np.float32),
+        "result": np.asarray(results, dtype=np.int8),
+        "risk_blocked": np.asarray(blocked, dtype=np.bool_),
+        "reason": np.asarray(reasons, dtype=np.int32),
+    }
+
+    archive_dir = Path(archive_dir)
+    archive_dir.mkdir(parents=True, exist_ok=True)
+
+    for name, values in columns.items():
+        np.save(archive_dir / f"{name}.npy", values)
+
+    meta = {
+        "rows": len(timestamps),
+        "intervals": INTERVAL_CODES,
+        "actions": ACTION_CODES,
+        "results": RESULT_CODES,
+        "reasons": list(reason_table),
+        "sources": [str(p) for p in session_files],
+        "created_at": datetime.utcnow().isoformat()
+    }
+    with open(archive_dir / META_FILE, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+
+    return len(timestamps)
+
+
+# =================================================
+# READER
+# =================================================
+
+class SessionArchive:
+    """
+    Memory-mapped columnar view over an archive directory.
+    All queries are vectorized over the field arrays.
+    """
+
+    def __init__(self, archive_dir: str | Path):
+        archive_dir = Path(archive_dir)
+
+        with open(archive_dir / META_FILE, "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+
+        self.columns: Dict[str, np.ndarray] = {
+            name: np.load(archive_dir / f"{name}.npy", mmap_mode="r")
+            for name in FIELDS
+        }
+
+    def __len__(self) -> int:
+        return self.meta["rows"]
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.columns[field]
+
+    # -------------------------------------------------
+    # DECODING
+    # -------------------------------------------------
+
+    def interval_code(self, code: str) -> int:
+        return _code(self.meta["intervals"], code)
+
+    def action_code(self, action: str) -> int:
+        return _code(self.meta["actions"], action)
+
+    def reason(self, code: int) -> str:
+        return self.meta["reasons"][code]
+
+    # -------------------------------------------------
+    # QUERIES
+    # -------------------------------------------------
+
+    def resolved_mask(self) -> np.ndarray:
+        return self.columns["result"] != NO_CODE
+
+    def win_rate_by_interval_hour(self) -> Dict[Tuple[str, int], Tuple[int, int, float]]:
+        """
+        (interval, UTC hour) -> (trades, wins, win_rate), resolved signals
+        with a valid timestamp only.
+        """
+        # NaN / eksik zaman damgası negatif bincount indeksi üretir: dışarıda bırak
+        mask = (
+            self.resolved_mask()
+            & (self.columns["interval"] != NO_CODE)
+            & np.isfinite(self.columns["timestamp"])
+        )
+
+        interval = self.columns["interval"][mask].astype(np.int64)
+        hour = (self.columns["timestamp"][mask] // 3600 % 24).astype(np.int64)
+        wins = self.columns["result"][mask] == _code(self.meta["results"], "WIN")
+
+        n_intervals = len(self.meta["intervals"])
+        key = interval * 24 + hour
+
+        trades = np.bincount(key, minlength=n_intervals * 24)
+        won = np.bincount(key, weights=wins, minlength=n_intervals * 24)
+
+        table = {}
+        for k in np.flatnonzero(trades):
+            code = self.meta["intervals"][k // 24]
+            table[(code, int(k % 24))] = (
+                int(trades[k]),
+                int(won[k]),
+                float(won[k] / trades[k])
+            )
+        return table
+
+
+# =================================================
+# CLI
+# =================================================
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compact session JSONL files into a columnar archive")
+    parser.add_argument("session_dir")
+    parser.add_argument("archive_dir")
+    parser.add_argument("--min-age", type=float, default=300.0,
+                        help="skip files modified within this many seconds")
+    args = parser.parse_args(argv)
+
+    files = closed_sessions(args.session_dir, args.min_age)
+    rows = build_archive(files, args.archive_dir)
+    print(f"Archived {rows} records from {len(files)} session files -> {args.archive_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,74 @@
 import json
+import mmap
 import os
+import struct
+import threading
 from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from core.journal_writer import JournalWriter, default_writer
+
+
+# =================================================
+# OFFSET INDEX (sidecar)
+# =================================================
+#
+# <session>.jsonl.idx : kayıt başına sabit genişlikte giriş
+#   offset (uint64) | ref (int64) | type (uint8)
+# signal kaydı için ref = kendi kayıt numarası (= signal id)
+# result kaydı için ref = bağlı olduğu signal id
+
+INDEX_SUFFIX = ".idx"
+INDEX_ENTRY = struct.Struct("<QqB")
+
+RECORD_SIGNAL = 0
+RECORD_RESULT = 1
+
+
+def index_path(path: str) -> str:
+    return path + INDEX_SUFFIX
+
+
+def _record_type(record: Dict[str, Any]) -> int:
+    return RECORD_RESULT if record.get("type") == "result" else RECORD_SIGNAL
 
 
 class SessionLogger:
 
-    def __init__(self, session_dir="sessions"):
+    def __init__(self, session_dir="sessions", writer: Optional[JournalWriter] = None):
         os.makedirs(session_dir, exist_ok=True)
+        self.writer = writer or default_writer()
 
         name = datetime.utcnow().strftime("%Y-%m-%d_%H-%M")
         self.path = os.path.join(session_dir, f"{name}.jsonl")
+        # Signal id'ler dosya içi kayıt numarası: dışarıda (session, id) ile adreslenir
+        self.session = name
+
+        # Aynı dakikada açılan oturum dosyasına devam edilebilir
+        self._count = 0
+        if os.path.exists(self.path):
+            self._count = SessionReader(self.path).ensure_index(repair=True)
+        self.last_signal_id: Optional[int] = None
+        # Kayıt numarası ataması + kuyruğa ekleme tek adım (analiz ve GUI thread'i)
+        self._lock = threading.Lock()
+        # Writer thread'inde başarısız yazma: sayaç index'ten yeniden okunur
+        self._resync = False
 
-    def log_signal(self, interval, signal, risk_blocked):
+    def log_signal(self, interval, signal, risk_blocked, frame: Optional[str] = None) -> Optional[int]:
+        """
+        Appends a signal record. Returns its id (record number), or None
+        if the writer dropped it (queue full / closed).
+        frame: path of the captured chart image, for replay.
+        """
+        with self._lock:
+            self._resync_count()
+            return self._log_signal(interval, signal, risk_blocked, frame)
+
+    def _log_signal(self, interval, signal, risk_blocked, frame) -> Optional[int]:
+        signal_id = self._count
         record = {
+            "type": "signal",
+            "id": signal_id,
             "timestamp": datetime.utcnow().isoformat(),
             "interval": interval,
             "signal": {
@@ -20,29 +76,286 @@ class SessionLogger:
                 "confidence": signal.confidence,
                 "reason": signal.reason
             },
-            "result": None,
             "risk_blocked": risk_blocked
         }
-        self._write(record)
+        if frame:
+            record["frame"] = frame
+        if not self._write(record, RECORD_SIGNAL, signal_id):
+            # Düşen sinyale sonuç bağlanmasın
+            self.last_signal_id = None
+            return None
+        self.last_signal_id = signal_id
+        return signal_id
+
+    def log_result(self, result, signal_id: Optional[int] = None) -> bool:
+        """
+        Appends a result record for signal_id (default: last signal).
+        Older signals can be resolved at any time. Returns False if
+        there is no signal to attach to or the record was dropped.
+        """
+        if signal_id is None:
+            signal_id = self.last_signal_id
+        if signal_id is None:
+            print("SessionLogger: no signal to attach result to")
+            return False
+
+        record = {
+            "type": "result",
+            "signal_id": signal_id,
+            "timestamp": datetime.utcnow().isoformat(),
+            "result": result
+        }
+        with self._lock:
+            self._resync_count()
+            return self._write(record, RECORD_RESULT, signal_id)
+
+    def flush(self):
+        self.writer.flush()
+
+    def _write(self, record, record_type: int, ref: int) -> bool:
+        # Offset yazım anında (writer thread) belirlenir
+        queued = self.writer.append(
+            self.path,
+            (json.dumps(record) + "\n").encode(),
+            index_path=index_path(self.path),
+            index_entry=lambda offset: INDEX_ENTRY.pack(offset, ref, record_type),
+            on_error=self._write_failed
+        )
+        # Kayıt numarası = signal id: yalnızca kuyruğa giren kayıt sayılır
+        if queued:
+            self._count += 1
+        else:
+            print(f"SessionLogger: record dropped ({self.path})")
+        return queued
+
+    def _write_failed(self, error: Exception):
+        # Writer thread'i: kayıt dosyaya girmedi, sonraki id'ler kaydı
+        self._resync = True
+
+    def _resync_count(self):
+        """
+        Caller holds self._lock. After a failed write, waits for the
+        queue and takes the record count from the index again, so new
+        ids match record numbers. Ids handed out for records queued
+        behind the failed one are not rewritten.
+        """
+        if not self._resync:
+            return
+        self._resync = False
+        self.writer.flush()
+        count = SessionReader(self.path).ensure_index() if os.path.exists(self.path) else 0
+        print(f"SessionLogger: write failed, record count {self._count} -> {count} ({self.path})")
+        self._count = count
+
+
+# =================================================
+# SESSION READER
+# =================================================
+
+class SessionReader:
+    """
+    Random access over a session file through its offset index.
+    record(n) and signal(id) are O(1); results are joined by signal id.
+    The data file is memory-mapped and records are parsed on demand.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.idx_path = index_path(path)
+
+        self._entries: List[tuple] = []
+        self._results: Dict[int, List[int]] = {}
+
+        self._file = None
+        self._mm: Optional[mmap.mmap] = None
+        self._actions: Dict[int, Optional[str]] = {}
+        self._outcomes: Dict[int, Optional[str]] = {}
+        self._filters: Dict[tuple, List[int]] = {}
+
+    # -------------------------------------------------
+    # INDEX
+    # -------------------------------------------------
+
+    def ensure_index(self, repair: bool = False) -> int:
+        """
+        Loads the sidecar index and indexes any data written after it
+        (live session, or crash between writes). The missing tail is
+        persisted only with repair=True, i.e. when no writer is active.
+        Returns number of records.
+        """
+        self._entries = self._read_index()
+
+        data_size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+        indexed_end = self._indexed_end()
+
+        if indexed_end < data_size:
+            self._index_tail(indexed_end, persist=repair)
+
+        self._results = {}
+        for n, (_, ref, record_type) in enumerate(self._entries):
+            if record_type == RECORD_RESULT:
+                self._results.setdefault(ref, []).append(n)
+
+        # Yeni sonuçlar gelmiş olabilir: sonuç / filtre önbellekleri yeniden kurulur
+        self._outcomes.clear()
+        self._filters.clear()
+        return len(self._entries)
+
+    def _read_index(self) -> List[tuple]:
+        if not os.path.exists(self.idx_path):
+            return []
+
+        with open(self.idx_path, "rb") as f:
+            raw = f.read()
+
+        usable = len(raw) - len(raw) % INDEX_ENTRY.size
+        return list(INDEX_ENTRY.iter_unpack(raw[:usable]))
+
+    def _indexed_end(self) -> int:
+        """
+        Byte position right after the last indexed record.
+        """
+        if not self._entries:
+            return 0
+
+        with open(self.path, "rb") as f:
+            f.seek(self._entries[-1][0])
+            f.readline()
+            return f.tell()
+
+    def _index_tail(self, start: int, persist: bool):
+        new_entries = []
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            while True:
+                offset = f.tell()
+                line = f.readline()
+                if not line.endswith(b"\n"):
+                    break  # yarım yazılmış son satır
+
+                record = json.loads(line)
+                record_type = _record_type(record)
+                if record_type == RECORD_RESULT:
+                    ref = record["signal_id"]
+                else:
+                    ref = len(self._entries) + len(new_entries)
+                new_entries.append((offset, ref, record_type))
+
+        # Index dosyasını tam giriş sınırına hizala ve eksikleri ekle
+        if persist:
+            with open(self.idx_path, "ab") as f:
+                f.truncate(len(self._entries) * INDEX_ENTRY.size)
+                for entry in new_entries:
+                    f.write(INDEX_ENTRY.pack(*entry))
+
+        self._entries.extend(new_entries)
+
+    # -------------------------------------------------
+    # RANDOM ACCESS
+    # -------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def record(self, n: int) -> Dict[str, Any]:
+        start = self._entries[n][0]
+        if n + 1 < len(self._entries):
+            end = self._entries[n + 1][0]
+        else:
+            end = None
+
+        buf = self._buffer(end or start + 1)
+        if end is None:
+            end = buf.find(b"\n", start) + 1 or len(buf)
+        return json.loads(buf[start:end])
+
+    def _buffer(self, end: int):
+        """
+        Memory map of the data file, remapped if it grew past end.
+        """
+        if self._mm is None or end > len(self._mm):
+            self._remap()
+        return self._mm if self._mm is not None else b""
+
+    def _remap(self):
+        self.close()
+        if os.path.getsize(self.path) == 0:
+            return
+        self._file = open(self.path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def signal(self, signal_id: int) -> Dict[str, Any]:
+        return self.record(signal_id)
+
+    def results_for(self, signal_id: int) -> List[Dict[str, Any]]:
+        return [self.record(n) for n in self._results.get(signal_id, [])]
+
+    def action_of(self, signal_id: int) -> Optional[str]:
+        """
+        Signal action, parsed once and cached (used by filters).
+        """
+        if signal_id not in self._actions:
+            signal = self.signal(signal_id).get("signal") or {}
+            self._actions[signal_id] = signal.get("action")
+        return self._actions[signal_id]
+
+    def result_of(self, signal_id: int) -> Optional[str]:
+        """
+        Latest result for a signal, parsed once and cached. Legacy files
+        (no result records at all) keep the result inline in the signal.
+        """
+        if signal_id not in self._outcomes:
+            rows = self._results.get(signal_id)
+            if rows:
+                self._outcomes[signal_id] = self.record(rows[-1])["result"]
+            elif self._results:
+                self._outcomes[signal_id] = None
+            else:
+                self._outcomes[signal_id] = self.signal(signal_id).get("result")
+        return self._outcomes[signal_id]
 
-    def log_result(self, result):
-        with open(self.path, "rb+") as f:
-            f.seek(0, os.SEEK_END)
-            pos = f.tell()
+    def signals_where(self, field: str, value: str) -> List[int]:
+        """
+        Signal ids whose "action" or "result" equals value, ascending.
+        Built in one pass per (field, value) and cached until the index
+        is reloaded.
+        """
+        key = (field, value)
+        if key not in self._filters:
+            get = self.action_of if field == "action" else self.result_of
+            self._filters[key] = [sid for sid in self.signal_ids() if get(sid) == value]
+        return self._filters[key]
 
-            while pos > 0:
-                pos -= 1
-                f.seek(pos)
-                if f.read(1) == b"\n":
-                    break
+    # -------------------------------------------------
+    # ITERATION
+    # -------------------------------------------------
 
-            last = json.loads(f.readline())
-            last["result"] = result
+    def signal_ids(self) -> List[int]:
+        return [
+            n for n, (_, _, record_type) in enumerate(self._entries)
+            if record_type == RECORD_SIGNAL
+        ]
 
-            f.seek(pos)
-            f.truncate()
-            f.write((json.dumps(last) + "\n").encode())
+    def joined_signal(self, signal_id: int) -> Dict[str, Any]:
+        """
+        Signal record with its latest result attached as "result".
+        """
+        record = self.signal(signal_id)
+        rows = self._results.get(signal_id)
+        if rows:
+            record["result"] = self.record(rows[-1])["result"]
+        else:
+            record.setdefault("result", None)
+        return record
 
-    def _write(self, record):
-        with open(self.path, "a") as f:
-            f.write(json.dumps(record) + "\n")
+    def joined(self) -> Iterator[Dict[str, Any]]:
+        for signal_id in self.signal_ids():
+            yield self.joined_signal(signal_id)
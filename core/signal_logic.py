@@ -1,6 +1,7 @@
 # SIGNAL LOGIC temel yapı
 
 from dataclasses import dataclass
+from typing import Optional
 
 
 # ----------------------------------
@@ -12,6 +13,8 @@ class Signal:
     action: str              # "CALL" | "PUT" | "WAIT"
     confidence: float        # 0.0 – 1.0
     reason: str              # human-readable explanation
+    raw_confidence: Optional[float] = None   # AI ayarından önceki confidence (yoksa = confidence)
+    signal_id: Optional[int] = None          # SessionLogger kayıt id'si (loglandıysa)
 
 
 # ----------------------------------
@@ -5,6 +5,8 @@ from typing import Any, Dict
 import json
 import os
 
+from core.journal_writer import default_writer
+
 
 # =================================================
 # TIME
@@ -83,11 +85,9 @@ def write_json(path: str, data: Dict[str, Any], indent: int = 2):
         json.dump(data, f, indent=indent)
 
 
-def append_jsonl(path: str, record: Dict[str, Any]):
-    """Append record to JSONL file."""
-    ensure_dir(os.path.dirname(path) or ".")
-    with open(path, "a") as f:
-        f.write(json.dumps(record) + "\n")
+def append_jsonl(path: str, record: Dict[str, Any]) -> bool:
+    """Queue record for append to JSONL file (background writer)."""
+    return default_writer().append(path, (json.dumps(record) + "\n").encode())
 
 
 def read_jsonl(path: str):
@@ -31,7 +31,7 @@ class App(tk.Tk):
 
     def on_analyze(self):
         signal = self.engine.process(
-            raw_analysis_inputs=self._collect_inputs(),
+            feature_dict=self._collect_inputs(),
             interval="1M"
         )
 
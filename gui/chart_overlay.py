@@ -1,13 +1,80 @@
+import numpy as np
 from PyQt5.QtWidgets import QWidget, QVBoxLayout
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
 from matplotlib.figure import Figure
 
 
+# chart_data anahtarı -> çizgi stili
+SERIES = {
+    "close": {"label": "Close", "linewidth": 1.5},
+    "ema50": {"label": "EMA50", "linestyle": "--"},
+    "ema200": {"label": "EMA200", "linestyle": ":"},
+}
+
+
+def _first_index(mask: np.ndarray, bucket: np.ndarray) -> np.ndarray:
+    """
+    Index of the first True of mask within each bucket.
+    """
+    hits = np.flatnonzero(mask)
+    _, first = np.unique(bucket[hits], return_index=True)
+    return hits[first]
+
+
+def downsample(values: np.ndarray, max_points: int):
+    """
+    Min/max decimation: each bucket keeps its min and max (in order),
+    so spikes survive. NaNs are never picked; buckets without any
+    value are dropped. Returns (x, y) with at most ~max_points points.
+    """
+    n = len(values)
+    if n <= max_points:
+        return np.arange(n), values
+    if not np.isfinite(values).any():
+        return np.arange(0), values[:0]
+
+    buckets = max_points // 2
+    edges = np.linspace(0, n, buckets + 1).astype(np.int64)
+    starts = edges[:-1]
+
+    # NaN'lar min/max'e katılmasın: min için +inf, max için -inf
+    missing = np.isnan(values)
+    for_min = np.where(missing, np.inf, values)
+    for_max = np.where(missing, -np.inf, values)
+    lo = np.minimum.reduceat(for_min, starts)
+    hi = np.maximum.reduceat(for_max, starts)
+
+    bucket = np.repeat(np.arange(buckets), np.diff(edges))
+    lo_idx = _first_index(~missing & (for_min == lo[bucket]), bucket)
+    hi_idx = _first_index(~missing & (for_max == hi[bucket]), bucket)
+
+    # Tamamı NaN olan bucket'lar _first_index'te yer almaz
+    present = np.add.reduceat(~missing, starts) > 0
+    lo, hi = lo[present], hi[present]
+
+    first_lo = lo_idx <= hi_idx
+    x = np.empty(len(lo) * 2, dtype=np.int64)
+    y = np.empty(len(lo) * 2, dtype=values.dtype)
+    x[0::2] = np.where(first_lo, lo_idx, hi_idx)
+    x[1::2] = np.where(first_lo, hi_idx, lo_idx)
+    y[0::2] = np.where(first_lo, lo, hi)
+    y[1::2] = np.where(first_lo, hi, lo)
+    return x, y
+
+
 class ChartOverlay(QWidget):
+    """
+    Replay chart with persistent axes and line artists.
+    Updates only change line data and are blitted over a cached
+    background; the full canvas is redrawn only when axis limits
+    change (or on resize).
+    """
 
-    def __init__(self):
+    def __init__(self, max_points: int = 600):
         super().__init__()
 
+        self.max_points = max_points
+
         self.figure = Figure(figsize=(5, 3))
         self.canvas = FigureCanvasQTAgg(self.figure)
 
@@ -15,24 +82,93 @@ class ChartOverlay(QWidget):
         layout.addWidget(self.canvas)
         self.setLayout(layout)
 
-    def rendery(self, chart_data, signal=None):
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
+        # Kalıcı axes / artist'ler
+        self.ax = self.figure.add_subplot(111)
+        self.ax.grid(True)
+        self.lines = {
+            key: self.ax.plot([], [], animated=True, **style)[0]
+            for key, style in SERIES.items()
+        }
+        self.title = self.ax.set_title("", animated=True)
+        self.ax.legend(handles=list(self.lines.values()), loc="upper left")
+
+        self._background = None
+        self.canvas.mpl_connect("draw_event", self._on_draw)
+
+    # -------------------------------------------------
+    # UPDATE
+    # -------------------------------------------------
+
+    def update_chart(self, chart_data, signal=None):
+        n = 0
+        lo, hi = np.inf, -np.inf
+
+        for key, line in self.lines.items():
+            values = chart_data.get(key)
+            if values is None or len(values) == 0:
+                line.set_visible(False)
+                continue
+
+            values = np.asarray(values, dtype=np.float64)
+            x, y = downsample(values, self.max_points)
+            line.set_data(x, y)
+            line.set_visible(True)
+
+            n = max(n, len(values))
+            if np.isfinite(y).any():
+                lo = min(lo, np.nanmin(y))
+                hi = max(hi, np.nanmax(y))
+
+        self.title.set_text(
+            f"{signal['action']} | conf={signal['confidence']:.2f}" if signal else ""
+        )
+
+        if self._limits_changed(n, lo, hi) or self._background is None:
+            # Tick'ler değişti: tam çizim, background yeniden alınır
+            self.canvas.draw()
+        else:
+            self._blit()
+
+    # Eski isim (QWidget.render ile çakışmaması için değiştirilmişti)
+    rendery = update_chart
+
+    def _limits_changed(self, n: int, lo: float, hi: float) -> bool:
+        """
+        x follows the series length; y only grows past the data or
+        shrinks when the data uses less than half of the span, so
+        scrubbing mostly stays on the blit path.
+        """
+        changed = False
+
+        if n and self.ax.get_xlim() != (0, max(n - 1, 1)):
+            self.ax.set_xlim(0, max(n - 1, 1))
+            changed = True
 
-        ax.plot(chart_data["close"], label="Close", linewidth=1.5)
-        ax.plot(chart_data["ema50"], label="EMA50", linestyle="--")
-        ax.plot(chart_data["ema200"], label="EMA200", linestyle=":")
+        if np.isfinite(lo) and np.isfinite(hi):
+            y0, y1 = self.ax.get_ylim()
+            span = max(hi - lo, 1e-9)
+            if lo < y0 or hi > y1 or span < 0.5 * (y1 - y0):
+                margin = 0.05 * span
+                self.ax.set_ylim(lo - margin, hi + margin)
+                changed = True
 
-        if signal:
-            ax.set_title(
-                f"{signal['action']} | conf={signal['confidence']:.2f}"
-            )
+        return changed
 
-        ax.legend()
-        ax.grid(True)
+    # -------------------------------------------------
+    # BLITTING
+    # -------------------------------------------------
 
-        self.canvas.draw()
+    def _on_draw(self, event):
+        self._background = self.canvas.copy_from_bbox(self.figure.bbox)
+        self._draw_artists()
 
+    def _draw_artists(self):
+        for line in self.lines.values():
+            if line.get_visible():
+                self.ax.draw_artist(line)
+        self.ax.draw_artist(self.title)
 
-# Modüller sorunlu kontrol edilecek
-# Line18 def render(self, chart_data, ...) tanımı; komut çakışmaması için def rendery olarak değiştirildi.
\ No newline at end of file
+    def _blit(self):
+        self.canvas.restore_region(self._background)
+        self._draw_artists()
+        self.canvas.blit(self.figure.bbox)
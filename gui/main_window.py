@@ -8,29 +8,60 @@ from PyQt5.QtWidgets import (
     QPushButton, QLabel, QVBoxLayout, QHBoxLayout,
     QProgressBar
 )
-from PyQt5.QtCore import QTimer
+from PyQt5.QtCore import QTimer, pyqtSignal
 from gui.widgets.interval_selector import IntervalSelector
 from core.engine import Engine
+from core.risk_governor import DEFAULT_PROFILE
 from ai.ai_manager import AIManager
+from core.journal_writer import default_writer
+from core.feature_store import FeatureStore
+from core.session_logger import SessionLogger
 from gui.workers.analyze_worker import AnalyzeWorker
+from gui.overlay import HudOverlay
+from core.metrics import (
+    default_metrics, CAPTURE_FRAMES, QUEUE_ANALYZE, QUEUE_JOURNAL, RISK_BLOCKED_UNTIL
+)
 
 
 class MainWindow(QMainWindow):
 
+    # RiskGovernor olayları herhangi bir thread'den gelir, GUI thread'ine aktarılır
+    risk_changed = pyqtSignal(object)
+
     def __init__(self):
         super().__init__()
 
         # ----------------------------
         # Core
         # ----------------------------
-        self.ai = AIManager("models/default")
+        self.journal = default_writer()
+        self.metrics = default_metrics()
+        self.ai = AIManager("models/default", writer=self.journal)
+        self.features = FeatureStore("db/analysis.db", writer=self.journal)
+        self.session = SessionLogger("sessions", writer=self.journal)
         self.engine = Engine(
             risk_db_path="data/risk.db",
-            ai_manager=self.ai
+            ai_manager=self.ai,
+            risk_rules_path="config/risk_rules.json",
+            journal_writer=self.journal,
+            feature_store=self.features,
+            session_logger=self.session
         )
 
         self.last_signal = None
-        self.worker = None
+        self.last_inputs = None
+        self.last_interval = None
+
+        # Tek, kalıcı analiz thread'i (warm engine)
+        self.worker = AnalyzeWorker(self.engine)
+        self.worker.finished.connect(self.on_analyze_finished)
+        self.worker.failed.connect(self.on_analyze_failed)
+        self.worker.start()
+
+        # Kuyruk derinlikleri HUD snapshot'ında okunur (pipeline'a ek yük yok)
+        self.metrics.gauge(QUEUE_ANALYZE, self.worker.pending)
+        self.metrics.gauge(QUEUE_JOURNAL, self.journal.pending)
+        self.hud = HudOverlay(self.metrics)
 
         # ----------------------------
         # UI Setup
@@ -39,11 +70,19 @@ class MainWindow(QMainWindow):
         self._setup_ui()
 
         # ----------------------------
-        # Risk status timer
+        # Risk status (push)
         # ----------------------------
-        self.risk_timer = QTimer()
-        self.risk_timer.timeout.connect(self.update_risk_status)
-        self.risk_timer.start(1000)
+        # Countdown yerel saatten hesaplanır; bitişte tek seferlik uyanma
+        self.blocked_until = None
+        self.countdown_timer = QTimer()
+        self.countdown_timer.timeout.connect(self.update_risk_status)
+        self.expiry_timer = QTimer()
+        self.expiry_timer.setSingleShot(True)
+        self.expiry_timer.timeout.connect(self.update_risk_status)
+
+        self.risk_changed.connect(self.on_risk_changed)
+        self._unsubscribe_risk = self.engine.risk.subscribe(self.risk_changed.emit)
+        self.engine.risk.watch()
 
     # =================================================
     # UI
@@ -67,12 +106,14 @@ class MainWindow(QMainWindow):
         self.win_btn = QPushButton("WIN")
         self.loss_btn = QPushButton("LOSS")
         self.ai_btn = QPushButton("AI ON / OFF")
+        self.hud_btn = QPushButton("HUD")
 
         # Events
         self.analyze_btn.clicked.connect(self.on_analyze)
         self.win_btn.clicked.connect(lambda: self.on_result("WIN"))
         self.loss_btn.clicked.connect(lambda: self.on_result("LOSS"))
         self.ai_btn.clicked.connect(self.on_ai_toggle)
+        self.hud_btn.clicked.connect(self.on_hud_toggle)
 
         # ----------------------------
         # Layouts
@@ -94,6 +135,7 @@ class MainWindow(QMainWindow):
         button_row.addWidget(self.win_btn)
         button_row.addWidget(self.loss_btn)
         button_row.addWidget(self.ai_btn)
+        button_row.addWidget(self.hud_btn)
 
         main_layout.addLayout(button_row)
 
@@ -109,29 +151,37 @@ class MainWindow(QMainWindow):
     # =================================================
 
     def on_analyze(self):
-        self.analyze_btn.setEnabled(False)
-
-        raw_data = self._collect_inputs()
+        # Aynı interval için bekleyen iş varsa yerine geçer; buton kilitlenmez
+        self.metrics.mark(CAPTURE_FRAMES)
+        self.worker.submit(
+            inputs=self._collect_inputs(),
+            interval=self.interval_selector.current_code() or "1M",
+            frame=self._capture_frame()
+        )
 
-        self.worker = AnalyzeWorker(
-            engine=self.engine,
-            raw_inputs=raw_data,
-            interval="1M"
+    def on_analyze_finished(self, result):
+        self.last_signal = result.signal
+        self.last_inputs = result.job.inputs
+        self.last_interval = result.job.interval
+        self._update_view(result.signal)
+        self.statusBar().showMessage(
+            f"{result.job.interval} analyzed in {result.latency_ms:.0f} ms "
+            f"(queue {result.queue_ms:.0f} ms)"
         )
-        self.worker.finished.connect(self.on_analyze_finished)
-        self.worker.start()
 
-    def on_analyze_finished(self, signal):
-        self.last_signal = signal
-        self._update_view(signal)
-        self.analyze_btn.setEnabled(True)
+    def on_analyze_failed(self, job, error):
+        self.statusBar().showMessage(f"{job.interval} analysis failed: {error}")
 
     def on_result(self, result: str):
         if self.last_signal:
             self.engine.register_trade_result(
                 signal=self.last_signal,
-                result=result
+                result=result,
+                interval=self.last_interval,
+                features=self.last_inputs
             )
+            if self.last_signal.signal_id is not None:
+                self.session.log_result(result, signal_id=self.last_signal.signal_id)
 
     def on_ai_toggle(self):
         if self.ai.is_active():
@@ -139,6 +189,22 @@ class MainWindow(QMainWindow):
         else:
             self.ai.activate()
 
+    def on_hud_toggle(self):
+        self.hud.setVisible(not self.hud.isVisible())
+
+    def closeEvent(self, event):
+        self._unsubscribe_risk()
+        self.hud.close()
+        self.metrics.gauge(QUEUE_ANALYZE, None)
+        self.metrics.gauge(QUEUE_JOURNAL, None)
+        self.worker.stop()
+        # Bekleyen journal kayıtlarını diske yaz
+        self.engine.risk.close()
+        self.ai.close()
+        self.features.close()
+        self.journal.close()
+        super().closeEvent(event)
+
     # =================================================
     # VIEW
     # =================================================
@@ -148,25 +214,42 @@ class MainWindow(QMainWindow):
         self.reason_label.setText(f"Reason: {signal.reason}")
         self.confidence_bar.setValue(int(signal.confidence * 100))
 
-    def update_risk_status(self):
-        if not self.engine.risk.is_blocked():
-            self.risk_label.setText("Risk: OK")
-            self.risk_label.setStyleSheet("color: green;")
+    def on_risk_changed(self, event):
+        if event.profile != DEFAULT_PROFILE:
             return
 
-        blocked_until = self.engine.risk.blocked_until()
-        if not blocked_until:
-            return
+        self.blocked_until = (
+            datetime.fromisoformat(event.blocked_until)
+            if event.blocked else None
+        )
+        self.metrics.set(RISK_BLOCKED_UNTIL, self.blocked_until)
+        self.expiry_timer.stop()
+        self.countdown_timer.stop()
 
-        until_dt = datetime.fromisoformat(blocked_until)
-        remaining = until_dt - datetime.utcnow()
+        if self.blocked_until is not None:
+            remaining = (self.blocked_until - datetime.utcnow()).total_seconds()
+            self.expiry_timer.start(max(0, int(remaining * 1000)) + 50)
+            self.countdown_timer.start(1000)
 
-        if remaining.total_seconds() <= 0:
+        self.update_risk_status()
+
+    def update_risk_status(self):
+        """
+        Renders the risk label from the last pushed event; no storage access.
+        """
+        remaining = (
+            (self.blocked_until - datetime.utcnow()).total_seconds()
+            if self.blocked_until is not None else 0
+        )
+
+        if remaining <= 0:
+            self.blocked_until = None
+            self.countdown_timer.stop()
             self.risk_label.setText("Risk: OK")
             self.risk_label.setStyleSheet("color: green;")
             return
 
-        m, s = divmod(int(remaining.total_seconds()), 60)
+        m, s = divmod(int(remaining), 60)
         self.risk_label.setText(f"Risk: BLOCKED ({m:02d}:{s:02d})")
         self.risk_label.setStyleSheet("color: red;")
 
@@ -182,6 +265,10 @@ class MainWindow(QMainWindow):
             "volatility": {}
         }
 
+    def _capture_frame(self):
+        # Analiz edilen grafik görüntüsünün yolu (session replay); capture yokken None
+        return None
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
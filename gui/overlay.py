@@ -0,0 +1,136 @@
+# HUD OVERLAY - Her zaman üstte, hafif gecikme / throughput göstergesi (paylaşılan metrics snapshot'ından)
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import QLabel, QVBoxLayout, QWidget
+
+from core.metrics import (
+    Metrics, default_metrics,
+    CAPTURE_FRAMES, ANALYZE_SUPERSEDED,
+    QUEUE_ANALYZE, QUEUE_JOURNAL, RISK_BLOCKED_UNTIL
+)
+
+
+# Gösterilen aşamalar (sırayla); veri gelmeyenler atlanır
+STAGES = (
+    ("queue", "analyze.queue"),
+    ("analyze", "engine.analyze"),
+    ("confirm", "engine.confirm"),
+    ("ai", "engine.ai"),
+    ("risk", "engine.risk"),
+    ("store", "engine.store"),
+    ("engine", "engine.total"),
+    ("e2e", "analyze.latency"),
+)
+
+
+def _queue(value: Any) -> str:
+    return "-" if value is None else str(value)
+
+
+def format_hud(snapshot: Dict[str, Any], now: Optional[datetime] = None) -> str:
+    """
+    Snapshot (Metrics.snapshot()) -> fixed-width HUD text.
+    """
+    counters = snapshot["counters"]
+    gauges = snapshot["gauges"]
+    rates = snapshot["rates"]
+    latency = snapshot["latency"]
+
+    lines = [
+        f"capture  {rates.get(CAPTURE_FRAMES, 0.0):5.1f} fps",
+        f"dropped  coalesced {counters.get(ANALYZE_SUPERSEDED, 0)}",
+        f"queues   analyze {_queue(gauges.get(QUEUE_ANALYZE))}"
+        f"  journal {_queue(gauges.get(QUEUE_JOURNAL))}",
+        "",
+        f"{'ms':<8} {'p50':>7} {'p90':>7} {'p99':>7}",
+    ]
+
+    for label, name in STAGES:
+        stat = latency.get(name)
+        if stat is None:
+            continue
+        lines.append(f"{label:<8} {stat['p50']:7.1f} {stat['p90']:7.1f} {stat['p99']:7.1f}")
+
+    blocked_until = gauges.get(RISK_BLOCKED_UNTIL)
+    remaining = (
+        (blocked_until - (now or datetime.utcnow())).total_seconds()
+        if blocked_until is not None else 0
+    )
+    lines.append("")
+    if remaining > 0:
+        m, s = divmod(int(remaining), 60)
+        lines.append(f"risk     BLOCKED {m:02d}:{s:02d}")
+    else:
+        lines.append("risk     OK")
+
+    return "\n".join(lines)
+
+
+class HudOverlay(QWidget):
+    """
+    Frameless, always-on-top, click-to-drag HUD.
+
+    The pipeline only records into Metrics; this widget pulls one
+    snapshot per refresh (default 2 Hz) on the GUI thread, and only
+    while it is visible.
+    """
+
+    def __init__(self, metrics: Optional[Metrics] = None, refresh_ms: int = 500):
+        super().__init__(None, Qt.Tool | Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
+        self.setAttribute(Qt.WA_ShowWithoutActivating)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setWindowTitle("HUD")
+
+        self.metrics = metrics or default_metrics()
+
+        self.label = QLabel()
+        font = QFont("Monospace", 9)
+        font.setStyleHint(QFont.TypeWriter)
+        self.label.setFont(font)
+        self.label.setStyleSheet(
+            "color: #e0e0e0; background-color: rgba(0, 0, 0, 170);"
+            "padding: 6px; border-radius: 4px;"
+        )
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.label)
+        self.setLayout(layout)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(refresh_ms)
+        self.timer.timeout.connect(self.refresh)
+
+        self._drag_offset = None
+
+    def refresh(self):
+        self.label.setText(format_hud(self.metrics.snapshot()))
+        self.adjustSize()
+
+    # -------------------------------------------------
+    # QT EVENTS
+    # -------------------------------------------------
+
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self._drag_offset = event.globalPos() - self.frameGeometry().topLeft()
+
+    def mouseMoveEvent(self, event):
+        if self._drag_offset is not None and event.buttons() & Qt.LeftButton:
+            self.move(event.globalPos() - self._drag_offset)
+
+    def mouseReleaseEvent(self, event):
+        self._drag_offset = None
@@ -1,25 +1,57 @@
 # SESSION PANEL taslak (session.json okur, adım adım replay yapar, her adımda grafik + sonuç gösterir,)
 
-import json
+import bisect
+import os
+import time
+
 from PyQt5.QtWidgets import (
     QWidget, QListWidget, QVBoxLayout, QHBoxLayout,
-    QLabel, QPushButton
+    QLabel, QPushButton, QComboBox, QSpinBox
 )
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtGui import QImage, QPixmap
 
 from gui.chart_overlay import ChartOverlay
+from core.session_logger import SessionReader
+from core.frame_cache import FrameCache
+
+
+# Filtre adı -> (alan, değer)
+FILTERS = {
+    "All": None,
+    "CALL only": ("action", "CALL"),
+    "PUT only": ("action", "PUT"),
+    "WIN only": ("result", "WIN"),
+    "LOSS only": ("result", "LOSS"),
+}
 
 
 class SessionPanel(QWidget):
     """
     Read-only session replay panel.
     No Engine calls. No learning. No trading.
+    Records are read lazily through the session offset index.
+    Captured frames come from a FrameCache prefetched around the
+    current record, so paging never waits on image decoding.
     """
 
-    def __init__(self, session_file: str):
+    # FrameCache thread'inden GUI thread'ine
+    frame_ready = pyqtSignal(str)
+
+    def __init__(self, session_file: str, prefetch_radius: int = 8):
         super().__init__()
 
-        self.records = self._load(session_file)
+        self.reader = self._load(session_file)
+        self.signal_ids = self.reader.signal_ids()
         self.index = 0
+        self.filter = None
+        self.filter_positions = None     # filtreye uyan pozisyonlar (sıralı), None = hepsi
+        self.direction = 1
+
+        self.prefetch_radius = prefetch_radius
+        self.frames = FrameCache(session_file, on_ready=self.frame_ready.emit)
+        self.frame_ready.connect(self._on_frame_ready)
+        self._frame_paths = {}
 
         # ----------------------------
         # Widgets
@@ -29,11 +61,24 @@ class SessionPanel(QWidget):
 
         self.chart = ChartOverlay()
 
+        self.frame_label = QLabel()
+        self.frame_label.setAlignment(Qt.AlignCenter)
+        self.frame_label.setMinimumHeight(180)
+
         self.prev_btn = QPushButton("Prev")
         self.next_btn = QPushButton("Next")
 
+        self.filter_combo = QComboBox()
+        self.filter_combo.addItems(list(FILTERS))
+
+        self.jump_input = QSpinBox()
+        self.jump_input.setRange(1, max(len(self.signal_ids), 1))
+        self.jump_btn = QPushButton("Go")
+
         self.prev_btn.clicked.connect(self.prev)
         self.next_btn.clicked.connect(self.next)
+        self.filter_combo.currentTextChanged.connect(self.set_filter)
+        self.jump_btn.clicked.connect(lambda: self.jump(self.jump_input.value() - 1))
 
         # ----------------------------
         # Layout
@@ -41,16 +86,20 @@ class SessionPanel(QWidget):
         control_row = QHBoxLayout()
         control_row.addWidget(self.prev_btn)
         control_row.addWidget(self.next_btn)
+        control_row.addWidget(self.filter_combo)
+        control_row.addWidget(self.jump_input)
+        control_row.addWidget(self.jump_btn)
 
         main_layout = QVBoxLayout()
         main_layout.addWidget(self.info_label)
+        main_layout.addWidget(self.frame_label)
         main_layout.addWidget(self.chart)
         main_layout.addLayout(control_row)
 
         self.setLayout(main_layout)
 
         # Initial render
-        if self.records:
+        if self.signal_ids:
             self._render()
 
     # =================================================
@@ -58,15 +107,34 @@ class SessionPanel(QWidget):
     # =================================================
 
     def _load(self, path):
-        with open(path, "r") as f:
-            return [json.loads(line) for line in f]
+        # Index sadece kapanmış dosyada kalıcı onarılır (aktif writer yoksa)
+        closed = time.time() - os.path.getmtime(path) > 60
+        reader = SessionReader(path)
+        reader.ensure_index(repair=closed)
+        return reader
+
+    def _positions_for(self, flt):
+        """
+        Positions (into signal_ids) passing the filter; computed once
+        per filter by the reader.
+        """
+        if flt is None:
+            return None
+        wanted = set(self.reader.signals_where(*flt))
+        return [pos for pos, sid in enumerate(self.signal_ids) if sid in wanted]
+
+    def _matches(self, position: int) -> bool:
+        if self.filter_positions is None:
+            return True
+        i = bisect.bisect_left(self.filter_positions, position)
+        return i < len(self.filter_positions) and self.filter_positions[i] == position
 
     # =================================================
     # RENDER
     # =================================================
 
     def _render(self):
-        r = self.records[self.index]
+        r = self.reader.joined_signal(self.signal_ids[self.index])
 
         signal = r.get("signal", {})
         result = r.get("result")
@@ -74,6 +142,7 @@ class SessionPanel(QWidget):
 
         self.info_label.setText(
             f"""
+Record    : {self.index + 1} / {len(self.signal_ids)}
 Time      : {r.get('timestamp')}
 Interval  : {r.get('interval')}
 
@@ -88,23 +157,104 @@ Risk      : {risk}
 
         chart_data = r.get("chart")
         if chart_data:
-            self.chart.render(
+            self.chart.update_chart(
                 chart_data=chart_data,
                 signal=signal
             )
 
+        self._show_frame(self._frame_path(self.index))
+        self._prefetch()
+
+    # =================================================
+    # FRAMES
+    # =================================================
+
+    def _frame_path(self, position: int):
+        signal_id = self.signal_ids[position]
+        if signal_id not in self._frame_paths:
+            self._frame_paths[signal_id] = self.reader.signal(signal_id).get("frame")
+        return self._frame_paths[signal_id]
+
+    def _show_frame(self, path):
+        if not path:
+            self.frame_label.clear()
+            self.frame_label.setText("No frame")
+            return
+
+        thumb = self.frames.get(path)
+        if thumb is None:
+            self.frame_label.setText("Loading frame...")
+            return
+
+        image = QImage(thumb.rgb, thumb.width, thumb.height, 3 * thumb.width, QImage.Format_RGB888)
+        self.frame_label.setPixmap(QPixmap.fromImage(image))
+
+    def _prefetch(self):
+        """
+        Frames around the current record, travel direction first.
+        """
+        order = []
+        for step in range(1, self.prefetch_radius + 1):
+            order.append(self.index + step * self.direction)
+            if step <= self.prefetch_radius // 2:
+                order.append(self.index - step * self.direction)
+
+        paths = [self._frame_path(self.index)] + [
+            self._frame_path(i) for i in order if 0 <= i < len(self.signal_ids)
+        ]
+        self.frames.prefetch(paths)
+
+    def _on_frame_ready(self, path):
+        if self.signal_ids and path == self._frame_path(self.index):
+            self._show_frame(path)
+
+    def closeEvent(self, event):
+        self.frames.close()
+        self.reader.close()
+        super().closeEvent(event)
+
     # =================================================
     # NAVIGATION
     # =================================================
 
     def next(self):
-        if self.index < len(self.records) - 1:
-            self.index += 1
-            self._render()
+        self._step(1)
 
     def prev(self):
-        if self.index > 0:
-            self.index -= 1
+        self._step(-1)
+
+    def jump(self, position: int):
+        if 0 <= position < len(self.signal_ids):
+            self.index = position
+            self._render()
+
+    def set_filter(self, name: str):
+        self.filter = FILTERS.get(name)
+        self.filter_positions = self._positions_for(self.filter)
+        if self.signal_ids and not self._matches(self.index):
+            self._step(1) or self._step(-1)
+
+    def _step(self, direction: int) -> bool:
+        """
+        Moves to the nearest record in direction that passes the filter
+        (binary search over the filter's positions).
+        """
+        self.direction = direction
+        position = self.index + direction
+
+        if self.filter_positions is not None:
+            positions = self.filter_positions
+            if direction > 0:
+                i = bisect.bisect_left(positions, position)
+                position = positions[i] if i < len(positions) else -1
+            else:
+                i = bisect.bisect_right(positions, position) - 1
+                position = positions[i] if i >= 0 else -1
+
+        if 0 <= position < len(self.signal_ids):
+            self.index = position
             self._render()
+            return True
+        return False
 
 #Hierarchy problemi var, çözülmesi gerekiyor (Saat sabahın 4'ü çözmeyeceğim bu saatte)
\ No newline at end of file
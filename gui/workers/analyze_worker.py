@@ -1,19 +1,179 @@
-# ANALYZE WORKER taslak
+# ANALYZE WORKER - Tek, kalıcı analiz thread'i (interval başına birleştirilen iş kuyruğu)
+
+import itertools
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
 
 from PyQt5.QtCore import QThread, pyqtSignal
 
+from core.risk_governor import DEFAULT_PROFILE
+from core.metrics import Metrics, ANALYZE_SUPERSEDED, default_metrics
+
+
+@dataclass
+class AnalysisJob:
+    job_id: int
+    interval: str
+    inputs: Dict[str, Any]
+    profile: str = DEFAULT_PROFILE
+    series: Any = None
+    frame: Optional[str] = None     # yakalanan grafik görüntüsü (session replay)
+    submitted: float = field(default_factory=time.monotonic)
+    cancelled: bool = False
+
+
+@dataclass
+class AnalysisResult:
+    job: AnalysisJob
+    signal: Any
+    queue_ms: float      # kuyrukta bekleme
+    run_ms: float        # Engine.evaluate + commit süresi
+
+    @property
+    def latency_ms(self) -> float:
+        return self.queue_ms + self.run_ms
+
+
 class AnalyzeWorker(QThread):
-    finished = pyqtSignal(object)
+    """
+    Long-lived analysis thread around a warm Engine.
+
+    submit() never blocks: a newer job for the same interval replaces
+    the pending one (only the latest frame is analyzed). Pending jobs are
+    dropped on cancel. An in-flight job finishes Engine.evaluate(), but
+    a cancelled one is never committed: no session log entry or feature
+    row is written and no result is emitted. Results arrive on the GUI
+    thread via Qt signals.
+    """
+
+    finished = pyqtSignal(object)            # AnalysisResult
+    failed = pyqtSignal(object, str)         # AnalysisJob, error
+    cancelled = pyqtSignal(object)           # AnalysisJob (superseded / cancelled)
 
-    def __init__(self, engine, raw_inputs, interval):
+    def __init__(self, engine, metrics: Optional[Metrics] = None):
         super().__init__()
         self.engine = engine
-        self.raw_inputs = raw_inputs
-        self.interval = interval
+        self.metrics = metrics or default_metrics()
+
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+        self._pending: "OrderedDict[str, AnalysisJob]" = OrderedDict()
+        self._current: Optional[AnalysisJob] = None
+        self._stopping = False
+
+        self.superseded = 0
+
+    # -------------------------------------------------
+    # GUI THREAD API
+    # -------------------------------------------------
+
+    def submit(
+        self,
+        inputs: Dict[str, Any],
+        interval: str,
+        profile: str = DEFAULT_PROFILE,
+        series: Any = None,
+        frame: Optional[str] = None
+    ) -> AnalysisJob:
+        job = AnalysisJob(next(self._ids), interval, inputs, profile, series, frame)
+
+        with self._cond:
+            old = self._pending.get(interval)
+            # Sıra korunur, içerik en yeni kare ile değişir
+            self._pending[interval] = job
+            self._cond.notify()
+
+        if old is not None:
+            old.cancelled = True
+            self.superseded += 1
+            self.metrics.incr(ANALYZE_SUPERSEDED)
+            self.cancelled.emit(old)
+        return job
+
+    def cancel(self, interval: Optional[str] = None):
+        """
+        Cancels pending and in-flight jobs (of one interval, or all).
+        """
+        with self._cond:
+            keys = [interval] if interval is not None else list(self._pending)
+            dropped = [self._pending.pop(k) for k in keys if k in self._pending]
+            current = self._current
+            if current is not None and (interval is None or current.interval == interval):
+                current.cancelled = True
+
+        for job in dropped:
+            job.cancelled = True
+            self.cancelled.emit(job)
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def stop(self, timeout_ms: int = 5000):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        self.cancel()
+        self.wait(timeout_ms)
+
+    # -------------------------------------------------
+    # WORKER THREAD
+    # -------------------------------------------------
 
     def run(self):
-        signal = self.engine.process(
-            raw_analysis_inputs=self.raw_inputs,
-            interval=self.interval
-        )
-        self.finished.emit(signal)
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                _, job = self._pending.popitem(last=False)
+                self._current = job
+
+            started = time.monotonic()
+            try:
+                evaluation = self.engine.evaluate(
+                    feature_dict=job.inputs,
+                    interval=job.interval,
+                    series=job.series,
+                    profile=job.profile
+                )
+            except Exception as e:
+                self._finish()
+                self.failed.emit(job, str(e))
+                continue
+
+            # İptal kontrolü ve _current temizliği aynı kilit altında:
+            # bundan sonra gelen cancel() bu işi artık görmez
+            if self._finish():
+                self.cancelled.emit(job)
+                continue
+
+            # Yan etkiler (session log, feature store) yalnızca iptal edilmemiş iş için
+            try:
+                signal = self.engine.commit(evaluation, frame=job.frame)
+            except Exception as e:
+                self.failed.emit(job, str(e))
+                continue
+            done = time.monotonic()
+
+            result = AnalysisResult(
+                job=job,
+                signal=signal,
+                queue_ms=(started - job.submitted) * 1000.0,
+                run_ms=(done - started) * 1000.0
+            )
+            self.metrics.observe("analyze.queue", result.queue_ms)
+            self.metrics.observe("analyze.latency", result.latency_ms)
+            self.finished.emit(result)
+
+    def _finish(self) -> bool:
+        """
+        Clears the in-flight job; True if it was cancelled meanwhile.
+        """
+        with self._cond:
+            job, self._current = self._current, None
+            return job is not None and job.cancelled
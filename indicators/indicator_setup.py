@@ -3,8 +3,6 @@
 # Daha sonra bu db içerisindeki liste, feature_builder içerisinde kullanılır.
 
 import sys
-import os
-import sqlite3
 import json
 from datetime import datetime
 from PyQt5.QtWidgets import (
@@ -13,50 +11,22 @@ from PyQt5.QtWidgets import (
     QSpinBox, QMessageBox, QComboBox
 )
 
-# ==================== PATHS ====================
-DB_PATH = "indicators/indicatorlist.db"
-DB_FOLDER = os.path.dirname(DB_PATH)
-DEFAULT_INDICATORS_PATH = "indicators/indicators_def.json"
+from indicators.registry import IndicatorDef, default_registry
 
-if not os.path.exists(DB_FOLDER):
-    os.makedirs(DB_FOLDER)
+# ==================== REGISTRY ====================
+# Veri erişimi indicators/registry.py içinde (GUI'siz, headless worker'lar da kullanır)
+registry = default_registry()
+
+DB_PATH = str(registry.db_path)
+DEFAULT_INDICATORS_PATH = str(registry.defs_path)
 
 # ==================== LOAD DEFAULT INDICATORS ====================
 def load_default_indicators():
-    if not os.path.exists(DEFAULT_INDICATORS_PATH):
-        raise FileNotFoundError(
-            f"{DEFAULT_INDICATORS_PATH} not found. "
-            "Please create it with default indicator definitions."
-        )
-    with open(DEFAULT_INDICATORS_PATH, "r") as f:
-        return json.load(f)
+    return [d.to_dict() for d in registry.definitions()]
 
 # ==================== DATABASE SETUP ====================
 def setup_db():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    # Tablo oluştur
-    c.execute("""
-        CREATE TABLE IF NOT EXISTS indicator_lists (
-            id INTEGER PRIMARY KEY,
-            session_id TEXT,
-            indicator_name TEXT,
-            indicator_type TEXT,
-            params TEXT,
-            color TEXT,
-            line_thickness REAL,
-            background_color TEXT,
-            created_at TEXT,
-            updated_at TEXT
-        )
-    """)
-    # list_name kolonunu ekle (eski DB varsa)
-    c.execute("PRAGMA table_info(indicator_lists)")
-    columns = [col[1] for col in c.fetchall()]
-    if "list_name" not in columns:
-        c.execute("ALTER TABLE indicator_lists ADD COLUMN list_name TEXT")
-    conn.commit()
-    conn.close()
+    registry.setup_db()
 
 # ==================== POPULATE DEFAULT INDICATORS ====================
 def populate_default_indicators():
@@ -65,73 +35,13 @@ def populate_default_indicators():
 
 # ==================== LOAD / SAVE ====================
 def load_saved_lists():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("SELECT DISTINCT session_id, list_name FROM indicator_lists WHERE list_name IS NOT NULL")
-    rows = c.fetchall()
-    conn.close()
-    return [{"session_id": sid, "list_name": name} for sid, name in rows]
+    return [{"session_id": s.session_id, "list_name": s.list_name} for s in registry.saved_lists()]
 
 def load_indicator_list(session_id, list_name):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    c.execute("""
-        SELECT indicator_name, indicator_type, params, color, line_thickness, background_color
-        FROM indicator_lists WHERE session_id=? AND list_name=?
-    """, (session_id, list_name))
-    rows = c.fetchall()
-    conn.close()
-    result = []
-    for name, typ, params, color, thickness, bg in rows:
-        result.append({
-            "name": name,
-            "type": typ,
-            "params": json.loads(params),
-            "color": json.loads(color),
-            "line_thickness": float(thickness),
-            "background_color": json.loads(bg)
-        })
-    return result
+    return [d.to_dict() for d in registry.load_list(session_id, list_name)]
 
 def save_indicator_list(session_id, list_name, indicators):
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    now = datetime.now().isoformat()
-    for ind in indicators:
-        try:
-            c.execute("""
-                INSERT INTO indicator_lists 
-                (session_id, list_name, indicator_name, indicator_type, params, color, line_thickness, background_color, created_at, updated_at)
-                VALUES (?,?,?,?,?,?,?,?,?,?)
-            """, (
-                session_id,
-                list_name,
-                ind["name"],
-                ind["type"],
-                json.dumps(ind["params"]),
-                json.dumps(ind["color"]),
-                ind["line_thickness"],
-                json.dumps(ind["background_color"]),
-                now,
-                now
-            ))
-        except sqlite3.IntegrityError:
-            c.execute("""
-                UPDATE indicator_lists 
-                SET params=?, color=?, line_thickness=?, background_color=?, updated_at=?
-                WHERE session_id=? AND list_name=? AND indicator_name=?
-            """, (
-                json.dumps(ind["params"]),
-                json.dumps(ind["color"]),
-                ind["line_thickness"],
-                json.dumps(ind["background_color"]),
-                now,
-                session_id,
-                list_name,
-                ind["name"]
-            ))
-    conn.commit()
-    conn.close()
+    registry.save_list(session_id, list_name, [IndicatorDef.from_dict(ind) for ind in indicators])
 
 # ==================== GUI ====================
 class IndicatorSetupGUI(QWidget):
@@ -0,0 +1,276 @@
+# INDICATOR REGISTRY - Default indikatör tanımları + kayıtlı listeler (GUI'siz, import yan etkisi yok)
+#
+# indicator_setup.py (PyQt5 GUI) ve headless analiz worker'ları bu modülü kullanır.
+# Yollar modül konumuna göre çözülür, çalışma dizininden bağımsızdır.
+
+import json
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+
+DATA_DIR = Path(__file__).resolve().parent / "indicators"
+DEFAULT_DEFS_PATH = DATA_DIR / "indicators_def.json"
+DEFAULT_DB_PATH = DATA_DIR / "indicatorlist.db"
+
+
+# =================================================
+# TYPES
+# =================================================
+
+@dataclass(frozen=True)
+class IndicatorDef:
+    """
+    One indicator with its display settings. Treat params as read-only.
+    """
+    name: str
+    type: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    color: Tuple[int, int, int] = (0, 0, 0)
+    line_thickness: float = 1.0
+    background_color: Tuple[int, int, int] = (255, 255, 255)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "IndicatorDef":
+        return cls(
+            name=data["name"],
+            type=data["type"],
+            params=dict(data.get("params") or {}),
+            color=tuple(data.get("color") or (0, 0, 0)),
+            line_thickness=float(data.get("line_thickness", 1.0)),
+            background_color=tuple(data.get("background_color") or (255, 255, 255))
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "type": self.type,
+            "params": dict(self.params),
+            "color": list(self.color),
+            "line_thickness": self.line_thickness,
+            "background_color": list(self.background_color)
+        }
+
+
+@dataclass(frozen=True)
+class SavedList:
+    session_id: str
+    list_name: str
+
+
+# =================================================
+# REGISTRY
+# =================================================
+
+class IndicatorRegistry:
+    """
+    Loads default definitions and saved lists once and serves them from
+    memory. save_list() upserts in one transaction and invalidates the
+    cached lists. Nothing touches the filesystem until first use.
+    """
+
+    def __init__(
+        self,
+        defs_path: Optional[str | Path] = None,
+        db_path: Optional[str | Path] = None
+    ):
+        self.defs_path = Path(defs_path) if defs_path else DEFAULT_DEFS_PATH
+        self.db_path = Path(db_path) if db_path else DEFAULT_DB_PATH
+
+        self._lock = threading.Lock()
+        self._definitions: Optional[Tuple[IndicatorDef, ...]] = None
+        self._saved: Optional[Tuple[SavedList, ...]] = None
+        self._lists: Dict[Tuple[str, str], Tuple[IndicatorDef, ...]] = {}
+        self._db_ready = False
+
+    # -------------------------------------------------
+    # DEFAULT DEFINITIONS
+    # -------------------------------------------------
+
+    def definitions(self) -> Tuple[IndicatorDef, ...]:
+        with self._lock:
+            if self._definitions is None:
+                if not self.defs_path.exists():
+                    raise FileNotFoundError(
+                        f"{self.defs_path} not found. "
+                        "Please create it with default indicator definitions."
+                    )
+                with open(self.defs_path, "r", encoding="utf-8") as f:
+                    self._definitions = tuple(IndicatorDef.from_dict(d) for d in json.load(f))
+            return self._definitions
+
+    def definition(self, name: str) -> Optional[IndicatorDef]:
+        return next((d for d in self.definitions() if d.name == name), None)
+
+    # -------------------------------------------------
+    # DATABASE
+    # -------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._db_ready:
+            self.setup_db()
+        return sqlite3.connect(self.db_path)
+
+    def setup_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            with conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS indicator_lists (
+                        id INTEGER PRIMARY KEY,
+                        session_id TEXT,
+                        indicator_name TEXT,
+                        indicator_type TEXT,
+                        params TEXT,
+                        color TEXT,
+                        line_thickness REAL,
+                        background_color TEXT,
+                        created_at TEXT,
+                        updated_at TEXT
+                    )
+                """)
+                # list_name kolonunu ekle (eski DB varsa)
+                columns = [col[1] for col in conn.execute("PRAGMA table_info(indicator_lists)")]
+                if "list_name" not in columns:
+                    conn.execute("ALTER TABLE indicator_lists ADD COLUMN list_name TEXT")
+                # Eski kayıtlarda tekrar eden satırlar olabilir: en son kaydı tut
+                conn.execute("""
+                    DELETE FROM indicator_lists WHERE id NOT IN (
+                        SELECT MAX(id) FROM indicator_lists
+                        GROUP BY session_id, list_name, indicator_name
+                    )
+                """)
+                conn.execute("""
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_indicator_lists_unique
+                    ON indicator_lists (session_id, list_name, indicator_name)
+                """)
+        finally:
+            conn.close()
+        self._db_ready = True
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._saved = None
+            self._lists.clear()
+
+    # -------------------------------------------------
+    # SAVED LISTS
+    # -------------------------------------------------
+
+    def saved_lists(self) -> Tuple[SavedList, ...]:
+        with self._lock:
+            if self._saved is not None:
+                return self._saved
+
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT DISTINCT session_id, list_name FROM indicator_lists WHERE list_name IS NOT NULL"
+            ).fetchall()
+        finally:
+            conn.close()
+
+        saved = tuple(SavedList(sid, name) for sid, name in rows)
+        with self._lock:
+            self._saved = saved
+        return saved
+
+    def load_list(self, session_id: str, list_name: str) -> Tuple[IndicatorDef, ...]:
+        key = (session_id, list_name)
+        with self._lock:
+            cached = self._lists.get(key)
+        if cached is not None:
+            return cached
+
+        conn = self._connect()
+        try:
+            rows = conn.execute("""
+                SELECT indicator_name, indicator_type, params, color, line_thickness, background_color
+                FROM indicator_lists WHERE session_id=? AND list_name=?
+                ORDER BY id
+            """, key).fetchall()
+        finally:
+            conn.close()
+
+        result = tuple(
+            IndicatorDef(
+                name=name,
+                type=typ,
+                params=json.loads(params),
+                color=tuple(json.loads(color)),
+                line_thickness=float(thickness),
+                background_color=tuple(json.loads(bg))
+            )
+            for name, typ, params, color, thickness, bg in rows
+        )
+        with self._lock:
+            self._lists[key] = result
+        return result
+
+    def save_list(self, session_id: str, list_name: str, indicators: List[IndicatorDef]) -> None:
+        """
+        Upserts the whole list in one transaction; indicators no longer in
+        the list are removed. Invalidates the cache.
+        """
+        now = datetime.now().isoformat()
+        rows = [(
+            session_id,
+            list_name,
+            ind.name,
+            ind.type,
+            json.dumps(ind.params),
+            json.dumps(list(ind.color)),
+            ind.line_thickness,
+            json.dumps(list(ind.background_color)),
+            now,
+            now
+        ) for ind in indicators]
+
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany("""
+                    INSERT INTO indicator_lists
+                    (session_id, list_name, indicator_name, indicator_type, params, color, line_thickness, background_color, created_at, updated_at)
+                    VALUES (?,?,?,?,?,?,?,?,?,?)
+                    ON CONFLICT (session_id, list_name, indicator_name) DO UPDATE SET
+                        indicator_type=excluded.indicator_type,
+                        params=excluded.params,
+                        color=excluded.color,
+                        line_thickness=excluded.line_thickness,
+                        background_color=excluded.background_color,
+                        updated_at=excluded.updated_at
+                """, rows)
+                names = [ind.name for ind in indicators]
+                conn.execute(f"""
+                    DELETE FROM indicator_lists
+                    WHERE session_id=? AND list_name=?
+                    AND indicator_name NOT IN ({",".join("?" * len(names))})
+                """, (session_id, list_name, *names))
+        finally:
+            conn.close()
+
+        self.invalidate()
+
+
+# =================================================
+# SHARED INSTANCE
+# =================================================
+
+_default_registry: Optional[IndicatorRegistry] = None
+_default_lock = threading.Lock()
+
+
+def default_registry() -> IndicatorRegistry:
+    """
+    Process-wide registry over the bundled definitions / list DB.
+    """
+    global _default_registry
+    with _default_lock:
+        if _default_registry is None:
+            _default_registry = IndicatorRegistry()
+        return _default_registry
@@ -0,0 +1,6 @@
+# Testler repo kökünden import eder (core, ai, gui)
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,63 @@
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from gui.workers.analyze_worker import AnalyzeWorker
+
+
+class FakeEngine:
+    """
+    evaluate() runs a hook (e.g. a cancel arriving mid-analysis);
+    commit() records which jobs would have been logged.
+    """
+
+    def __init__(self):
+        self.on_evaluate = None
+        self.committed = []
+
+    def evaluate(self, feature_dict, interval, series=None, profile=None):
+        if self.on_evaluate is not None:
+            self.on_evaluate()
+        return feature_dict["frame"]
+
+    def commit(self, evaluation, frame=None):
+        self.committed.append((evaluation, frame))
+        return evaluation
+
+
+def _run_once(worker, engine, cancel_in_flight):
+    def during_evaluate():
+        if cancel_in_flight:
+            worker.cancel()
+        # run() tek iş sonra döner
+        worker._stopping = True
+
+    engine.on_evaluate = during_evaluate
+    finished, cancelled = [], []
+    worker.finished.connect(finished.append)
+    worker.cancelled.connect(cancelled.append)
+    job = worker.submit({"frame": "f1"}, "1M", frame="captures/f1.png")
+    worker.run()
+    return job, finished, cancelled
+
+
+def test_cancelled_in_flight_job_is_not_committed():
+    engine = FakeEngine()
+    worker = AnalyzeWorker(engine)
+
+    job, finished, cancelled = _run_once(worker, engine, cancel_in_flight=True)
+
+    assert engine.committed == []
+    assert finished == []
+    assert cancelled == [job]
+
+
+def test_job_is_committed_when_not_cancelled():
+    engine = FakeEngine()
+    worker = AnalyzeWorker(engine)
+
+    job, finished, cancelled = _run_once(worker, engine, cancel_in_flight=False)
+
+    assert engine.committed == [("f1", "captures/f1.png")]
+    assert [r.job for r in finished] == [job]
+    assert cancelled == []
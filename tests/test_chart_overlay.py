@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("PyQt5")
+pytest.importorskip("matplotlib")
+
+from gui.chart_overlay import downsample
+
+
+def test_downsample_keeps_extremes():
+    rng = np.random.default_rng(1)
+    values = rng.normal(0, 1, 10_000)
+    values[1234] = 50.0
+    values[8765] = -50.0
+    values[42] = np.nan
+
+    x, y = downsample(values, 200)
+
+    assert len(x) <= 200
+    assert np.all(np.diff(x) >= 0)
+    assert 1234 in x and 8765 in x
+    assert y.max() == 50.0 and y.min() == -50.0
+    # Seçilen noktalar orijinal değerler; NaN hiç seçilmez
+    assert not np.isnan(y).any()
+    np.testing.assert_array_equal(values[x], y)
+
+
+def test_downsample_skips_all_nan_buckets():
+    values = np.arange(1000, dtype=np.float64)
+    values[100:300] = np.nan
+
+    x, y = downsample(values, 100)
+
+    assert not np.isnan(y).any()
+    assert not np.any((x >= 100) & (x < 300))
+    np.testing.assert_array_equal(values[x], y)
+    assert y.min() == 0.0 and y.max() == 999.0
+
+
+def test_downsample_all_nan_is_empty():
+    values = np.full(1000, np.nan)
+    x, y = downsample(values, 100)
+    assert len(x) == 0 and len(y) == 0
+
+
+def test_downsample_short_series_unchanged():
+    values = np.arange(10, dtype=np.float64)
+    x, y = downsample(values, 200)
+    np.testing.assert_array_equal(x, np.arange(10))
+    np.testing.assert_array_equal(y, values)
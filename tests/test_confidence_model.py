@@ -0,0 +1,77 @@
+import json
+
+import numpy as np
+
+from ai.confidence_model import (
+    SPEC_FILE, WEIGHTS_PATTERN, ConfidenceModel, build_dataset, save_model, train
+)
+from ai.experience_store import ExperienceStore
+
+
+def _weights_file(model_dir):
+    return json.loads((model_dir / SPEC_FILE).read_text())["weights_file"]
+
+
+def _fill(store, n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    for i in range(n):
+        raw = float(rng.random())
+        vol = float(rng.random())
+        win = rng.random() < 0.2 + 0.6 * raw
+        store.add(
+            "CALL" if i % 2 else "PUT",
+            "WIN" if win else "LOSS",
+            confidence=0.5,                 # ayarlanmış confidence: bilgi taşımaz
+            raw_confidence=raw,
+            interval="1M" if i % 3 else "5M",
+            features={"volatility": {"atr": vol}},
+            ts=float(i)
+        )
+
+
+def test_dataset_uses_raw_confidence_with_fallback():
+    rows = [
+        {"action": "CALL", "interval": "1M", "confidence": 0.9, "raw_confidence": 0.4, "result": "WIN"},
+        {"action": "PUT", "interval": "5M", "confidence": 0.7, "raw_confidence": None, "result": "LOSS"},
+    ]
+    X, y, columns = build_dataset(rows, [], ["1M", "5M"])
+    assert columns[:3] == ["confidence", "action:CALL", "action:PUT"]
+    np.testing.assert_array_equal(X[:, 0], [0.4, 0.7])
+    np.testing.assert_array_equal(y, [1.0, 0.0])
+
+
+def test_train_predict_matches_vectorized(tmp_path):
+    store = ExperienceStore(str(tmp_path / "ai.db"))
+    try:
+        assert train(store, tmp_path / "model", min_rows=1000) is None
+        _fill(store)
+        spec = train(store, tmp_path / "model")
+        rows = list(store.iter_rows())
+    finally:
+        store.close()
+
+    assert spec["rows"] == 400
+    model = ConfidenceModel.load(tmp_path / "model")
+    assert model._confidence_w > 0     # kazanma olasılığı ham confidence ile artar
+
+    X, _, columns = build_dataset(rows, ["volatility.atr"], ["1M", "5M"])
+    assert columns == spec["columns"]
+    weights = np.load(tmp_path / "model" / _weights_file(tmp_path / "model"))
+    expected = 1.0 / (1.0 + np.exp(-(X @ weights + spec["bias"])))
+    got = [
+        model.predict(r["action"], r["raw_confidence"], r["features"], r["interval"])
+        for r in rows
+    ]
+    np.testing.assert_allclose(got, expected, rtol=1e-9)
+
+
+def test_save_keeps_current_and_previous_weights(tmp_path):
+    spec = {"columns": ["confidence"], "bias": 0.0}
+    names = []
+    for w in (1.0, 2.0, 3.0):
+        save_model(tmp_path, np.array([w]), spec)
+        names.append(_weights_file(tmp_path))
+
+    assert len(set(names)) == 3
+    assert sorted(p.name for p in tmp_path.glob(WEIGHTS_PATTERN)) == sorted(names[1:])
+    assert ConfidenceModel.load(tmp_path)._confidence_w == 3.0
@@ -0,0 +1,64 @@
+import json
+
+import numpy as np
+
+from ai.decision_bias import DecisionBias
+
+
+DAY = 24 * 3600.0
+
+
+def test_bias_sign_shrinkage_and_unknown():
+    bias = DecisionBias(half_life=0)
+    bias.record_result("one", True, ts=0.0)
+    for _ in range(30):
+        bias.record_result("good", True, ts=0.0)
+        bias.record_result("bad", False, ts=0.0)
+
+    assert bias.get_bias("unknown") == 0.0
+    # Tek sonuç belirsizlik yüzünden küçük kalır
+    assert 0.0 <= bias.get_bias("one", now=0.0) < 0.2
+    assert bias.get_bias("good", now=0.0) > 0.7
+    assert bias.get_bias("bad", now=0.0) < -0.7
+    assert bias.adjust_confidence(0.5, "bad") < 0.5 < bias.adjust_confidence(0.5, "good")
+
+
+def test_old_results_decay_toward_neutral():
+    bias = DecisionBias(half_life=DAY)
+    for _ in range(30):
+        bias.record_result("cond", True, ts=0.0)
+
+    fresh = bias.get_bias("cond", now=0.0)
+    stale = bias.get_bias("cond", now=10 * DAY)
+    assert fresh > 0.7
+    assert 0.0 <= stale < fresh / 4
+
+
+def test_many_matches_single_and_save_load_round_trip(tmp_path):
+    bias = DecisionBias(half_life=DAY, prior=2.0, z=0.5)
+    rng = np.random.default_rng(0)
+    conditions = [f"c{i}" for i in range(300)]     # kapasite büyümesini de geçer
+    for c in conditions:
+        for won in rng.random(5) < 0.6:
+            bias.record_result(c, bool(won), ts=100.0)
+
+    query = conditions + ["missing"]
+    many = bias.get_bias_many(query, now=200.0)
+    assert many[-1] == 0.0
+    np.testing.assert_allclose(many[:-1], [bias.get_bias(c, now=200.0) for c in conditions])
+
+    path = tmp_path / "bias.npz"
+    bias.save(path)
+    loaded = DecisionBias()
+    loaded.load(path)
+    assert (loaded.half_life, loaded.prior, loaded.z) == (DAY, 2.0, 0.5)
+    np.testing.assert_allclose(loaded.get_bias_many(query, now=200.0), many)
+
+
+def test_legacy_json_is_imported(tmp_path):
+    path = tmp_path / "bias.json"
+    path.write_text(json.dumps({"a": {"win": 20, "loss": 0}, "b": {"win": 0, "loss": 20}}))
+    bias = DecisionBias()
+    bias.load(path)
+    assert len(bias) == 2
+    assert bias.get_bias("a") > 0.5 and bias.get_bias("b") < -0.5
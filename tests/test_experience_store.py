@@ -0,0 +1,76 @@
+import json
+import sqlite3
+
+import pytest
+
+from ai.experience_store import ExperienceStore
+from core.journal_writer import JournalWriter
+
+
+def test_rows_counters_and_meta_persist(tmp_path):
+    db_path = str(tmp_path / "ai.db")
+    writer = JournalWriter()
+    store = ExperienceStore(db_path, model="m", batch_size=2, writer=writer)
+    store.add("CALL", "WIN", confidence=0.8, raw_confidence=0.6, interval="1M", features={"a": 1}, ts=1.0)
+    store.add("PUT", "LOSS", confidence=0.5, interval="5M", ts=2.0)
+    store.add("CALL", "LOSS", confidence=0.7, interval="1M", ts=3.0)
+    store.set_meta("version", {"n": 3})
+
+    rows = list(store.iter_rows(action="CALL"))
+    assert [r["ts"] for r in rows] == [1.0, 3.0]
+    assert rows[0]["features"] == {"a": 1}
+    assert rows[0]["raw_confidence"] == 0.6
+    assert [r["result"] for r in store.iter_rows(since=2.0, interval="1M")] == ["LOSS"]
+    store.close()
+    writer.close()
+
+    reopened = ExperienceStore(db_path, model="m")
+    other = ExperienceStore(db_path, model="other")
+    try:
+        assert reopened.counters == {"total_trades": 3, "wins": 1, "losses": 2}
+        assert reopened.get_meta("version") == {"n": 3}
+        assert other.counters["total_trades"] == 0
+        assert list(other.iter_rows()) == []
+    finally:
+        other.close()
+        reopened.close()
+
+
+def test_legacy_import_runs_once(tmp_path):
+    legacy = tmp_path / "experience.jsonl"
+    legacy.write_text("\n".join(json.dumps(r) for r in [
+        {"timestamp": "2024-01-01T00:00:00", "action": "CALL", "result": "WIN", "confidence": 0.7},
+        {"timestamp": "2024-01-01T00:01:00", "action": "PUT", "result": "LOSS", "features": {"x": 2}},
+    ]) + "\n")
+
+    store = ExperienceStore(str(tmp_path / "ai.db"))
+    try:
+        assert store.import_jsonl(str(legacy)) == 2
+        assert store.import_jsonl(str(legacy)) == 0
+        rows = list(store.iter_rows())
+        assert [r["action"] for r in rows] == ["CALL", "PUT"]
+        assert rows[0]["ts"] == 1704067200.0
+        assert store.counters == {"total_trades": 2, "wins": 1, "losses": 1}
+    finally:
+        store.close()
+
+
+def test_failed_import_leaves_no_rows_and_no_marker(tmp_path):
+    legacy = tmp_path / "experience.jsonl"
+    legacy.write_text("\n".join(json.dumps(r) for r in [
+        {"action": "CALL", "result": "WIN"},
+        {"action": None, "result": "LOSS"},     # NOT NULL ihlali
+    ]) + "\n")
+
+    store = ExperienceStore(str(tmp_path / "ai.db"))
+    try:
+        with pytest.raises(sqlite3.IntegrityError):
+            store.import_jsonl(str(legacy))
+        assert list(store.iter_rows()) == []
+        assert store.counters["total_trades"] == 0
+
+        # Düzeltilen dosya tekrar import edilebilir
+        legacy.write_text(json.dumps({"action": "CALL", "result": "WIN"}) + "\n")
+        assert store.import_jsonl(str(legacy)) == 1
+    finally:
+        store.close()
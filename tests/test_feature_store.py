@@ -0,0 +1,76 @@
+import sqlite3
+
+import numpy as np
+
+from core.feature_store import FEATURE_DIM, N_CANDLES, CANDLE_FIELDS, FeatureStore, encode_features
+from core.journal_writer import JournalWriter
+
+
+def _feature(close, n=3):
+    return {
+        "candles": [{"open": 1.0, "high": 2.0, "low": 0.5, "close": close + i, "candle_direction": 1} for i in range(n)],
+        "volatility": 0.4,
+    }
+
+
+def _last_close(vector):
+    width = len(CANDLE_FIELDS)
+    return vector[(N_CANDLES - 1) * width + CANDLE_FIELDS.index("close")]
+
+
+def test_encode_left_pads_missing_candles():
+    vector = encode_features(_feature(10.0, n=2), {"bullish_pressure": 2, "bearish_pressure": 0})
+    width = len(CANDLE_FIELDS)
+    assert vector.shape == (FEATURE_DIM,)
+    assert np.isnan(vector[:(N_CANDLES - 2) * width]).all()
+    assert _last_close(vector) == 11.0      # en yeni mum sonda
+    np.testing.assert_array_equal(vector[-4:], np.array([0.4, 2, 0, 2], dtype=np.float32))
+
+
+def test_signal_lookup_is_per_session(tmp_path):
+    db_path = str(tmp_path / "analysis.db")
+    writer = JournalWriter()
+    store = FeatureStore(db_path, batch_size=2, writer=writer)
+    # Her session'da id 0'dan başlar
+    store.add(_feature(1.0), session="s1", signal_id=0, interval="1M", action="CALL", confidence=0.7, ts=1.0)
+    store.add(_feature(2.0), session="s1", signal_id=1, interval="5M", action="PUT", ts=2.0)
+    store.add(_feature(3.0), session="s2", signal_id=0, interval="1M", action="CALL", ts=3.0)
+    store.add(_feature(4.0), interval="1M", ts=4.0)
+
+    assert _last_close(store.by_signal("s1", 0)) == 3.0
+    assert _last_close(store.by_signal("s2", 0)) == 5.0
+    assert store.by_signal("s3", 0) is None
+
+    batch = store.scan(since=1.0, interval="1M")
+    assert list(batch.ts) == [1.0, 3.0, 4.0]
+    assert list(batch.session) == ["s1", "s2", None]
+    assert list(batch.signal_id) == [0, 0, -1]
+    assert batch.X.shape == (3, FEATURE_DIM)
+    assert np.isnan(batch.confidence[1])
+    store.close()
+    writer.close()
+
+    with sqlite3.connect(db_path) as conn:
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT vector FROM feature_vectors WHERE session = ? AND signal_id = ?",
+            ("s1", 0)
+        ).fetchall()
+    assert "idx_feature_vectors_session_signal" in str(plan)
+
+
+def test_old_database_gains_session_column(tmp_path):
+    db_path = str(tmp_path / "analysis.db")
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE feature_vectors (
+                id INTEGER PRIMARY KEY, ts REAL NOT NULL, signal_id INTEGER,
+                interval TEXT, region TEXT, action TEXT, confidence REAL,
+                version INTEGER NOT NULL, vector BLOB NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX idx_feature_vectors_signal ON feature_vectors (signal_id)")
+
+    store = FeatureStore(db_path)
+    store.add(_feature(1.0), session="s1", signal_id=5)
+    assert store.by_signal("s1", 5) is not None
+    store.close()
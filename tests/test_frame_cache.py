@@ -0,0 +1,146 @@
+import os
+import threading
+import time
+
+from core.frame_cache import FrameCache, Thumbnail, THUMB_SUFFIX, thumbs_dir
+
+
+class FakeDecoder:
+    """
+    Thumbnail of nbytes bytes; fails while fail is set.
+    """
+
+    def __init__(self, nbytes=300):
+        self.nbytes = nbytes
+        self.calls = []
+        self.fail = False
+
+    def __call__(self, path, size):
+        self.calls.append(path)
+        if self.fail:
+            raise OSError("unreadable")
+        return Thumbnail(10, self.nbytes // 30, os.urandom(self.nbytes))
+
+
+def _frames(tmp_path, count):
+    paths = []
+    for i in range(count):
+        path = tmp_path / f"frame{i}.png"
+        path.write_bytes(b"png%d" % i)
+        paths.append(str(path))
+    return paths
+
+
+def _open(tmp_path, decoder, **kwargs):
+    ready = []
+    loaded = threading.Condition()
+
+    def on_ready(path):
+        with loaded:
+            ready.append(path)
+            loaded.notify_all()
+
+    cache = FrameCache(str(tmp_path / "session.jsonl"), on_ready=on_ready, decoder=decoder, **kwargs)
+
+    def wait_for(paths):
+        with loaded:
+            assert loaded.wait_for(lambda: all(p in ready for p in paths), timeout=5.0)
+
+    return cache, wait_for
+
+
+def _wait_until(predicate):
+    deadline = time.monotonic() + 5.0
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_get_loads_in_background_and_persists(tmp_path):
+    (path,) = _frames(tmp_path, 1)
+    decoder = FakeDecoder()
+    cache, wait_for = _open(tmp_path, decoder)
+    try:
+        assert cache.get(path) is None
+        wait_for([path])
+        thumb = cache.get(path)
+        assert thumb is not None and (cache.hits, cache.misses) == (1, 1)
+    finally:
+        cache.close()
+
+    # Yeni örnek disk önbelleğinden okur, decoder çağrılmaz
+    decoder.fail = True
+    cache, wait_for = _open(tmp_path, decoder)
+    try:
+        cache.get(path)
+        wait_for([path])
+        assert cache.get(path) == thumb
+        assert decoder.calls == [path]
+    finally:
+        cache.close()
+
+
+def test_failed_load_retried_after_expiry(tmp_path):
+    (path,) = _frames(tmp_path, 1)
+    decoder = FakeDecoder()
+    decoder.fail = True
+    cache, wait_for = _open(tmp_path, decoder, retry_after=0.2)
+    try:
+        cache.get(path)
+        _wait_until(lambda: path in cache._failed)
+        cache.get(path)
+        time.sleep(0.05)
+        assert decoder.calls == [path]
+
+        decoder.fail = False
+        time.sleep(0.2)
+        cache.get(path)
+        wait_for([path])
+        assert decoder.calls == [path, path]
+        assert cache.get(path) is not None
+    finally:
+        cache.close()
+
+
+def test_memory_is_lru_capped(tmp_path):
+    paths = _frames(tmp_path, 3)
+    cache, wait_for = _open(tmp_path, FakeDecoder(nbytes=300), max_bytes=600)
+    try:
+        for path in paths:
+            cache.get(path)
+            wait_for([path])
+        assert cache.memory_bytes() <= 600
+        assert cache.get(paths[0]) is None
+        assert cache.get(paths[2]) is not None
+    finally:
+        cache.close()
+
+
+def test_prefetch_loads_in_priority_order(tmp_path):
+    paths = _frames(tmp_path, 4)
+    decoder = FakeDecoder()
+    cache, wait_for = _open(tmp_path, decoder)
+    try:
+        cache.prefetch(paths)
+        wait_for(paths)
+        assert decoder.calls == paths
+        assert all(cache.get(p) is not None for p in paths)
+    finally:
+        cache.close()
+
+
+def test_disk_cache_is_pruned(tmp_path):
+    paths = _frames(tmp_path, 6)
+    cache, wait_for = _open(tmp_path, FakeDecoder(nbytes=3000), max_disk_bytes=10_000)
+    try:
+        for path in paths:
+            cache.get(path)
+            wait_for([path])
+    finally:
+        cache.close()
+
+    cache_dir = thumbs_dir(str(tmp_path / "session.jsonl"))
+    files = [f for f in os.listdir(cache_dir) if f.endswith(THUMB_SUFFIX)]
+    total = sum(os.path.getsize(os.path.join(cache_dir, f)) for f in files)
+    assert 0 < len(files) < len(paths)
+    assert total <= 10_000
@@ -0,0 +1,86 @@
+import json
+import sqlite3
+
+import pytest
+
+from indicators.registry import IndicatorDef, IndicatorRegistry, SavedList
+
+
+EMA = IndicatorDef("EMA", "ema", {"period": 50}, (255, 0, 0), 1.5)
+RSI = IndicatorDef("RSI", "rsi", {"period": 14})
+
+
+def test_save_list_upserts_and_removes(tmp_path):
+    registry = IndicatorRegistry(db_path=tmp_path / "lists.db")
+    registry.save_list("s1", "main", [EMA, RSI])
+    assert registry.load_list("s1", "main") == (EMA, RSI)
+
+    ema_fast = IndicatorDef("EMA", "ema", {"period": 20}, (0, 255, 0), 2.0)
+    registry.save_list("s1", "main", [ema_fast])
+    assert registry.load_list("s1", "main") == (ema_fast,)
+    assert registry.saved_lists() == (SavedList("s1", "main"),)
+
+    with sqlite3.connect(tmp_path / "lists.db") as conn:
+        assert conn.execute("SELECT COUNT(*) FROM indicator_lists").fetchone() == (1,)
+
+
+def test_reads_are_cached_until_save(tmp_path):
+    db_path = tmp_path / "lists.db"
+    registry = IndicatorRegistry(db_path=db_path)
+    registry.save_list("s1", "main", [EMA])
+    first = registry.load_list("s1", "main")
+
+    # Başka bir yazar: önbellek save_list / invalidate'e kadar geçerli
+    IndicatorRegistry(db_path=db_path).save_list("s1", "main", [RSI])
+    assert registry.load_list("s1", "main") is first
+    registry.invalidate()
+    assert registry.load_list("s1", "main") == (RSI,)
+
+
+def test_legacy_duplicates_are_collapsed(tmp_path):
+    db_path = tmp_path / "lists.db"
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            CREATE TABLE indicator_lists (
+                id INTEGER PRIMARY KEY, session_id TEXT, indicator_name TEXT,
+                indicator_type TEXT, params TEXT, color TEXT, line_thickness REAL,
+                background_color TEXT, created_at TEXT, updated_at TEXT
+            )
+        """)
+        for period in (10, 30):
+            conn.execute(
+                "INSERT INTO indicator_lists (session_id, indicator_name, indicator_type, params, color, line_thickness, background_color)"
+                " VALUES ('s1', 'EMA', 'ema', ?, '[0,0,0]', 1.0, '[255,255,255]')",
+                (json.dumps({"period": period}),)
+            )
+
+    registry = IndicatorRegistry(db_path=db_path)
+    registry.setup_db()
+    with sqlite3.connect(db_path) as conn:
+        rows = conn.execute("SELECT params FROM indicator_lists").fetchall()
+    assert rows == [(json.dumps({"period": 30}),)]
+
+
+def test_definitions_load_lazily(tmp_path):
+    defs_path = tmp_path / "indicators_def.json"
+    registry = IndicatorRegistry(defs_path=defs_path, db_path=tmp_path / "lists.db")
+    # Kurulumda hiçbir dosya okunmaz / oluşturulmaz
+    assert not (tmp_path / "lists.db").exists()
+
+    defs_path.write_text(json.dumps([EMA.to_dict(), RSI.to_dict()]), encoding="utf-8")
+    assert registry.definitions() == (EMA, RSI)
+    assert registry.definition("RSI") == RSI
+    assert registry.definition("MACD") is None
+
+
+def test_missing_definitions_raise(tmp_path):
+    registry = IndicatorRegistry(defs_path=tmp_path / "missing.json")
+    with pytest.raises(FileNotFoundError, match="missing.json"):
+        registry.definitions()
+
+
+def test_indicator_def_round_trip():
+    data = EMA.to_dict()
+    assert json.loads(json.dumps(data)) == data
+    assert IndicatorDef.from_dict(data) == EMA
+    assert IndicatorDef.from_dict({"name": "X", "type": "sma"}) == IndicatorDef("X", "sma")
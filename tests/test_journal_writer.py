@@ -0,0 +1,75 @@
+import struct
+
+from core.journal_writer import JournalWriter
+
+
+ENTRY = struct.Struct("<Q")
+
+
+def test_appends_are_written_in_order_with_offsets(tmp_path):
+    data_path = str(tmp_path / "log.jsonl")
+    idx_path = data_path + ".idx"
+    writer = JournalWriter(fsync="none")
+    for i in range(3):
+        assert writer.append(data_path, f"record {i}\n".encode(), idx_path, ENTRY.pack)
+    assert writer.flush(timeout=5)
+    writer.close()
+
+    data = open(data_path, "rb").read()
+    offsets = [o for (o,) in ENTRY.iter_unpack(open(idx_path, "rb").read())]
+    assert data.splitlines() == [b"record 0", b"record 1", b"record 2"]
+    assert offsets == [0, len(b"record 0\n"), 2 * len(b"record 0\n")]
+    assert writer.written == 3
+
+
+def test_failing_index_entry_is_rolled_back_and_reported(tmp_path):
+    data_path = str(tmp_path / "log.jsonl")
+    idx_path = data_path + ".idx"
+    errors = []
+
+    def bad_entry(offset):
+        raise struct.error("bad flag")
+
+    writer = JournalWriter(fsync="none")
+    writer.append(data_path, b"ok 0\n", idx_path, ENTRY.pack)
+    writer.append(data_path, b"broken\n", idx_path, bad_entry, on_error=errors.append)
+    writer.append(data_path, b"ok 1\n", idx_path, ENTRY.pack)
+    # Writer thread'i hayatta kalmalı: barrier dönmeli
+    assert writer.flush(timeout=5)
+    writer.close()
+
+    assert len(errors) == 1 and isinstance(errors[0], struct.error)
+    assert writer.failed == 1
+    assert open(data_path, "rb").read() == b"ok 0\nok 1\n"
+    assert [o for (o,) in ENTRY.iter_unpack(open(idx_path, "rb").read())] == [0, 5]
+
+
+def test_failed_calls_are_retried_then_dropped():
+    attempts = {"flaky": 0, "broken": 0}
+
+    def flaky():
+        attempts["flaky"] += 1
+        if attempts["flaky"] < 3:
+            raise RuntimeError("database is locked")
+
+    def broken():
+        attempts["broken"] += 1
+        raise RuntimeError("always")
+
+    writer = JournalWriter(call_retries=4, retry_delay=0.01)
+    writer.call(flaky)
+    writer.call(broken)
+    writer.close()
+
+    assert attempts["flaky"] == 3
+    assert attempts["broken"] == 5
+    assert writer.dropped == 1
+
+
+def test_closed_writer_drops_instead_of_raising(tmp_path):
+    writer = JournalWriter()
+    writer.close()
+    assert not writer.append(str(tmp_path / "log"), b"x")
+    assert not writer.call(lambda: None)
+    assert writer.dropped == 2
+    assert writer.flush(timeout=1)
@@ -0,0 +1,39 @@
+import numpy as np
+
+from ai.learner import Learner
+
+
+def _features(rng):
+    return {"a": float(rng.random()), "b": float(rng.random()), "c": float(rng.random())}
+
+
+def _brute_force(learner, vectors, features, k):
+    _, query = learner.quantize(features)
+    d = np.sqrt(((vectors - query) ** 2).sum(axis=1))
+    return np.sort(d)[:k]
+
+
+def test_nearest_matches_brute_force():
+    rng = np.random.default_rng(7)
+    learner = Learner(leaf_size=16)
+    seen = {}
+
+    def record(n):
+        for _ in range(n):
+            f = _features(rng)
+            key, vector = learner.quantize(f)
+            seen[key] = vector
+            learner.record(f, "BUY", "WIN", 1.0)
+
+    # İlk sorguda ağaç kurulur, sonra eklenenler ağaç dışında aranır
+    record(3000)
+    for recorded_after_build in (False, True):
+        if recorded_after_build:
+            record(40)
+        vectors = np.array(list(seen.values()), dtype=np.float64)
+        for _ in range(50):
+            f = _features(rng)
+            for k in (1, 5, 20):
+                hits = learner.nearest(f, k)
+                expected = _brute_force(learner, vectors, f, k)
+                np.testing.assert_allclose([d for _, d in hits], expected, rtol=1e-6)
@@ -0,0 +1,47 @@
+import json
+
+from ai.learner import Learner
+
+
+def _features(i):
+    return {"a": i * 0.1, "b": (i % 7) * 0.1}
+
+
+def test_memory_is_bounded_and_evicted_patterns_come_back(tmp_path):
+    store = tmp_path / "patterns.db"
+    learner = Learner(max_patterns=50, store_path=store)
+    for i in range(200):
+        learner.record(_features(i), "BUY", "WIN" if i % 2 else "LOSS", 1.0 if i % 2 else -1.0)
+
+    assert len(learner) == 50
+    # LRU'dan düşen desen diskten geri okunur
+    assert learner.get_pattern_score(_features(1)) == 1.0
+    assert learner.get_pattern_score(_features(0)) == -1.0
+    assert len(learner) == 50
+
+    learner.save()
+    reopened = Learner(max_patterns=50)
+    reopened.load(store)
+    assert len(reopened) == 50
+    assert reopened.get_pattern_score(_features(3)) == 1.0
+    assert reopened.get_pattern_score(_features(199)) == 1.0
+
+
+def test_legacy_json_memory_is_not_imported(tmp_path, capsys):
+    legacy = tmp_path / "memory.json"
+    legacy.write_text(json.dumps({
+        "0123456789abcdef": {"count": 3, "win": 3, "loss": 0, "total_reward": 3.0, "samples": []}
+    }))
+
+    learner = Learner()
+    learner.load(legacy)
+
+    assert len(learner) == 0
+    assert learner.store_path == tmp_path / "memory.db"
+    assert "cannot be re-keyed" in capsys.readouterr().out
+
+    learner.record(_features(1), "BUY", "WIN", 1.0)
+    learner.save()
+    again = Learner()
+    again.load(legacy)
+    assert again.get_pattern_score(_features(1)) == 1.0
@@ -0,0 +1,79 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from core.metrics import (
+    Metrics, PERCENTILES, ANALYZE_SUPERSEDED, RISK_BLOCKED_UNTIL, default_metrics
+)
+
+
+def test_latency_percentiles_over_last_samples():
+    metrics = Metrics(samples=100)
+    for ms in range(200):
+        metrics.observe("engine.total", float(ms))
+
+    stat = metrics.snapshot()["latency"]["engine.total"]
+    # Yalnızca son 100 örnek: 100..199
+    assert stat["n"] == 100
+    assert set(stat) == {"n", *(f"p{q}" for q in PERCENTILES)}
+    assert stat["p50"] == pytest.approx(149.5)
+    assert 100.0 <= stat["p50"] <= stat["p90"] <= stat["p99"] <= 199.0
+
+
+def test_timer_records_a_sample():
+    metrics = Metrics()
+    with metrics.timer("stage"):
+        pass
+    assert metrics.snapshot()["latency"]["stage"]["n"] == 1
+
+
+def test_counters_and_gauges():
+    metrics = Metrics()
+    metrics.incr("dropped")
+    metrics.incr("dropped", 2)
+    metrics.set("mode", "live")
+    depth = [3]
+    metrics.gauge("queue", lambda: depth[0])
+    metrics.gauge("broken", lambda: 1 / 0)
+
+    snap = metrics.snapshot()
+    assert snap["counters"] == {"dropped": 3}
+    assert snap["gauges"] == {"mode": "live", "queue": 3, "broken": None}
+
+    # Gauge'lar snapshot anında okunur; None ile kaldırılır
+    depth[0] = 7
+    assert metrics.snapshot()["gauges"]["queue"] == 7
+    metrics.gauge("queue", None)
+    assert "queue" not in metrics.snapshot()["gauges"]
+
+
+def test_rates_count_recent_events_only():
+    metrics = Metrics(rate_window=0.2)
+    for _ in range(4):
+        metrics.mark("frames")
+    assert metrics.snapshot()["rates"]["frames"] == pytest.approx(4 / 0.2)
+
+    time.sleep(0.25)
+    assert metrics.snapshot()["rates"]["frames"] == 0.0
+
+
+def test_default_metrics_is_shared():
+    assert default_metrics() is default_metrics()
+
+
+def test_hud_formats_snapshot():
+    pytest.importorskip("PyQt5")
+    from gui.overlay import format_hud
+
+    now = datetime(2026, 1, 1, 12, 0, 0)
+    metrics = Metrics()
+    metrics.incr(ANALYZE_SUPERSEDED, 2)
+    metrics.observe("engine.total", 12.0)
+    metrics.set(RISK_BLOCKED_UNTIL, now + timedelta(seconds=90))
+
+    text = format_hud(metrics.snapshot(), now=now)
+    assert "coalesced 2" in text
+    assert "engine      12.0" in text
+    assert "confirm" not in text
+    assert "risk     BLOCKED 01:30" in text
@@ -0,0 +1,76 @@
+import numpy as np
+
+from ai.online_learner import OnlineLearner, signal_terms
+
+
+def test_signal_terms():
+    terms = signal_terms("CALL", 0.6, {"trend": {"slope": 2, "up": True}, "name": "x"}, "1M")
+    assert terms == {"confidence": 0.6, "action:CALL": 1.0, "interval:1M": 1.0, "trend.slope": 2.0}
+
+
+def test_learns_from_stream_and_update_returns_prior_prediction():
+    rng = np.random.default_rng(0)
+    learner = OnlineLearner(alpha=0.2)
+    assert learner.predict({"confidence": 0.5}) == 0.5
+
+    losses = []
+    for i in range(3000):
+        raw = float(rng.random())
+        win = rng.random() < raw
+        terms = signal_terms("CALL", raw, None)
+        before = learner.predict(terms)
+        assert learner.update(terms, win) == before
+        losses.append(-np.log(before if win else 1.0 - before))
+
+    assert learner.updates == 3000
+    assert np.mean(losses[-1000:]) < np.mean(losses[:200])
+    assert learner.predict(signal_terms("CALL", 0.9, None)) > learner.predict(signal_terms("CALL", 0.1, None))
+
+
+def test_l1_keeps_unused_noise_weight_at_zero():
+    learner = OnlineLearner(l1=5.0)
+    for i in range(50):
+        learner.update({"noise": 1e-3 * (i % 3)}, i % 2 == 0)
+    assert learner._weight("noise") == 0.0
+
+
+def test_checkpoint_round_trip(tmp_path):
+    learner = OnlineLearner(alpha=0.3, l1=0.1)
+    for i in range(100):
+        learner.update(signal_terms("PUT", (i % 10) / 10, {"v": i % 4}, "5M"), i % 3 != 0)
+
+    path = tmp_path / "online_model.json"
+    learner.save(path)
+    loaded = OnlineLearner.load(path)
+
+    assert loaded.updates == 100 and loaded.alpha == 0.3 and loaded.l1 == 0.1
+    terms = signal_terms("PUT", 0.7, {"v": 2}, "5M")
+    assert loaded.predict(terms) == learner.predict(terms)
+    assert OnlineLearner.load(tmp_path / "missing.json").updates == 0
+
+
+def test_ai_manager_updates_from_raw_confidence(tmp_path):
+    from ai.ai_manager import AIManager
+    from core.journal_writer import JournalWriter
+    from core.signal_logic import Signal
+
+    writer = JournalWriter()
+    ai = AIManager(str(tmp_path / "model"), writer=writer, db_path=str(tmp_path / "ai.db"), online_mode="live")
+    reference = OnlineLearner()
+    try:
+        for i in range(20):
+            # Gösterilen confidence modelin kendi çıktısını içerir; öğrenme ham değerden
+            signal = Signal("CALL", 0.95, "x", raw_confidence=0.3 + 0.02 * i)
+            win = i % 3 != 0
+            ai.learn_from_result(signal, "WIN" if win else "LOSS", interval="1M")
+            reference.update(signal_terms("CALL", signal.raw_confidence, None, "1M"), win)
+
+        terms = signal_terms("CALL", 0.5, None, "1M")
+        assert ai.online.predict(terms) == reference.predict(terms)
+
+        adjusted = ai.adjust_signal(Signal("CALL", 0.5, "x"), {}, {}, "1M")
+        assert adjusted.raw_confidence == 0.5
+        assert adjusted.confidence == 0.5 + ai.model_blend * (reference.predict(terms) - 0.5)
+    finally:
+        ai.close()
+        writer.close()
@@ -0,0 +1,42 @@
+import numpy as np
+
+from core.resampler import CandleSeries, Resampler
+
+
+def _series(n, start=1_700_000_100, step=60, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    open_ = np.concatenate([[100.0], close[:-1]])
+    return CandleSeries(
+        timestamps=start + step * np.arange(n, dtype=np.int64),
+        open=open_,
+        high=np.maximum(open_, close) + rng.random(n),
+        low=np.minimum(open_, close) - rng.random(n),
+        close=close
+    )
+
+
+def _assert_same(a, b):
+    for field in ("timestamps", "open", "high", "low", "close"):
+        np.testing.assert_array_equal(getattr(a, field), getattr(b, field))
+
+
+def test_incremental_matches_full():
+    series = _series(437)
+    full = Resampler("1M", ["5M", "15M"])
+    full.update(series)
+
+    incremental = Resampler("1M", ["5M", "15M"])
+    stop = 0
+    for size in (1, 7, 13, 60, 3, 200, 153):
+        # Önceki parçayla örtüşen mumlar atlanmalı
+        start = max(stop - 5, 0)
+        stop = min(stop + size, len(series))
+        incremental.update(series.slice(start, stop))
+
+    for code in ("5M", "15M"):
+        _assert_same(incremental.get(code), full.get(code))
+        _assert_same(
+            incremental.get(code, include_forming=False),
+            full.get(code, include_forming=False)
+        )
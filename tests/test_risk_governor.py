@@ -0,0 +1,102 @@
+import json
+
+from core.risk_governor import RiskGovernor
+
+
+RULES = {
+    "block_ladder": [{"consecutive_losses": 10, "block_minutes": 60}],
+    "window_rules": [
+        {"name": "hourly_losses", "window_seconds": 3600, "kind": "max_losses", "threshold": 2}
+    ]
+}
+
+
+def _write_rules(path, data):
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_window_block_survives_restart(tmp_path):
+    rules_path = tmp_path / "rules.json"
+    _write_rules(rules_path, RULES)
+    db_path = str(tmp_path / "risk.db")
+
+    governor = RiskGovernor(db_path, rules_path=str(rules_path))
+    assert not governor.is_blocked()
+    governor.register_trade_result("LOSS")
+    governor.register_trade_result("LOSS")
+    governor.register_trade_result("LOSS")
+    assert governor.is_blocked()
+    blocked_until = governor.blocked_until()
+    assert blocked_until is not None
+    governor.close()
+
+    restarted = RiskGovernor(db_path, rules_path=str(rules_path))
+    try:
+        assert restarted.is_blocked()
+        assert restarted.blocked_until() == blocked_until
+        assert restarted.violated_window_rule().name == "hourly_losses"
+    finally:
+        restarted.close()
+
+
+def test_profiles_are_independent_and_shared_across_processes(tmp_path):
+    rules_path = tmp_path / "rules.json"
+    _write_rules(rules_path, {
+        "block_ladder": [{"consecutive_losses": 2, "block_minutes": 5}],
+        "window_rules": []
+    })
+    db_path = str(tmp_path / "risk.db")
+
+    # İkinci örnek başka bir process gibi aynı veritabanını okur
+    first = RiskGovernor(db_path, rules_path=str(rules_path))
+    second = RiskGovernor(db_path, rules_path=str(rules_path), sync_interval=0.0)
+    try:
+        first.register_trade_result("LOSS", profile="EURUSD")
+        first.register_trade_result("LOSS", profile="EURUSD")
+        first.register_trade_result("LOSS", profile="GBPUSD")
+
+        assert first.is_blocked("EURUSD")
+        assert not first.is_blocked("GBPUSD")
+        assert second.is_blocked("EURUSD")
+        assert not second.is_blocked("GBPUSD")
+        assert second.blocked_until("EURUSD") == first.blocked_until("EURUSD")
+        assert set(first.profiles()) >= {"EURUSD", "GBPUSD"}
+    finally:
+        second.close()
+        first.close()
+
+
+def test_window_block_from_another_process_is_published(tmp_path):
+    rules_path = tmp_path / "rules.json"
+    _write_rules(rules_path, RULES)
+    db_path = str(tmp_path / "risk.db")
+
+    first = RiskGovernor(db_path, rules_path=str(rules_path))
+    second = RiskGovernor(db_path, rules_path=str(rules_path), sync_interval=0.0)
+    events = []
+    unsubscribe = second.subscribe(events.append, replay=False)
+    try:
+        # Ladder eşiğine (10) ulaşılmaz: blok yalnızca pencere kuralından gelir
+        first.register_trade_result("LOSS")
+        first.register_trade_result("LOSS")
+        assert first.is_blocked()
+
+        second._sync()
+        assert second.is_blocked()
+        assert second.violated_window_rule().name == "hourly_losses"
+        assert [e.blocked for e in events] == [True]
+        assert events[0].reason == "Rolling window: hourly_losses"
+        assert events[0].blocked_until == first.blocked_until()
+
+        # Kendi olayları tekrar oynatılmaz, ikinci senkron aynı durumu yayınlamaz
+        second.register_trade_result("WIN")
+        first._sync()
+        second._sync()
+        assert second.violated_window_rule().name == "hourly_losses"
+        assert len(events) == 1
+        for governor in (first, second):
+            assert governor._profile("default").windows[3600].trades == 3
+    finally:
+        unsubscribe()
+        second.close()
+        first.close()
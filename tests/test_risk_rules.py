@@ -0,0 +1,33 @@
+import json
+import os
+
+from core.risk_rules import RiskRulesLoader
+
+
+RULES = {
+    "block_ladder": [{"consecutive_losses": 10, "block_minutes": 60}],
+    "window_rules": [
+        {"name": "hourly_losses", "window_seconds": 3600, "kind": "max_losses", "threshold": 2}
+    ]
+}
+
+
+def _write_rules(path, data):
+    path.write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_invalid_rules_file_keeps_running_rules(tmp_path):
+    rules_path = tmp_path / "rules.json"
+    _write_rules(rules_path, RULES)
+    loader = RiskRulesLoader(str(rules_path), poll_interval=0.0)
+    assert loader.last_error is None
+    assert loader.rules.ladder.lookup(10) == 60
+
+    # block_ladder eksik: boş merdiven olarak kabul edilmemeli
+    _write_rules(rules_path, {"window_rules": RULES["window_rules"], "extra": True})
+    st = os.stat(rules_path)
+    os.utime(rules_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+
+    assert not loader.poll(force=True)
+    assert loader.last_error is not None
+    assert loader.rules.ladder.lookup(10) == 60
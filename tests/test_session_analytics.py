@@ -0,0 +1,59 @@
+import json
+
+import core.session_analytics as analytics
+from core.session_analytics import analyze_sessions
+
+
+def _write_session(path, outcomes, interval="1M"):
+    """
+    One signal per outcome (None: unresolved), each followed by its result.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        n = 0
+        for i, outcome in enumerate(outcomes):
+            f.write(json.dumps({
+                "type": "signal", "id": n, "timestamp": "2024-01-01T10:00:00",
+                "interval": interval,
+                "signal": {"action": "CALL" if i % 2 == 0 else "PUT", "confidence": 0.65, "reason": "trend"},
+                "risk_blocked": i == 0
+            }) + "\n")
+            signal_id, n = n, n + 1
+            if outcome is not None:
+                f.write(json.dumps({"type": "result", "signal_id": signal_id, "result": outcome}) + "\n")
+                n += 1
+
+
+def test_parallel_scan_matches_serial(tmp_path):
+    _write_session(tmp_path / "a.jsonl", ["WIN", "LOSS", None])
+    _write_session(tmp_path / "b.jsonl", ["WIN", "WIN"], interval="5M")
+
+    serial = analyze_sessions(tmp_path, workers=1, use_cache=False)
+    parallel = analyze_sessions(tmp_path, workers=2, use_cache=False)
+
+    assert parallel.to_dict() == serial.to_dict()
+    assert (serial.files, serial.signals, serial.wins, serial.losses) == (2, 5, 3, 1)
+    assert serial.risk_blocked == 2
+    assert serial.actions == {"CALL": 3, "PUT": 2}
+    assert serial.confidence_hist[6] == 5
+    assert serial.by_interval["5M"] == {"signals": 2, "wins": 2, "losses": 0}
+    assert serial.win_rate() == 0.75
+
+
+def test_cache_rescans_only_changed_files(tmp_path, monkeypatch):
+    _write_session(tmp_path / "a.jsonl", ["WIN"])
+    _write_session(tmp_path / "b.jsonl", ["LOSS"])
+    first = analyze_sessions(tmp_path, workers=1)
+
+    scanned = []
+    scan_file = analytics.scan_file
+    monkeypatch.setattr(analytics, "scan_file", lambda p: scanned.append(p) or scan_file(p))
+
+    assert analyze_sessions(tmp_path, workers=1).to_dict() == first.to_dict()
+    assert scanned == []
+
+    _write_session(tmp_path / "b.jsonl", ["LOSS", "WIN"])
+    (tmp_path / "a.jsonl").unlink()
+    stats = analyze_sessions(tmp_path, workers=1)
+
+    assert scanned == [str(tmp_path / "b.jsonl")]
+    assert (stats.files, stats.signals, stats.wins, stats.losses) == (1, 2, 1, 1)
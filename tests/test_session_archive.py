@@ -0,0 +1,53 @@
+import json
+
+import numpy as np
+
+from core.session_archive import NO_CODE, SessionArchive, build_archive
+
+
+def _signal(n, ts, interval, action, confidence):
+    return {
+        "type": "signal", "id": n, "timestamp": ts, "interval": interval,
+        "signal": {"action": action, "confidence": confidence, "reason": f"r{action}"},
+        "risk_blocked": False
+    }
+
+
+def _result(signal_id, result):
+    return {"type": "result", "signal_id": signal_id, "timestamp": None, "result": result}
+
+
+def _write_session(path, records):
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+def test_archive_columns_and_win_rate(tmp_path):
+    session = tmp_path / "s.jsonl"
+    _write_session(session, [
+        _signal(0, "2024-01-01T10:05:00", "1M", "CALL", 0.7),
+        _result(0, "WIN"),
+        _signal(2, "2024-01-01T10:40:00", "1M", "PUT", 0.6),
+        _result(2, "LOSS"),
+        _signal(4, "2024-01-01T11:00:00", "5M", "CALL", 0.9),
+        _result(4, "WIN"),
+        _signal(6, "2024-01-01T11:30:00", "5M", "CALL", 0.5),     # sonuçsuz
+        _signal(7, None, "1M", "PUT", 0.8),                         # zaman damgası yok
+        _result(7, "WIN"),
+    ])
+
+    assert build_archive([session], tmp_path / "archive") == 5
+    archive = SessionArchive(tmp_path / "archive")
+
+    assert len(archive) == 5
+    assert archive["action"][1] == archive.action_code("PUT")
+    assert archive["result"][3] == NO_CODE
+    assert np.isnan(archive["timestamp"][4])
+    assert archive.reason(int(archive["reason"][0])) == "rCALL"
+
+    # Zaman damgası olmayan sonuçlu sinyal sayılmaz (negatif bincount indeksi yok)
+    assert archive.win_rate_by_interval_hour() == {
+        ("1M", 10): (2, 1, 0.5),
+        ("5M", 11): (1, 1, 1.0),
+    }
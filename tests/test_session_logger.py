@@ -0,0 +1,90 @@
+from core.journal_writer import JournalWriter
+from core.session_logger import SessionLogger, SessionReader
+from core.signal_logic import Signal
+
+
+class DroppingWriter(JournalWriter):
+    """
+    Drops the appends whose (0-based) number is in drop.
+    """
+
+    def __init__(self, drop):
+        super().__init__()
+        self.drop = set(drop)
+        self.appends = 0
+
+    def append(self, *args, **kwargs) -> bool:
+        n = self.appends
+        self.appends += 1
+        if n in self.drop:
+            return False
+        return super().append(*args, **kwargs)
+
+
+def test_ids_and_index_round_trip_with_dropped_append(tmp_path):
+    writer = DroppingWriter(drop={2})
+    logger = SessionLogger(str(tmp_path), writer=writer)
+
+    first = logger.log_signal("1M", Signal("CALL", 0.7, "a"), False)
+    assert logger.log_result("WIN", signal_id=first)
+    dropped = logger.log_signal("1M", Signal("PUT", 0.6, "b"), False)
+    third = logger.log_signal("5M", Signal("PUT", 0.8, "c"), True)
+    assert logger.log_result("LOSS")
+    writer.close()
+
+    assert first == 0
+    assert dropped is None
+    # Düşen kayıt numara tüketmez: id = dosyadaki kayıt numarası
+    assert third == 2
+
+    reader = SessionReader(logger.path)
+    assert reader.ensure_index() == 4
+    assert reader.signal(first)["signal"]["reason"] == "a"
+    assert reader.signal(third)["signal"]["reason"] == "c"
+    assert reader.result_of(first) == "WIN"
+    assert reader.result_of(third) == "LOSS"
+
+
+def test_result_without_signal_is_rejected(tmp_path):
+    writer = JournalWriter()
+    logger = SessionLogger(str(tmp_path), writer=writer)
+    assert not logger.log_result("WIN")
+    writer.close()
+
+
+class FailingIndexWriter(JournalWriter):
+    """
+    The index callback of the append numbered in fail raises on the
+    writer thread (the append itself is accepted).
+    """
+
+    def __init__(self, fail):
+        super().__init__()
+        self.fail = set(fail)
+        self.appends = 0
+
+    def append(self, path, data, index_path=None, index_entry=None, on_error=None) -> bool:
+        n = self.appends
+        self.appends += 1
+        if n in self.fail:
+            def index_entry(offset):
+                raise ValueError("bad index entry")
+        return super().append(path, data, index_path, index_entry, on_error)
+
+
+def test_failed_write_resyncs_ids_from_index(tmp_path):
+    writer = FailingIndexWriter(fail={1})
+    logger = SessionLogger(str(tmp_path), writer=writer)
+
+    first = logger.log_signal("1M", Signal("CALL", 0.7, "a"), False)
+    lost = logger.log_signal("1M", Signal("PUT", 0.6, "b"), False)
+    writer.flush()
+    third = logger.log_signal("1M", Signal("PUT", 0.8, "c"), False)
+    writer.close()
+
+    assert (first, lost) == (0, 1)
+    # Başarısız kayıt dosyada yok: sonraki id yeniden 1
+    assert third == 1
+    reader = SessionReader(logger.path)
+    assert reader.ensure_index() == 2
+    assert reader.signal(third)["signal"]["reason"] == "c"
@@ -0,0 +1,91 @@
+import json
+
+import numpy as np
+
+import ai.walk_forward as wf
+from ai.walk_forward import decide, run, simulate, walk_forward_folds
+from core.risk_rules import BlockLadder, RiskRules, WindowRule
+
+
+def _rows(n, seed=0):
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(n):
+        raw = float(rng.random())
+        rows.append({
+            "ts": 1000.0 + 60.0 * i,
+            "action": "CALL" if i % 2 else "PUT",
+            "interval": "1M",
+            "confidence": 0.5,
+            "raw_confidence": raw,
+            "result": "WIN" if rng.random() < raw else "LOSS",
+            "features": {"x": float(rng.random())},
+        })
+    return rows
+
+
+def test_folds_expand_and_cover_the_tail():
+    folds = walk_forward_folds(100, 4, 20)
+    assert folds == [(20, 20, 40), (40, 40, 60), (60, 60, 80), (80, 80, 100)]
+    assert walk_forward_folds(10, 4, 20) == []
+
+
+def test_min_confidence_gates_on_raw_confidence():
+    rows = [
+        {"action": "CALL", "confidence": 0.9, "raw_confidence": 0.3},
+        {"action": "PUT", "confidence": 0.2, "raw_confidence": 0.8},
+        {"action": "CALL", "confidence": 0.7, "raw_confidence": None},
+    ]
+    assert decide({"kind": "min_confidence", "threshold": 0.6}, [], rows) == ["WAIT", "PUT", "CALL"]
+
+
+def test_blocked_seconds_include_rolling_window_blocks():
+    rules = RiskRules(
+        ladder=BlockLadder([]),
+        window_rules=(WindowRule("hourly", 3600, "max_losses", 2),)
+    )
+    test = [{"ts": 60.0 * i, "action": "CALL", "result": "LOSS"} for i in range(120)]
+    metrics = simulate(test, ["CALL"] * len(test), rules)
+
+    # 2 kayıp -> ilk kayıt pencereden çıkana kadar (1 saat) blok
+    assert metrics["trades"] == 4
+    assert metrics["blocked_signals"] == 116
+    assert metrics["blocked_seconds"] == metrics["span_seconds"] - 60.0
+
+
+def test_ladder_and_window_blocks_are_not_double_counted():
+    rules = RiskRules(
+        ladder=BlockLadder([(2, 30)]),
+        window_rules=(WindowRule("hourly", 3600, "max_losses", 2),)
+    )
+    test = [{"ts": 60.0 * i, "action": "CALL", "result": "LOSS"} for i in range(120)]
+    metrics = simulate(test, ["CALL"] * len(test), rules)
+    assert metrics["blocked_seconds"] <= metrics["span_seconds"]
+
+
+def test_run_caches_folds_and_keeps_other_candidates(tmp_path, monkeypatch):
+    rows = _rows(300)
+    cache = tmp_path / "cache.json"
+    a = [{"name": "baseline", "kind": "baseline"}]
+    b = [{"name": "gate", "kind": "min_confidence", "threshold": 0.6}]
+
+    serial = run(rows, a + b, n_folds=3, workers=1, cache_path=cache)
+    parallel = run(rows, a + b, n_folds=3, workers=2)
+    assert parallel == serial
+    assert serial["gate"]["hit_rate"] > serial["baseline"]["hit_rate"]
+
+    calls = []
+    evaluate_fold = wf.evaluate_fold
+    monkeypatch.setattr(wf, "evaluate_fold", lambda task: calls.append(task) or evaluate_fold(task))
+
+    # Yalnızca a çalıştırmak b'nin girdilerini silmez
+    assert run(rows, a, n_folds=3, workers=1, cache_path=cache)["baseline"] == serial["baseline"]
+    assert run(rows, b, n_folds=3, workers=1, cache_path=cache)["gate"] == serial["gate"]
+    assert calls == []
+    assert len(json.loads(cache.read_text())) == 6
+
+    # Geçmiş değişti: tüm fold'lar yeniden hesaplanır, eski girdiler atılır
+    changed = [dict(rows[0], result="WIN" if rows[0]["result"] == "LOSS" else "LOSS")] + rows[1:]
+    run(changed, a, n_folds=3, workers=1, cache_path=cache)
+    assert len(calls) == 3
+    assert len(json.loads(cache.read_text())) == 3